@@ -0,0 +1,77 @@
+import json
+import os
+import struct
+
+import numpy as np
+
+from torch_npu.profiler.analysis.prof_common_func import columnar_file
+from torch_npu.profiler.analysis.prof_common_func.columnar_file import ColumnarFile
+
+TORCH_OP_NAME = 3
+TORCH_OP_INPUT_DTYPES = 4
+TORCH_OP_INPUT_SHAPES = 5
+TORCH_OP_CALL_STACK = 6
+TORCH_OP_MODULE_HIERARCHY = 7
+TORCH_OP_FLOPS = 8
+OP_MARK_NAME = 2
+NPU_DEVICE_TYPE = 20
+
+
+def pack_tlv(type_id: int, value: bytes) -> bytes:
+    return struct.pack("<HI", type_id, len(value)) + value
+
+
+def pack_torch_op(start_ns: int, end_ns: int, name: str = "aten::add", pid: int = 1, tid: int = 1,
+                  sequence_number: int = 0, input_shapes: str = None, input_dtypes: str = None,
+                  call_stack: str = None, module_hierarchy: str = None, flops: str = None) -> bytes:
+    body = struct.pack("<3q4Q?", start_ns, end_ns, sequence_number, pid, tid, tid, 0, False)
+    body += pack_tlv(TORCH_OP_NAME, name.encode())
+    for type_id, value in ((TORCH_OP_INPUT_DTYPES, input_dtypes), (TORCH_OP_INPUT_SHAPES, input_shapes),
+                           (TORCH_OP_CALL_STACK, call_stack), (TORCH_OP_MODULE_HIERARCHY, module_hierarchy),
+                           (TORCH_OP_FLOPS, flops)):
+        if value is not None:
+            body += pack_tlv(type_id, value.encode())
+    return pack_tlv(1, body)
+
+
+def pack_op_mark(time_ns: int, category: int, corr_id: int, name: str = "aten::add", pid: int = 1,
+                 tid: int = 1) -> bytes:
+    return pack_tlv(1, struct.pack("<q4Q", time_ns, category, corr_id, tid, pid) +
+                    pack_tlv(OP_MARK_NAME, name.encode()))
+
+
+def pack_memory_record(ptr: int, time_ns: int, size: int, allocated: int, reserved: int, pid: int = 1,
+                       tid: int = 1, device_type: int = NPU_DEVICE_TYPE, device_index: int = 0) -> bytes:
+    return pack_tlv(1, struct.pack("<5qbB2Q", ptr, time_ns, size, allocated, reserved, device_type, device_index,
+                                   tid, pid))
+
+
+def create_profiler_data(profiler_path: str, torch_ops: list = None, memory_records: list = None,
+                         timeline: list = None) -> None:
+    """
+    write the framework binaries of the packed records, and an msprof timeline when it is given
+    """
+    framework_path = os.path.join(profiler_path, "FRAMEWORK")
+    os.makedirs(framework_path, exist_ok=True)
+    with open(os.path.join(framework_path, "torch.op_range"), "wb") as file:
+        file.write(b"".join(torch_ops or []))
+    if memory_records:
+        with open(os.path.join(framework_path, "torch.memory_usage"), "wb") as file:
+            file.write(b"".join(memory_records))
+    if timeline is not None:
+        timeline_path = os.path.join(profiler_path, "PROF_000001_20230101000000_abc", "device_0", "timeline")
+        os.makedirs(timeline_path, exist_ok=True)
+        with open(os.path.join(timeline_path, "msprof_0_0.json"), "w") as file:
+            json.dump(timeline, file)
+
+
+def read_columnar_file(file_path: str) -> dict:
+    """
+    read the columns of an arrow or npy columnar file into numpy arrays
+    """
+    if file_path.endswith(ColumnarFile.ARROW_SUFFIX):
+        with columnar_file.pa.memory_map(file_path) as source:
+            table = columnar_file.pa.ipc.open_file(source).read_all()
+        return {name: table.column(name).to_numpy(zero_copy_only=False) for name in table.column_names}
+    structured_data = np.load(file_path, allow_pickle=False)
+    return {name: structured_data[name] for name in structured_data.dtype.names}
@@ -0,0 +1,95 @@
+from unittest import mock
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.scheduler import CLOSE_STEP, AdaptiveSchedule, ProfilerAction
+
+NONE = ProfilerAction.NONE
+WARMUP = ProfilerAction.WARMUP
+RECORD = ProfilerAction.RECORD
+SAVE = ProfilerAction.RECORD_AND_SAVE
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def perf_counter(self) -> float:
+        return self.now
+
+
+def run_steps(schedule: AdaptiveSchedule, step_time_list: list, call_num: int = 1) -> list:
+    """
+    step i starts step_time_list[i - 1] seconds after step i - 1, every step calls the schedule call_num times
+    """
+    clock = FakeClock()
+    action_list = []
+    with mock.patch("time.perf_counter", clock.perf_counter):
+        for step, step_time in enumerate([0.0] + step_time_list):
+            clock.now += step_time
+            actions = [schedule(step) for _ in range(call_num)]
+            action_list.append(actions[0] if call_num == 1 else actions)
+    return action_list
+
+
+class TestAdaptiveSchedule(TestCase):
+    def test_arm_after_slow_step(self):
+        schedule = AdaptiveSchedule(threshold=0.2, warmup=1, active=2, min_history=3)
+        action_list = run_steps(schedule, [1.0, 1.0, 1.0, 1.1, 2.0, 1.0, 1.0, 1.0, 1.0])
+        self.assertEqual([NONE] * 5 + [WARMUP, RECORD, SAVE, NONE, NONE], action_list)
+        self.assertEqual(1, schedule.capture_num)
+
+    def test_no_baseline_before_min_history(self):
+        schedule = AdaptiveSchedule(min_history=5)
+        self.assertEqual([NONE] * 6, run_steps(schedule, [1.0, 1.0, 1.0, 1.0, 9.0]))
+        self.assertEqual(0, schedule.capture_num)
+
+    def test_ignore_window_after_capture(self):
+        schedule = AdaptiveSchedule(warmup=1, active=1, min_history=3, cooldown=0)
+        # steps 4 and 5 are profiled, the times measured at steps 5 to 7 carry the profiling overhead
+        action_list = run_steps(schedule, [1.0, 1.0, 1.0, 2.0, 5.0, 5.0, 5.0, 1.0, 2.0])
+        self.assertEqual([NONE] * 4 + [WARMUP, SAVE] + [NONE] * 3 + [WARMUP], action_list)
+        self.assertEqual(6, schedule.step_stats["count"])
+        self.assertLessEqual(schedule.step_stats["p99"], 2.0)
+        self.assertEqual(2, schedule.capture_num)
+
+    def test_cooldown(self):
+        schedule = AdaptiveSchedule(warmup=0, active=1, min_history=3, cooldown=3, ewma_alpha=1.0)
+        # the capture of step 4 ends there, so the slow step 7 is in the cooldown and only step 10 is profiled
+        action_list = run_steps(schedule, [1.0, 1.0, 1.0, 2.0, 1.0, 1.0, 2.0, 1.0, 1.0, 2.0])
+        self.assertEqual([NONE] * 4 + [SAVE] + [NONE] * 5 + [SAVE], action_list)
+        self.assertEqual(2, schedule.capture_num)
+
+    def test_max_captures(self):
+        schedule = AdaptiveSchedule(warmup=0, active=1, min_history=3, cooldown=0, max_captures=2,
+                                    ewma_alpha=1.0)
+        action_list = run_steps(schedule, [1.0, 1.0, 1.0] + [1.0, 1.0, 2.0] * 3)
+        self.assertEqual([SAVE] * 2, [action for action in action_list if action != NONE])
+        self.assertEqual(2, schedule.capture_num)
+
+    def test_repeat_calls_of_the_same_step(self):
+        schedule = AdaptiveSchedule(warmup=1, active=1, min_history=3)
+        action_list = run_steps(schedule, [1.0, 1.0, 1.0, 2.0, 1.0, 1.0], call_num=2)
+        self.assertEqual([[NONE, NONE]] * 4 + [[WARMUP, WARMUP], [SAVE, SAVE], [NONE, NONE]], action_list)
+        self.assertEqual(1, schedule.capture_num)
+        self.assertEqual(4, schedule.step_stats["count"])
+
+    def test_skipped_step_is_not_measured(self):
+        schedule = AdaptiveSchedule(min_history=3)
+        clock = FakeClock()
+        with mock.patch("time.perf_counter", clock.perf_counter):
+            for step in (0, 1, 2, 3, 8):
+                clock.now += 1.0 if step != 8 else 10.0
+                self.assertEqual(NONE, schedule(step))
+        self.assertEqual(3, schedule.step_stats["count"])
+        self.assertEqual(NONE, schedule(CLOSE_STEP))
+
+    def test_quantile_baseline(self):
+        schedule = AdaptiveSchedule(warmup=0, active=1, min_history=4, quantile=0.5)
+        # a single slow step in the history moves the ewma but not the median
+        action_list = run_steps(schedule, [1.0, 1.0, 10.0, 1.0, 1.3])
+        self.assertEqual([NONE] * 5 + [SAVE], action_list)
+        self.assertEqual(1.0, schedule.step_stats["p50"])
+
+
+if __name__ == "__main__":
+    run_tests()
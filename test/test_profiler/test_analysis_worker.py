@@ -0,0 +1,42 @@
+import os
+import shutil
+import tempfile
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.analysis.analysis_worker import AnalysisWorker
+
+
+class TestAnalysisWorker(TestCase):
+    def setUp(self):
+        self.work_path = tempfile.mkdtemp()
+        self.worker = AnalysisWorker()
+
+    def tearDown(self):
+        self.worker.close()
+        shutil.rmtree(self.work_path)
+
+    def test_update_status_of_removed_directory(self):
+        profiler_path = os.path.join(self.work_path, "removed_ascend_pt")
+        AnalysisWorker.update_status(profiler_path, AnalysisWorker.FAILED)
+        self.assertEqual("", AnalysisWorker.get_status(profiler_path))
+
+    def test_restart_keeps_the_queued_tasks(self):
+        running_path, queued_path = [os.path.join(self.work_path, name) for name in ("running", "queued")]
+        for profiler_path in (running_path, queued_path):
+            os.makedirs(profiler_path)
+        self.worker._start()
+        self.worker._process.kill()
+        self.worker._process.join()
+        # the worker died while analysing the first task, with the second one still queued
+        AnalysisWorker.update_status(running_path, AnalysisWorker.RUNNING)
+        AnalysisWorker.update_status(queued_path, AnalysisWorker.QUEUED)
+        self.worker._task_list = [(running_path, {}), (queued_path, {})]
+        self.worker._start()
+        self.assertEqual(AnalysisWorker.FAILED, AnalysisWorker.get_status(running_path))
+        self.assertEqual([(queued_path, {})], self.worker._task_list)
+        self.worker.wait()
+        self.assertIn(AnalysisWorker.get_status(queued_path), (AnalysisWorker.FINISHED, AnalysisWorker.FAILED))
+
+
+if __name__ == "__main__":
+    run_tests()
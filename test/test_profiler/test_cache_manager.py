@@ -0,0 +1,83 @@
+import os
+import shutil
+import stat
+import tempfile
+
+import numpy as np
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.analysis.prof_common_func.cache_manager import CacheManager
+from torch_npu.profiler.analysis.prof_common_func.constant import Constant
+from torch_npu.profiler.analysis.prof_common_func.torch_op_tree import TorchOpTree
+from torch_npu.profiler.analysis.prof_parse.cann_file_parser import CANNFileParser
+from torch_npu.profiler.analysis.prof_parse.fwk_cann_relation_parser import FwkCANNRelationParser
+
+from profiler_data_builder import create_profiler_data, pack_torch_op
+
+# the flow joins the acl api at 2 us, inside aten::add, to the kernel at 10 us
+TIMELINE = [
+    {"ph": "s", "cat": "HostToDevice", "id": "1", "pid": 3, "tid": 3, "ts": 2.0, "name": "HostToDevice"},
+    {"ph": "f", "cat": "HostToDevice", "id": "1", "pid": 7, "tid": 1, "ts": 10.0, "name": "HostToDevice"},
+    {"ph": "X", "name": "Add", "pid": 7, "tid": 1, "ts": 10.0, "dur": 3.0, "args": {"Task Type": "AI_CORE"}}
+]
+
+
+class PickledPayload:
+    executed = False
+
+    def __reduce__(self):
+        return setattr, (PickledPayload, "executed", True)
+
+
+class TestCacheManager(TestCase):
+    def setUp(self):
+        self.work_path = tempfile.mkdtemp()
+        self.profiler_path = os.path.join(self.work_path, "worker_ascend_pt")
+        torch_ops = [pack_torch_op(0, 100000, name="ProfilerStep#1", call_stack="train.py"),
+                     pack_torch_op(1000, 5000, name="aten::add", input_shapes="[2, 3]")]
+        create_profiler_data(self.profiler_path, torch_ops, timeline=TIMELINE)
+        self.cache_path = os.path.join(self.profiler_path, Constant.CACHE_DIR)
+        CANNFileParser.clear_cache()
+
+    def tearDown(self):
+        CANNFileParser.clear_cache()
+        shutil.rmtree(self.work_path)
+
+    def test_torch_op_tree_round_trip(self):
+        built_tree = FwkCANNRelationParser(self.profiler_path).build_torch_op_tree()
+        self.assertTrue(all(file_name.endswith(CacheManager.CACHE_SUFFIX) for file_name in os.listdir(self.cache_path)))
+        CANNFileParser.clear_cache()
+        loaded_tree = FwkCANNRelationParser(self.profiler_path).build_torch_op_tree()
+        for name in ("start", "end", "parent", "first_child", "next_sibling", "host_self_dur", "device_dur",
+                     "device_start", "device_end"):
+            np.testing.assert_array_equal(getattr(built_tree, name), getattr(loaded_tree, name))
+        self.assertEqual([node.name for node in built_tree], [node.name for node in loaded_tree])
+        self.assertEqual(built_tree[0].call_stack, loaded_tree[0].call_stack)
+        self.assertEqual(3.0, loaded_tree.device_dur[TorchOpTree.DEVICE_TOTAL][1])
+        self.assertEqual(["Add"], [kernel.name for kernel in loaded_tree.get_kernel_list(1)])
+
+    def test_pickled_cache_is_not_loaded(self):
+        cache_manager = CacheManager(self.profiler_path)
+        key = cache_manager.get_key("stage", [])
+        cache_manager.save("stage", key, {"values": np.arange(3)}, {"name": "value"})
+        is_hit, arrays, meta = cache_manager.load("stage", key)
+        self.assertTrue(is_hit)
+        np.testing.assert_array_equal(np.arange(3), arrays["values"])
+        self.assertEqual({"name": "value"}, meta)
+        cache_file = os.path.join(self.cache_path, f"stage_{key}{CacheManager.CACHE_SUFFIX}")
+        with open(cache_file, "wb") as file:
+            np.savez(file, values=np.array([PickledPayload()], dtype=object))
+        self.assertFalse(cache_manager.load("stage", key)[0])
+        self.assertFalse(PickledPayload.executed)
+
+    def test_cache_writable_by_others_is_ignored(self):
+        cache_manager = CacheManager(self.profiler_path)
+        key = cache_manager.get_key("stage", [])
+        cache_manager.save("stage", key, {}, True)
+        cache_file = os.path.join(self.cache_path, f"stage_{key}{CacheManager.CACHE_SUFFIX}")
+        os.chmod(cache_file, stat.S_IRUSR | stat.S_IWUSR | stat.S_IWOTH)
+        self.assertFalse(cache_manager.load("stage", key)[0])
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,134 @@
+import os
+import shutil
+import stat
+import tempfile
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.analysis.prof_parse.cann_file_parser import CANNFileParser
+
+from profiler_data_builder import create_profiler_data
+
+# a fake msprof: the first export writes a step trace of the iterations 1 to 4 named after the iteration 1,
+# every iteration export records its start and end time, and the analysis records the finished iterations
+MSPROF_STUB = """#!/bin/sh
+output=""
+iteration=""
+mode=""
+for arg in "$@"; do
+    case "$arg" in
+        --output=*) output="${arg#--output=}" ;;
+        --iteration-id=*) iteration="${arg#--iteration-id=}" ;;
+        --export=on) mode="export" ;;
+        --analyze=on) mode="analyze" ;;
+    esac
+done
+if [ "$mode" = "analyze" ]; then
+    ls "$output" | grep -c "^iteration_.*_end$" > "$output/analyze_result"
+    exit 0
+fi
+if [ -z "$iteration" ]; then
+    mkdir -p "$output/device_0/summary" "$output/device_0/timeline"
+    printf "Iteration ID,FP Start\\n1,0\\n2,0\\n2,0\\n3,0\\n4,0\\n" > "$output/device_0/summary/step_trace_0_1_1.csv"
+    echo "[]" > "$output/device_0/timeline/msprof_0_1_1.json"
+    exit 0
+fi
+if [ "$iteration" = "$MSPROF_STUB_FAILED_ITERATION" ]; then
+    exit 1
+fi
+date +%s%N > "$output/iteration_${iteration}_start"
+sleep 1
+date +%s%N > "$output/iteration_${iteration}_end"
+"""
+
+
+class TestCANNFileParser(TestCase):
+    def setUp(self):
+        self.work_path = tempfile.mkdtemp()
+        bin_path = os.path.join(self.work_path, "bin")
+        os.makedirs(bin_path)
+        msprof_path = os.path.join(bin_path, "msprof")
+        with open(msprof_path, "w") as file:
+            file.write(MSPROF_STUB)
+        os.chmod(msprof_path, stat.S_IRWXU)
+        self.origin_path_env = os.environ.get("PATH", "")
+        os.environ["PATH"] = bin_path + os.pathsep + self.origin_path_env
+        self.profiler_path = os.path.join(self.work_path, "worker_ascend_pt")
+        self.cann_path = os.path.join(self.profiler_path, "PROF_000001_20230101000000_abc")
+        os.makedirs(os.path.join(self.cann_path, "device_0", "data"))
+        CANNFileParser.clear_cache()
+
+    def tearDown(self):
+        os.environ["PATH"] = self.origin_path_env
+        os.environ.pop("MSPROF_STUB_FAILED_ITERATION", None)
+        shutil.rmtree(self.work_path)
+
+    def test_acl_to_npu_data(self):
+        timeline = [
+            {"ph": "X", "name": "Mul", "pid": 7, "tid": 1, "ts": 20.0, "dur": 1.0},
+            {"ph": "X", "name": "Add", "pid": 7, "tid": 1, "ts": 10.0, "dur": 1.0},
+            {"ph": "X", "name": "Idle", "pid": 7, "tid": 1, "ts": 15.0, "dur": 1.0},
+            {"ph": "f", "cat": "HostToDevice", "id": "1", "pid": 7, "tid": 1, "ts": 10.0},
+            {"ph": "f", "cat": "HostToDevice", "id": "2", "pid": 7, "tid": 1, "ts": 20.0},
+            {"ph": "f", "cat": "HostToDevice", "id": "3", "pid": 7, "tid": 1, "ts": 15.0},
+            {"ph": "s", "cat": "HostToDevice", "id": "1", "pid": 3, "tid": 3, "ts": 2.0},
+            {"ph": "s", "cat": "HostToDevice", "id": "2", "pid": 3, "tid": 3, "ts": 2.0},
+            {"ph": "s", "cat": "HostToDevice", "id": "4", "pid": 3, "tid": 3, "ts": 5.0}
+        ]
+        create_profiler_data(self.profiler_path, timeline=timeline)
+        acl_to_npu_dict = CANNFileParser(self.profiler_path).get_acl_to_npu_data()
+        # the flow 3 has no start and the flow 4 has no end
+        self.assertEqual([2.0], list(acl_to_npu_dict))
+        self.assertEqual(["Mul", "Add"], [kernel.name for kernel in acl_to_npu_dict[2.0]])
+
+    def test_acl_to_npu_data_with_ts_formats(self):
+        # msprof writes the ts as strings, a flow end and its x event may format the same ts differently
+        timeline = [
+            {"ph": "s", "cat": "HostToDevice", "id": "1", "pid": 3, "tid": 3, "ts": "2.500"},
+            {"ph": "f", "cat": "HostToDevice", "id": "1", "pid": 7, "tid": 1, "ts": "10.100"},
+            {"ph": "X", "name": "Add", "pid": 7, "tid": 1, "ts": 10.1, "dur": 1.0},
+            {"ph": "s", "cat": "HostToDevice", "id": "2", "pid": 3, "tid": 3, "ts": 4},
+            {"ph": "f", "cat": "HostToDevice", "id": "2", "pid": 7, "tid": 1, "ts": 20},
+            {"ph": "X", "name": "Mul", "pid": 7, "tid": 1, "ts": "20.000", "dur": 1.0},
+            {"ph": "X", "name": "Invalid", "pid": 7, "tid": 1, "ts": "N/A", "dur": 1.0}
+        ]
+        create_profiler_data(self.profiler_path, timeline=timeline)
+        acl_to_npu_dict = CANNFileParser(self.profiler_path).get_acl_to_npu_data()
+        self.assertEqual({2.5: ["Add"], 4.0: ["Mul"]},
+                         {acl_ts: [kernel.name for kernel in kernel_list]
+                          for acl_ts, kernel_list in acl_to_npu_dict.items()})
+
+    def test_timeline_is_read_from_disk_on_every_pass(self):
+        timeline = [{"ph": "X", "name": "Add", "pid": 7, "tid": 1, "ts": 10.0, "dur": 1.0}]
+        create_profiler_data(self.profiler_path, timeline=timeline)
+        cann_parser = CANNFileParser(self.profiler_path)
+        self.assertEqual(timeline, cann_parser.get_timeline_all_data())
+        timeline.append({"ph": "X", "name": "Mul", "pid": 7, "tid": 1, "ts": 20.0, "dur": 1.0})
+        create_profiler_data(self.profiler_path, timeline=timeline)
+        self.assertEqual(timeline, list(cann_parser.iter_timeline_data()))
+
+    def test_export_iterations_concurrently(self):
+        CANNFileParser(self.profiler_path).export_cann_profiling(False)
+        exported_list = sorted(file_name for file_name in os.listdir(self.cann_path)
+                               if file_name.startswith("iteration_") and file_name.endswith("_start"))
+        self.assertEqual(["iteration_2_start", "iteration_3_start", "iteration_4_start"], exported_list)
+        start_list = [self._read_time(f"iteration_{step_id}_start") for step_id in (2, 3, 4)]
+        end_list = [self._read_time(f"iteration_{step_id}_end") for step_id in (2, 3, 4)]
+        self.assertTrue(max(start_list) < min(end_list))
+        with open(os.path.join(self.cann_path, "analyze_result")) as file:
+            self.assertEqual("3", file.read().strip())
+
+    def test_export_iterations_failed(self):
+        os.environ["MSPROF_STUB_FAILED_ITERATION"] = "3"
+        with self.assertRaisesRegex(RuntimeError, "1 of 3 iterations.*iteration 3: exit code 1"):
+            CANNFileParser(self.profiler_path).export_cann_profiling(False)
+        self.assertTrue(os.path.exists(os.path.join(self.cann_path, "iteration_2_end")))
+        self.assertTrue(os.path.exists(os.path.join(self.cann_path, "iteration_4_end")))
+        self.assertFalse(os.path.exists(os.path.join(self.cann_path, "analyze_result")))
+
+    def _read_time(self, file_name: str) -> int:
+        with open(os.path.join(self.cann_path, file_name)) as file:
+            return int(file.read().strip())
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,128 @@
+import csv
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.analysis.cluster_analysis import ClusterAnalysis
+from torch_npu.profiler.analysis.prof_common_func.constant import Constant
+
+from profiler_data_builder import create_profiler_data
+
+# rank 3 starts every collective about 500 us after the other ranks
+RANK_OFFSET_LIST = [0.0, 2.0, 1.0, 500.0]
+# the link 2-3 moves the same data as the others at a fifth of their bandwidth
+LINK_DICT = {"0-1": 10.0, "1-2": 10.0, "2-3": 50.0}
+
+
+def create_rank_data(profiler_path: str, rank_id: int, communication: dict, matrix: dict = None) -> None:
+    create_profiler_data(profiler_path)
+    with open(os.path.join(profiler_path, f"profiler_info_{rank_id}.json"), "w") as file:
+        json.dump({}, file)
+    output_path = os.path.join(profiler_path, Constant.OUTPUT_DIR)
+    os.makedirs(output_path)
+    with open(os.path.join(output_path, "communication.json"), "w") as file:
+        json.dump(communication, file)
+    if matrix is not None:
+        with open(os.path.join(output_path, "communication_matrix.json"), "w") as file:
+            json.dump(matrix, file)
+
+
+def create_communication(rank_offset: float) -> dict:
+    step_dict = {}
+    for step_index, step in enumerate(("step1", "step2")):
+        collective = {"Total Op Info": {"Communication Time Info": {"Start Timestamp(us)": 0.0}}}
+        for op_index, op_name in enumerate(("hcom_allReduce__1_0_1", "hcom_broadcast__1_1_1")):
+            collective[op_name] = {"Communication Time Info": {
+                "Start Timestamp(us)": 10000.0 * step_index + 1000.0 * op_index + rank_offset,
+                "Elapse Time(ms)": 1.0, "Wait Time(ms)": 0.5 if rank_offset < 100 else 0.0,
+                "Transit Time(ms)": 0.5, "Synchronization Time(ms)": 0.1}}
+        step_dict[step] = {"collective": collective}
+    return step_dict
+
+
+def create_matrix(link_list: list) -> dict:
+    link_dict = {link: {"Transport Type": "HCCS", "Transit Size(MB)": 100.0, "Transit Time(ms)": LINK_DICT[link]}
+                 for link in link_list}
+    return {"step1": {"collective": {"hcom_allReduce__1_0_1": link_dict}}}
+
+
+class TestClusterAnalysis(TestCase):
+    def setUp(self):
+        self.work_path = tempfile.mkdtemp()
+        self.output_path = os.path.join(self.work_path, "cluster")
+
+    def tearDown(self):
+        shutil.rmtree(self.work_path)
+
+    def create_cluster(self, rank_offset_list: list) -> None:
+        for rank_id, rank_offset in enumerate(rank_offset_list):
+            # every rank reports the links it takes part in, the shared ones must be counted once
+            link_list = [link for link in LINK_DICT if str(rank_id) in link.split("-")]
+            create_rank_data(os.path.join(self.work_path, f"rank{rank_id}_ascend_pt"), rank_id,
+                             create_communication(rank_offset), create_matrix(link_list))
+
+    def read_csv(self, file_name: str) -> list:
+        with open(os.path.join(self.output_path, file_name), newline="") as file:
+            return list(csv.DictReader(file))
+
+    def test_stragglers_and_slow_links(self):
+        self.create_cluster(RANK_OFFSET_LIST)
+        ClusterAnalysis.analyse(self.work_path, self.output_path, max_workers=1)
+        rank_rows = self.read_csv(ClusterAnalysis.RANK_STATISTIC)
+        self.assertEqual(["0", "1", "2", "3"], [row["Rank"] for row in rank_rows])
+        self.assertEqual(["4", "4", "4", "4"], [row["Collective Count"] for row in rank_rows])
+        self.assertEqual(["0", "0", "0", "4"], [row["Last Arrival Count"] for row in rank_rows])
+        self.assertEqual([0.0, 2.0, 1.0, 500.0], [float(row["Avg Arrival Delay(us)"]) for row in rank_rows])
+        self.assertEqual(["False", "False", "False", "True"], [row["Straggler"] for row in rank_rows])
+        skew_rows = self.read_csv(ClusterAnalysis.COLLECTIVE_SKEW)
+        self.assertEqual(4, len(skew_rows))
+        self.assertTrue(all(row["Last Rank"] == "3" and float(row["Skew(us)"]) == 500.0 for row in skew_rows))
+        link_rows = self.read_csv(ClusterAnalysis.LINK_STATISTIC)
+        self.assertEqual(["2-3", "0-1", "1-2"], [row["Link"] for row in link_rows])
+        self.assertEqual(["1", "1", "1"], [row["Op Count"] for row in link_rows])
+        self.assertEqual(["True", "False", "False"], [row["Slow Link"] for row in link_rows])
+        with open(os.path.join(self.output_path, ClusterAnalysis.CLUSTER_SUMMARY)) as file:
+            summary = json.load(file)
+        self.assertEqual(4, summary["rank_num"])
+        self.assertEqual([3], [rank["Rank"] for rank in summary["stragglers"]])
+        self.assertEqual(["2-3"], [link["Link"] for link in summary["slow_links"]])
+
+    def test_small_delay_without_deviation(self):
+        # the other ranks start together, so the median absolute deviation is zero
+        self.create_cluster([0.0, 0.0, 0.0, 0.0, 50.0])
+        ClusterAnalysis.analyse(self.work_path, self.output_path, max_workers=1)
+        rank_rows = self.read_csv(ClusterAnalysis.RANK_STATISTIC)
+        self.assertEqual(["0", "0", "0", "0", "4"], [row["Last Arrival Count"] for row in rank_rows])
+        self.assertEqual(["False"] * 5, [row["Straggler"] for row in rank_rows])
+
+    def test_find_outliers(self):
+        self.assertEqual([False, False, False, False, False],
+                         ClusterAnalysis._find_outliers(np.array([0.0, 0.0, 0.0, 0.0, 50.0])).tolist())
+        self.assertEqual([False, False, False, False, True],
+                         ClusterAnalysis._find_outliers(np.array([0.0, 0.0, 0.0, 0.0, 500.0])).tolist())
+        self.assertEqual([False, False, False, True],
+                         ClusterAnalysis._find_outliers(np.array([10.0, 12.0, 11.0, 60.0])).tolist())
+        self.assertEqual([False, False], ClusterAnalysis._find_outliers(np.array([0.0, 500.0])).tolist())
+
+    def test_no_communication_data(self):
+        create_profiler_data(os.path.join(self.work_path, "rank0_ascend_pt"))
+        ClusterAnalysis.analyse(self.work_path, self.output_path, max_workers=1)
+        self.assertFalse(os.path.exists(self.output_path))
+
+    def test_invalid_output_path(self):
+        self.create_cluster(RANK_OFFSET_LIST)
+        file_path = os.path.join(self.work_path, "output.csv")
+        open(file_path, "w").close()
+        link_path = os.path.join(self.work_path, "output_link")
+        os.symlink(self.work_path, link_path)
+        for output_path in (file_path, link_path):
+            with self.assertRaises(RuntimeError):
+                ClusterAnalysis.analyse(self.work_path, output_path, max_workers=1)
+
+
+if __name__ == "__main__":
+    run_tests()
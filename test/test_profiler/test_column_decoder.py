@@ -0,0 +1,107 @@
+import struct
+import warnings
+
+import numpy as np
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.analysis.prof_bean.op_mark_bean import OpMarkBean
+from torch_npu.profiler.analysis.prof_common_func.column_decoder import ColumnDecoder
+from torch_npu.profiler.analysis.prof_common_func.column_table import ColumnTable, StringTable
+from torch_npu.profiler.analysis.prof_common_func.constant import Constant
+from torch_npu.profiler.analysis.prof_common_func.file_tag import FileTag
+from torch_npu.profiler.analysis.prof_common_func.tlv_decoder import TLVDecoder
+from torch_npu.profiler.analysis.prof_config.fwk_file_parser_config import FwkFileParserConfig
+
+from profiler_data_builder import TORCH_OP_NAME, pack_memory_record, pack_op_mark, pack_tlv, pack_torch_op
+
+UNKNOWN_TYPE_ID = 99
+
+
+def decode_both(all_bytes: bytes, file_tag: int) -> tuple:
+    bean_config = FwkFileParserConfig.FILE_BEAN_MAP.get(file_tag)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        bean_list = TLVDecoder.decode(all_bytes, bean_config["bean"], bean_config["struct_size"])
+        column_table = ColumnDecoder.decode(all_bytes, bean_config["bean"], bean_config["struct_size"], True)
+    return bean_list, column_table
+
+
+class TestColumnDecoder(TestCase):
+    def setUp(self):
+        op_body = struct.pack("<3q4Q?", 7000, 9000, 5, 2, 3, 3, 4, False)
+        self.torch_op_bytes = b"".join([
+            pack_torch_op(0, 100000, name="ProfilerStep#1", call_stack="train.py(10);model.py(20)"),
+            pack_torch_op(1000, 5000, name="aten::add", pid=2, tid=3, sequence_number=8, input_shapes="[2, 3];[2, 3]",
+                          input_dtypes="float;float", module_hierarchy="nn.Module: Model"),
+            pack_torch_op(5000, 6000, name="aten::mm", flops="mat1_size:[4, 8];mat2_size:[8, 16]"),
+            pack_torch_op(6000, 7000, name="aten::add"),
+            pack_tlv(1, op_body + pack_tlv(UNKNOWN_TYPE_ID, b"unknown") + pack_tlv(TORCH_OP_NAME, b"\xff\xfe")),
+            pack_tlv(1, b"\x00" * 10),
+            pack_torch_op(9000, 9500, name="aten::sub")[:-3]
+        ])
+
+    def test_torch_op_beans_match_tlv_decoder(self):
+        bean_list, column_table = decode_both(self.torch_op_bytes, FileTag.TORCH_OP)
+        self.assertEqual(5, len(bean_list))
+        self.assertEqual(len(bean_list), len(column_table))
+        for bean, column_bean in zip(bean_list, column_table):
+            for name in ("name", "ts", "dur", "pid", "tid", "args"):
+                self.assertEqual(getattr(bean, name), getattr(column_bean, name))
+        self.assertEqual("N/A", column_table[4].name)
+
+    def test_columns_of_torch_op(self):
+        bean_list, column_table = decode_both(self.torch_op_bytes, FileTag.TORCH_OP)
+        self.assertEqual([bean.dur * Constant.NS_TO_US for bean in bean_list],
+                         (column_table.column("end_ns") - column_table.column("start_ns")).tolist())
+        self.assertEqual([bean.pid for bean in bean_list], column_table.column("pid").tolist())
+        name_ids = column_table.tlv_column(Constant.OP_NAME)
+        self.assertEqual([bean.name for bean in bean_list],
+                         [column_table.get_string(string_id) for string_id in name_ids.tolist()])
+        self.assertEqual(name_ids[1], name_ids[3])
+        shape_ids = column_table.tlv_column(Constant.INPUT_SHAPES)
+        self.assertEqual([StringTable.INVALID_ID, StringTable.INVALID_ID], shape_ids[[0, 2]].tolist())
+        self.assertEqual("N/A", column_table.get_string(StringTable.INVALID_ID, "N/A"))
+
+    def test_take_and_cache_round_trip(self):
+        bean_list, column_table = decode_both(self.torch_op_bytes, FileTag.TORCH_OP)
+        sub_table = column_table.take(np.array([3, 1]))
+        self.assertEqual([bean_list[3].args, bean_list[1].args], [bean.args for bean in sub_table])
+        loaded_table = ColumnTable.from_cache_data(column_table.class_bean, *column_table.to_cache_data())
+        self.assertEqual([(bean.name, bean.ts, bean.args) for bean in bean_list],
+                         [(bean.name, bean.ts, bean.args) for bean in loaded_table])
+
+    def test_op_mark_beans_match_tlv_decoder(self):
+        all_bytes = b"".join([pack_op_mark(1000, OpMarkBean.ENQUEUE_START, 1, name="Enqueue@aten::add"),
+                              pack_op_mark(2000, OpMarkBean.DEQUEUE_START, 1, name="Dequeue@aten::add", tid=2),
+                              pack_op_mark(2500, OpMarkBean.DEQUEUE_END, 1, name="Dequeue@aten::add", tid=2),
+                              pack_op_mark(3000, OpMarkBean.ENQUEUE_END, 2, name="Enqueue@aten::mm")])
+        bean_list, column_table = decode_both(all_bytes, FileTag.OP_MARK)
+        self.assertEqual(4, len(column_table))
+        for bean, column_bean in zip(bean_list, column_table):
+            for name in ("name", "origin_name", "time_us", "corr_id", "pid", "tid", "args", "category",
+                         "is_enqueue_start", "is_enqueue_end", "is_dequeue_start", "is_dequeue_end"):
+                self.assertEqual(getattr(bean, name), getattr(column_bean, name))
+
+    def test_memory_beans_match_tlv_decoder(self):
+        record_list = [pack_memory_record(100, 1000, 512, 512, 2048),
+                       pack_memory_record(100, 2000, -512, 0, 2048),
+                       pack_memory_record(200, 3000, 64, 64, 64, device_type=0)]
+        bean_list, column_table = decode_both(b"".join(record_list), FileTag.MEMORY)
+        bean_config = FwkFileParserConfig.FILE_BEAN_MAP.get(FileTag.MEMORY)
+        header_len = TLVDecoder.T_LEN + TLVDecoder.L_LEN
+        fixed_table = ColumnDecoder.decode(b"".join(record[header_len:] for record in record_list),
+                                           bean_config["bean"], bean_config["struct_size"], False)
+        for table in (column_table, fixed_table):
+            self.assertEqual(3, len(table))
+            for bean, column_bean in zip(bean_list, table):
+                for name in ("ptr", "time_us", "alloc_size", "device_tag", "pid", "tid", "row"):
+                    self.assertEqual(getattr(bean, name), getattr(column_bean, name))
+
+    def test_struct_size_mismatch(self):
+        bean_config = FwkFileParserConfig.FILE_BEAN_MAP.get(FileTag.TORCH_OP)
+        with self.assertRaises(RuntimeError):
+            ColumnDecoder.decode(self.torch_op_bytes, bean_config["bean"], bean_config["struct_size"] + 1)
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,68 @@
+import csv
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.analysis.prof_common_func.columnar_file import ColumnarFile
+from torch_npu.profiler.analysis.prof_common_func.file_manager import FileManager
+
+from profiler_data_builder import read_columnar_file
+
+HEADERS = ["Name", "Count", "Duration(us)", "Mixed", "Ratio"]
+# Mixed has a string among numbers, Ratio misses a number in its second row
+DATA = [["aten::add", 3, 1.5, 1, "0.25"],
+        ["aten::mm", "7", "20", "N/A", ""],
+        ["aten::mul", -2, 0.5, 2.5, 1]]
+EXPECTED_DTYPE_KINDS = {"Name": "U", "Count": "i", "Duration(us)": "f", "Mixed": "U", "Ratio": "f"}
+
+
+class TestColumnarFile(TestCase):
+    def setUp(self):
+        self.work_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_path)
+
+    def test_column_types(self):
+        self.assertEqual(np.int64, ColumnarFile._to_column([1, "2", " -3"]).dtype)
+        self.assertEqual(np.float64, ColumnarFile._to_column([1, "2.5", 3]).dtype)
+        np.testing.assert_array_equal(np.array([1.0, np.nan, 3.0]), ColumnarFile._to_column([1, None, "3"]))
+        self.assertEqual(["True", "1"], ColumnarFile._to_column([True, 1]).tolist())
+        self.assertEqual(["1", "N/A", ""], ColumnarFile._to_column([1, "N/A", None]).tolist())
+        # ints beyond int64 fall back to float64
+        self.assertEqual(np.float64, ColumnarFile._to_column([2 ** 63, 1]).dtype)
+
+    def test_round_trip_against_csv(self):
+        FileManager.create_csv_file(self.work_path, DATA, "op_statistic.csv", HEADERS, columnar_export=True)
+        with open(os.path.join(self.work_path, "op_statistic.csv"), newline="") as file:
+            csv_rows = list(csv.reader(file))
+        self.assertEqual(HEADERS, csv_rows[0])
+        file_path = os.path.join(self.work_path, ColumnarFile.get_file_name("op_statistic.csv"))
+        self.assertTrue(os.path.isfile(file_path))
+        columns = read_columnar_file(file_path)
+        self.assertEqual(HEADERS, list(columns))
+        self.assertEqual(EXPECTED_DTYPE_KINDS, {name: column.dtype.kind if column.dtype.kind != "O" else "U"
+                                                for name, column in columns.items()})
+        for row_index, csv_row in enumerate(csv_rows[1:]):
+            for name, csv_value in zip(HEADERS, csv_row):
+                value = columns[name][row_index]
+                if EXPECTED_DTYPE_KINDS[name] == "U":
+                    self.assertEqual(csv_value, str(value))
+                elif csv_value == "":
+                    self.assertTrue(np.isnan(value))
+                else:
+                    self.assertEqual(float(csv_value), float(value))
+
+    def test_short_rows_and_duplicate_headers(self):
+        FileManager.create_columnar_file(self.work_path, [[1, 2, 3], [4]], "table.csv", ["A", "A"])
+        columns = read_columnar_file(os.path.join(self.work_path, ColumnarFile.get_file_name("table.csv")))
+        self.assertEqual(["A", "A_1", "column_2"], list(columns))
+        self.assertEqual([1, 4], columns["A"].tolist())
+        self.assertTrue(np.isnan(columns["A_1"][1]))
+
+
+if __name__ == "__main__":
+    run_tests()
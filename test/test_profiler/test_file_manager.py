@@ -0,0 +1,53 @@
+import json
+import os
+import shutil
+import tempfile
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.analysis.prof_common_func.file_manager import FileManager
+
+CHUNK_SIZE = 4
+
+
+class TestFileManager(TestCase):
+    def setUp(self):
+        self.work_path = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.work_path, "trace_view.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.work_path)
+
+    def write_stream(self, data: list) -> str:
+        FileManager.create_json_file_by_stream(self.file_path, iter(data), chunk_size=CHUNK_SIZE)
+        with open(self.file_path) as file:
+            return file.read()
+
+    def test_empty_stream(self):
+        self.assertEqual("[]", self.write_stream([]))
+
+    def test_chunk_boundaries(self):
+        for item_num in (1, CHUNK_SIZE - 1, CHUNK_SIZE, CHUNK_SIZE + 1, 2 * CHUNK_SIZE, 2 * CHUNK_SIZE + 1):
+            data = list(range(item_num))
+            self.assertEqual(json.dumps(data, separators=(",", ":")), self.write_stream(data))
+
+    def test_trace_events(self):
+        data = [{"ph": "X", "name": f"aten::add_{index}", "ts": index * 1.5, "args": {"Input Dims": [[2, 3]]}}
+                for index in range(CHUNK_SIZE + 1)]
+        self.assertEqual(data, json.loads(self.write_stream(data)))
+
+    def test_stream_is_consumed_once(self):
+        pulled_list = []
+
+        def iter_data():
+            for index in range(3 * CHUNK_SIZE):
+                pulled_list.append(index)
+                yield index
+
+        FileManager.create_json_file_by_stream(self.file_path, iter_data(), chunk_size=CHUNK_SIZE)
+        self.assertEqual(list(range(3 * CHUNK_SIZE)), pulled_list)
+        with open(self.file_path) as file:
+            self.assertEqual(pulled_list, json.load(file))
+
+
+if __name__ == "__main__":
+    run_tests()
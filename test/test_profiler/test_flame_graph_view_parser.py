@@ -0,0 +1,79 @@
+import json
+import os
+import shutil
+import tempfile
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.analysis.prof_common_func.global_var import GlobalVar
+from torch_npu.profiler.analysis.prof_parse.cann_file_parser import CANNFileParser
+from torch_npu.profiler.analysis.prof_view.flame_graph_view_parser import FlameGraphViewParser
+
+from profiler_data_builder import create_profiler_data, pack_torch_op
+
+FORWARD_3 = "model.py(3): forward;train.py(9): main"
+FORWARD_5 = "model.py(5): forward;train.py(9): main"
+# the flow joins the acl api at 15 us, inside aten::mm, to the kernel at 100 us
+TIMELINE = [
+    {"ph": "s", "cat": "HostToDevice", "id": "1", "pid": 3, "tid": 3, "ts": 15.0, "name": "HostToDevice"},
+    {"ph": "f", "cat": "HostToDevice", "id": "1", "pid": 7, "tid": 1, "ts": 100.0, "name": "HostToDevice"},
+    {"ph": "X", "name": "MatMul", "pid": 7, "tid": 1, "ts": 100.0, "dur": 3.0, "args": {"Task Type": "AI_CORE"}}
+]
+
+
+class TestFlameGraphViewParser(TestCase):
+    def setUp(self):
+        self.work_path = tempfile.mkdtemp()
+        self.profiler_path = os.path.join(self.work_path, "worker_ascend_pt")
+        self.output_path = os.path.join(self.work_path, "output")
+        CANNFileParser.clear_cache()
+
+    def tearDown(self):
+        GlobalVar.reset()
+        CANNFileParser.clear_cache()
+        shutil.rmtree(self.work_path)
+
+    def read_folded(self, file_name: str) -> list:
+        with open(os.path.join(self.output_path, file_name)) as file:
+            return file.read().splitlines()
+
+    def test_flame_graph(self):
+        torch_ops = [pack_torch_op(0, 1000000, name="ProfilerStep#1", call_stack="train.py(9): main"),
+                     pack_torch_op(10000, 50000, name="aten::linear", call_stack=FORWARD_3),
+                     pack_torch_op(12000, 30000, name="aten::mm", call_stack=FORWARD_3),
+                     pack_torch_op(60000, 70000, name="aten::add", call_stack=FORWARD_5),
+                     pack_torch_op(80000, 85000, name="aten::add", call_stack=FORWARD_5),
+                     pack_torch_op(90000, 95000, name="aten::relu")]
+        create_profiler_data(self.profiler_path, torch_ops, timeline=TIMELINE)
+        GlobalVar.init(self.profiler_path)
+        FlameGraphViewParser(self.profiler_path).generate_view(self.output_path)
+        # the op name is the leaf frame, the spaces of the frames are replaced and the values are in ns
+        self.assertEqual(["train.py(9):_main;model.py(3):_forward;aten::linear 22000",
+                          "train.py(9):_main;model.py(3):_forward;aten::mm 18000",
+                          "train.py(9):_main;model.py(5):_forward;aten::add 15000"],
+                         self.read_folded(FlameGraphViewParser.HOST_FOLDED))
+        self.assertEqual(["train.py(9):_main;model.py(3):_forward;aten::mm 3000"],
+                         self.read_folded(FlameGraphViewParser.DEVICE_FOLDED))
+        with open(os.path.join(self.output_path, FlameGraphViewParser.SPEEDSCOPE)) as file:
+            speedscope = json.load(file)
+        self.assertEqual("worker_ascend_pt", speedscope["name"])
+        self.assertEqual(1, speedscope["activeProfileIndex"])
+        frames = [frame["name"] for frame in speedscope["shared"]["frames"]]
+        self.assertEqual(len(set(frames)), len(frames))
+        host_profile, device_profile = speedscope["profiles"]
+        self.assertEqual({("aten::linear", 22.0), ("aten::mm", 18.0), ("aten::add", 15.0)},
+                         {(frames[sample[-1]], weight)
+                          for sample, weight in zip(host_profile["samples"], host_profile["weights"])})
+        self.assertEqual(55.0, host_profile["endValue"])
+        self.assertEqual([["train.py(9): main", "model.py(3): forward", "aten::mm"]],
+                         [[frames[frame] for frame in sample] for sample in device_profile["samples"]])
+        self.assertEqual([3.0], device_profile["weights"])
+
+    def test_no_call_stack(self):
+        create_profiler_data(self.profiler_path, [pack_torch_op(0, 1000, name="aten::add")])
+        GlobalVar.init(self.profiler_path)
+        FlameGraphViewParser(self.profiler_path).generate_view(self.output_path)
+        self.assertFalse(os.path.exists(self.output_path))
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,42 @@
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.analysis.prof_common_func.flops_calculator import FlopsCalculator
+
+CONV2D_ARGS = "input_size:[1, 3, 32, 32];weight_size:[16, 3, 3, 3];groups:1;padding:[1, 1];dilation:[1, 1]"
+
+
+class TestFlopsCalculator(TestCase):
+    def test_gemm(self):
+        self.assertEqual(2 * 4 * 8 * 16,
+                         FlopsCalculator.compute_flops("aten::mm", "mat1_size:[4, 8];mat2_size:[8, 16]"))
+        self.assertEqual(0, FlopsCalculator.compute_flops("aten::mm", "mat1_size:[];mat2_size:[8, 16]"))
+        self.assertEqual(0, FlopsCalculator.compute_flops("aten::mm", "mat1_size:[4, 8]"))
+
+    def test_conv2d(self):
+        # a 3x3 kernel with a padding of 1 keeps the 32x32 input size at a stride of 1
+        self.assertEqual(2 * 32 * 32 * 3 * 3 * 3 * 16,
+                         FlopsCalculator.compute_flops("aten::conv2d", CONV2D_ARGS + ";stride:[1, 1]"))
+        self.assertEqual(2 * 16 * 16 * 3 * 3 * 3 * 16,
+                         FlopsCalculator.compute_flops("aten::conv2d", CONV2D_ARGS + ";stride:[2, 2]"))
+        self.assertEqual(2 * 32 * 32 * 3 * 3 * 3 * 16 // 2,
+                         FlopsCalculator.compute_flops("aten::conv2d",
+                                                       CONV2D_ARGS.replace("groups:1", "groups:2") +
+                                                       ";stride:[1, 1]"))
+        self.assertEqual(0, FlopsCalculator.compute_flops("aten::conv2d", CONV2D_ARGS + ";stride:[0, 1]"))
+        self.assertEqual(0, FlopsCalculator.compute_flops("aten::conv2d",
+                                                          CONV2D_ARGS.replace("groups:1", "groups:0") +
+                                                          ";stride:[1, 1]"))
+        self.assertEqual(0, FlopsCalculator.compute_flops("aten::conv2d", CONV2D_ARGS))
+
+    def test_elementwise(self):
+        self.assertEqual(24, FlopsCalculator.compute_flops("aten::mul", "mat_size:[2, 3, 4]"))
+        self.assertEqual(6, FlopsCalculator.compute_flops("aten::add", "mat_size:[6]"))
+
+    def test_unknown_or_invalid_args(self):
+        self.assertEqual(0, FlopsCalculator.compute_flops("aten::relu", "mat_size:[2, 3]"))
+        self.assertEqual(0, FlopsCalculator.compute_flops("aten::mul", ""))
+        self.assertEqual(0, FlopsCalculator.compute_flops("aten::mul", "mat_size:[2, x]"))
+        self.assertEqual(0, FlopsCalculator.compute_flops("aten::mm", "mat1_size:4;mat2_size:[8, 16]"))
+
+
+if __name__ == "__main__":
+    run_tests()
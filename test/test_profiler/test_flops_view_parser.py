@@ -0,0 +1,124 @@
+import csv
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.analysis.prof_common_func.constant import Constant
+from torch_npu.profiler.analysis.prof_common_func.csv_headers import CsvHeaders
+from torch_npu.profiler.analysis.prof_common_func.global_var import GlobalVar
+from torch_npu.profiler.analysis.prof_parse.cann_file_parser import CANNFileParser
+from torch_npu.profiler.analysis.prof_view.flops_view_parser import FlopsViewParser
+
+from profiler_data_builder import create_profiler_data, pack_torch_op
+
+# 2e9 flops in 1000 us of aten::mm and 1e6 flops in 100 us of aten::add
+MM_FLOPS_ARGS = "mat1_size:[1000, 1000];mat2_size:[1000, 1000]"
+ADD_FLOPS_ARGS = "mat_size:[1000, 1000]"
+# the flows join the acl apis at 15 us and 60 us to the kernels at 200 us and 1300 us
+TIMELINE = [
+    {"ph": "s", "cat": "HostToDevice", "id": "1", "pid": 3, "tid": 3, "ts": 15.0, "name": "HostToDevice"},
+    {"ph": "f", "cat": "HostToDevice", "id": "1", "pid": 7, "tid": 1, "ts": 200.0, "name": "HostToDevice"},
+    {"ph": "X", "name": "MatMul", "pid": 7, "tid": 1, "ts": 200.0, "dur": 1000.0, "args": {"Task Type": "AI_CORE"}},
+    {"ph": "s", "cat": "HostToDevice", "id": "2", "pid": 3, "tid": 3, "ts": 60.0, "name": "HostToDevice"},
+    {"ph": "f", "cat": "HostToDevice", "id": "2", "pid": 7, "tid": 1, "ts": 1300.0, "name": "HostToDevice"},
+    {"ph": "X", "name": "Add", "pid": 7, "tid": 1, "ts": 1300.0, "dur": 100.0, "args": {"Task Type": "AI_VECTOR"}}
+]
+# the kernels move 2e6 and 2e7 bytes: GB/s times us is 1e3 bytes
+OP_SUMMARY = [["MatMul", "MatMul", 200.0, 1000.0, 1.0, 1.0], ["Add", "Add", 1300.0, 100.0, 100.0, 100.0]]
+
+
+class TestFlopsViewParser(TestCase):
+    def setUp(self):
+        self.work_path = tempfile.mkdtemp()
+        self.profiler_path = os.path.join(self.work_path, "worker_ascend_pt")
+        self.output_path = os.path.join(self.work_path, "output")
+        torch_ops = [pack_torch_op(0, 5000000, name="ProfilerStep#1"),
+                     pack_torch_op(10000, 50000, name="aten::mm", input_shapes="[1000, 1000];[1000, 1000]",
+                                   flops=MM_FLOPS_ARGS),
+                     pack_torch_op(55000, 70000, name="aten::add", input_shapes="[1000, 1000]",
+                                   flops=ADD_FLOPS_ARGS),
+                     pack_torch_op(80000, 90000, name="aten::relu", flops=ADD_FLOPS_ARGS)]
+        create_profiler_data(self.profiler_path, torch_ops, timeline=TIMELINE)
+        summary_path = os.path.join(self.profiler_path, "PROF_000001_20230101000000_abc", "device_0", "summary")
+        os.makedirs(summary_path)
+        self.op_summary_path = os.path.join(summary_path, "op_summary_0_1.csv")
+        self.write_op_summary(OP_SUMMARY)
+        CANNFileParser.clear_cache()
+        GlobalVar.init(self.profiler_path)
+
+    def tearDown(self):
+        GlobalVar.reset()
+        CANNFileParser.clear_cache()
+        shutil.rmtree(self.work_path)
+
+    def write_op_summary(self, op_summary: list) -> None:
+        with open(self.op_summary_path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow([CsvHeaders.OP_NAME, CsvHeaders.OP_TYPE, CsvHeaders.TASK_START_TIME,
+                             CsvHeaders.TASK_DURATION, "aiv_" + CsvHeaders.MAIN_MEM_READ_BW,
+                             "aiv_" + CsvHeaders.MAIN_MEM_WRITE_BW])
+            writer.writerows(op_summary)
+
+    def read_arithmetic_intensity(self) -> list:
+        with open(os.path.join(self.output_path, FlopsViewParser.FLOPS_VIEW), newline="") as file:
+            return [row["Arithmetic Intensity(FLOP/Byte)"] for row in csv.DictReader(file)]
+
+    def test_flops_with_peaks(self):
+        FlopsViewParser(self.profiler_path).generate_view(self.output_path, **{Constant.PEAK_TFLOPS: 4,
+                                                                                Constant.PEAK_BANDWIDTH: 1000})
+        with open(os.path.join(self.output_path, FlopsViewParser.FLOPS_VIEW), newline="") as file:
+            rows = list(csv.DictReader(file))
+        # aten::relu has no known flops
+        self.assertEqual(["aten::mm", "aten::add"], [row["Name"] for row in rows])
+        self.assertEqual([2.0, 0.001], [float(row["GFLOPs"]) for row in rows])
+        self.assertEqual([1000.0, 100.0], [float(row["Device Duration(us)"]) for row in rows])
+        self.assertEqual([2.0, 0.01], [float(row["TFLOPS"]) for row in rows])
+        self.assertEqual([50.0, 0.25], [float(row["MFU(%)"]) for row in rows])
+        # the ridge point is 4 TFLOPS over 1000 GB/s, 4 flop per byte
+        self.assertEqual([1000.0, 0.05], [float(row["Arithmetic Intensity(FLOP/Byte)"]) for row in rows])
+        self.assertEqual(["compute", "memory"], [row["Bound"] for row in rows])
+
+        with open(os.path.join(self.output_path, FlopsViewParser.FLOPS_SUMMARY)) as file:
+            summary = json.load(file)
+        self.assertEqual(2.001, summary["total"]["gflops"])
+        self.assertEqual(1100.0, summary["total"]["device_duration(us)"])
+        self.assertEqual(["aten::mm", "aten::add"], [op_type["name"] for op_type in summary["op_types"]])
+        # the step lasts from the start of its first kernel to the end of its last one
+        step = summary["steps"][0]
+        self.assertEqual(["1", 1200.0], [step["step"], step["step_duration(us)"]])
+        self.assertAlmostEqual(2.001e9 / 1200e6, step["step_tflops"])
+        self.assertAlmostEqual(2.001e9 / 1200e6 / 4 * 100, step["step_mfu(%)"])
+
+    def test_flops_without_peaks(self):
+        with mock.patch.dict(os.environ, {Constant.PEAK_BANDWIDTH_ENV: "1000"}):
+            os.environ.pop(Constant.PEAK_TFLOPS_ENV, None)
+            FlopsViewParser(self.profiler_path).generate_view(self.output_path, **{Constant.PEAK_TFLOPS: -1})
+        with open(os.path.join(self.output_path, FlopsViewParser.FLOPS_VIEW), newline="") as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual(["", ""], [row["MFU(%)"] for row in rows])
+        self.assertEqual(["", ""], [row["Bound"] for row in rows])
+        self.assertEqual([1000.0, 0.05], [float(row["Arithmetic Intensity(FLOP/Byte)"]) for row in rows])
+
+    def test_ai_cpu_rows_without_memory_metrics(self):
+        # the ai cpu and hccl tasks before and between the ai core kernels carry N/A in the memory metric columns
+        self.write_op_summary([["GetNext", "GetNext", 100.0, 50.0, "N/A", "N/A"], OP_SUMMARY[0],
+                               ["hcom_allReduce", "AllReduce", 1250.0, 20.0, "N/A", "N/A"], OP_SUMMARY[1]])
+        FlopsViewParser(self.profiler_path).generate_view(self.output_path, **{Constant.PEAK_TFLOPS: 4,
+                                                                                Constant.PEAK_BANDWIDTH: 1000})
+        self.assertEqual([1000.0, 0.05], [float(value) for value in self.read_arithmetic_intensity()])
+
+    def test_op_summary_without_memory_metrics(self):
+        with open(self.op_summary_path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow([CsvHeaders.OP_NAME, CsvHeaders.OP_TYPE, CsvHeaders.TASK_START_TIME,
+                             CsvHeaders.TASK_DURATION])
+            writer.writerows([row[:4] for row in OP_SUMMARY])
+        FlopsViewParser(self.profiler_path).generate_view(self.output_path, **{Constant.PEAK_TFLOPS: 4})
+        self.assertEqual(["", ""], self.read_arithmetic_intensity())
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,45 @@
+import os
+import shutil
+import tempfile
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.analysis.prof_bean.op_mark_bean import OpMarkBean
+from torch_npu.profiler.analysis.prof_parse.fwk_file_parser import FwkFileParser
+
+from profiler_data_builder import create_profiler_data, pack_op_mark
+
+
+class TestFwkFileParser(TestCase):
+    def setUp(self):
+        self.work_path = tempfile.mkdtemp()
+        self.profiler_path = os.path.join(self.work_path, "worker_ascend_pt")
+        create_profiler_data(self.profiler_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.work_path)
+
+    def write_op_marks(self, op_mark_list: list) -> None:
+        with open(os.path.join(self.profiler_path, "FRAMEWORK", "torch.op_mark"), "wb") as file:
+            file.write(b"".join(op_mark_list))
+
+    def test_task_queue_data(self):
+        # the marks are written out of order, the enqueue end of aten::mm on another thread has no start
+        self.write_op_marks([pack_op_mark(4000, OpMarkBean.DEQUEUE_END, 1, name="aten::add", tid=2),
+                             pack_op_mark(1000, OpMarkBean.ENQUEUE_START, 1, name="aten::add"),
+                             pack_op_mark(1500, OpMarkBean.ENQUEUE_END, 1, name="aten::add"),
+                             pack_op_mark(3000, OpMarkBean.DEQUEUE_START, 1, name="aten::add", tid=2),
+                             pack_op_mark(5000, OpMarkBean.ENQUEUE_START, 2, name="aten::mm"),
+                             pack_op_mark(5500, OpMarkBean.ENQUEUE_END, 2, name="aten::mm", tid=3)])
+        enqueue_data_list, dequeue_data_list = FwkFileParser(self.profiler_path).get_task_queue_data()
+        self.assertEqual([(1, 1.0, 0.5)], [(data.corr_id, data.ts, data.dur) for data in enqueue_data_list])
+        self.assertTrue(enqueue_data_list[0].is_enqueue_end)
+        self.assertEqual([(1, 3.0, 1.0)], [(data.corr_id, data.ts, data.dur) for data in dequeue_data_list])
+        self.assertTrue(dequeue_data_list[0].is_dequeue_start)
+        self.assertEqual("Dequeue@aten::add", dequeue_data_list[0].name)
+
+    def test_no_op_mark(self):
+        self.assertEqual(([], []), FwkFileParser(self.profiler_path).get_task_queue_data())
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,101 @@
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+import zlib
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.analysis.prof_common_func.constant import Constant
+from torch_npu.profiler.analysis.prof_common_func.file_manager import FileManager
+from torch_npu.profiler.analysis.prof_common_func.gzip_writer import GzipWriter
+
+HEADERS = ["Name", "Count", "Duration(us)"]
+DATA = [["aten::add", 3, 1.5], ["aten::mm", 1, 20.25], ["aten::mul", 7, 0.5]]
+
+
+class RowBean:
+    def __init__(self, data: dict):
+        self.row = [data.get(header) for header in HEADERS]
+
+
+def count_gzip_members(data: bytes) -> int:
+    member_num = 0
+    while data:
+        decompressor = zlib.decompressobj(wbits=31)
+        decompressor.decompress(data)
+        data = decompressor.unused_data
+        member_num += 1
+    return member_num
+
+
+class TestGzipWriter(TestCase):
+    def setUp(self):
+        self.work_path = tempfile.mkdtemp()
+        FileManager.set_use_gzip(True)
+
+    def tearDown(self):
+        FileManager.set_use_gzip(False)
+        shutil.rmtree(self.work_path)
+
+    def test_multi_member_output(self):
+        text = "".join(f"line {index}\n" for index in range(100))
+        file = io.BytesIO()
+        with GzipWriter(file, chunk_size=64, max_workers=2) as gzip_file:
+            for line in text.splitlines(keepends=True):
+                gzip_file.write(line)
+        data = file.getvalue()
+        # every chunk of at least 64 bytes is a member of its own
+        self.assertGreater(count_gzip_members(data), len(text) // 128)
+        self.assertEqual(text, gzip.decompress(data).decode())
+
+    def test_large_write_is_cut_into_chunks(self):
+        file = io.BytesIO()
+        with GzipWriter(file, chunk_size=10, max_workers=1) as gzip_file:
+            gzip_file.write(b"x" * 95)
+        self.assertEqual(10, count_gzip_members(file.getvalue()))
+        self.assertEqual(b"x" * 95, gzip.decompress(file.getvalue()))
+
+    def test_error_cancels_the_pending_chunks(self):
+        file = io.BytesIO()
+        with self.assertRaises(ValueError):
+            with GzipWriter(file, chunk_size=10, max_workers=1) as gzip_file:
+                gzip_file.write(b"x" * 95)
+                raise ValueError("write failed")
+        self.assertFalse(gzip_file._pending)
+
+    def test_csv_round_trip(self):
+        FileManager.create_csv_file(self.work_path, DATA, "op.csv", HEADERS)
+        file_path = os.path.join(self.work_path, "op.csv" + Constant.GZIP_SUFFIX)
+        self.assertTrue(GzipWriter.is_gzip_file(file_path))
+        with gzip.open(file_path, "rt", newline="") as file:
+            self.assertEqual([HEADERS] + [[str(value) for value in row] for row in DATA], list(csv.reader(file)))
+        self.assertEqual([[str(value) for value in row] for row in DATA],
+                         [bean.row for bean in FileManager.read_csv_file(file_path, RowBean)])
+
+    def test_read_plain_and_gzip_csv_alike(self):
+        FileManager.create_csv_file(self.work_path, DATA, "op.csv", HEADERS)
+        FileManager.set_use_gzip(False)
+        FileManager.create_csv_file(self.work_path, DATA, "op.csv", HEADERS)
+        plain_rows = FileManager.read_csv_file(os.path.join(self.work_path, "op.csv"), RowBean)
+        gzip_rows = FileManager.read_csv_file(os.path.join(self.work_path, "op.csv" + Constant.GZIP_SUFFIX), RowBean)
+        self.assertEqual([bean.row for bean in plain_rows], [bean.row for bean in gzip_rows])
+
+    def test_json_round_trip(self):
+        data = [{"name": "aten::add", "ts": 1.5}, {"name": "aten::mm", "ts": 20.25}]
+        # the small json results stay plain
+        file_path = os.path.join(self.work_path, "communication.json")
+        FileManager.create_json_file_by_path(file_path, data)
+        self.assertFalse(GzipWriter.is_gzip_file(file_path))
+        self.assertEqual(data, json.loads(FileManager.file_read_all(file_path)))
+        # the streamed trace is compressed
+        file_path = os.path.join(self.work_path, "trace_view.json")
+        FileManager.create_json_file_by_stream(file_path, iter(data), chunk_size=1)
+        self.assertTrue(GzipWriter.is_gzip_file(file_path + Constant.GZIP_SUFFIX))
+        self.assertEqual(data, json.loads(FileManager.file_read_all(file_path + Constant.GZIP_SUFFIX)))
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,52 @@
+import random
+
+import numpy as np
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.analysis.prof_common_func.interval_index import IntervalIndex
+
+
+def find_innermost_by_scan(starts: list, ends: list, ts: float, closed: bool) -> int:
+    innermost = IntervalIndex.INVALID_INDEX
+    for index, (start, end) in enumerate(zip(starts, ends)):
+        if start <= ts and (ts <= end if closed else ts < end):
+            if innermost == IntervalIndex.INVALID_INDEX or start >= starts[innermost]:
+                innermost = index
+    return innermost
+
+
+class TestIntervalIndex(TestCase):
+    def test_nested_intervals(self):
+        interval_index = IntervalIndex([0, 10, 12, 30], [100, 50, 20, 40])
+        self.assertEqual([0, 1, 2, 1, 3, 0, IntervalIndex.INVALID_INDEX, IntervalIndex.INVALID_INDEX],
+                         interval_index.find_innermost([5, 10, 15, 20, 35, 50, 100, -1]).tolist())
+        self.assertEqual(2, interval_index.find_innermost(12))
+
+    def test_closed_intervals(self):
+        interval_index = IntervalIndex([0, 10], [100, 20], closed=True)
+        self.assertEqual([1, 1, 0, 0], interval_index.find_innermost([10, 20, 21, 100]).tolist())
+
+    def test_empty_index(self):
+        interval_index = IntervalIndex([], [])
+        self.assertEqual(0, len(interval_index))
+        self.assertEqual(IntervalIndex.INVALID_INDEX, interval_index.find_innermost(1.0))
+        self.assertEqual([IntervalIndex.INVALID_INDEX] * 2, interval_index.find_innermost([1.0, 2.0]).tolist())
+
+    def test_length_mismatch(self):
+        with self.assertRaises(RuntimeError):
+            IntervalIndex([0, 1], [2])
+
+    def test_random_intervals(self):
+        rand = random.Random(0)
+        for closed in (False, True):
+            for _ in range(50):
+                starts = [rand.randint(0, 50) for _ in range(rand.randint(1, 30))]
+                ends = [start + rand.randint(0, 20) for start in starts]
+                interval_index = IntervalIndex(starts, ends, closed=closed)
+                ts_list = [rand.randint(-5, 75) + rand.choice((0, 0.5)) for _ in range(100)]
+                self.assertEqual([find_innermost_by_scan(starts, ends, ts, closed) for ts in ts_list],
+                                 interval_index.find_innermost(np.array(ts_list)).tolist())
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,70 @@
+import json
+import os
+import random
+import shutil
+import tempfile
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.analysis.prof_common_func.json_array_reader import JsonArrayReader
+
+
+class TestJsonArrayReader(TestCase):
+    def setUp(self):
+        self.work_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_path)
+
+    def write_file(self, file_name: str, content: str) -> str:
+        file_path = os.path.join(self.work_path, file_name)
+        with open(file_path, "w", encoding="utf-8") as file:
+            file.write(content)
+        return file_path
+
+    def test_numbers_cut_at_chunk_boundary(self):
+        content = '[12345, -6.75e+10, 0.125, 1E3, 7, 98765432109876543210]'
+        file_path = self.write_file("numbers.json", content)
+        for chunk_size in range(1, len(content) + 2):
+            self.assertEqual(json.loads(content), list(JsonArrayReader(chunk_size).iter_items(file_path)))
+
+    def test_not_json_array(self):
+        for file_name, content in (("object.json", '{"ts": 1}'), ("number.json", "  42"), ("empty.json", "")):
+            file_path = self.write_file(file_name, content)
+            self.assertEqual([], list(JsonArrayReader(4).iter_items(file_path)))
+        with self.assertRaises(RuntimeError):
+            list(JsonArrayReader().iter_items(os.path.join(self.work_path, "missing.json")))
+
+    def test_invalid_json_array(self):
+        for file_name, content in (("unclosed.json", '[{"ts": 1}, {"ts": 2}'), ("no_comma.json", "[1 2]"),
+                                   ("bad_item.json", "[1, tru]"), ("cut_item.json", '[{"ts": 1')):
+            file_path = self.write_file(file_name, content)
+            with self.assertRaises(RuntimeError):
+                list(JsonArrayReader(3).iter_items(file_path))
+
+    def test_multi_byte_char_cut_at_chunk_boundary(self):
+        content = json.dumps([{"name": "算子" * 3}, "é"], ensure_ascii=False)
+        file_path = self.write_file("utf8.json", content)
+        for chunk_size in range(1, 12):
+            self.assertEqual(json.loads(content), list(JsonArrayReader(chunk_size).iter_items(file_path)))
+
+    def test_batches_of_all_files(self):
+        file_path_list = [self.write_file("first.json", "[1, 2, 3]"), self.write_file("object.json", "{}"),
+                          self.write_file("second.json", "[4, 5]")]
+        self.assertEqual([[1, 2], [3, 4], [5]], list(JsonArrayReader(2, 2).iter_batches(file_path_list)))
+
+    def test_fuzz_against_json_loads(self):
+        random.seed(20)
+        value_makers = [lambda: random.randint(-10 ** 6, 10 ** 6), lambda: random.uniform(-1e6, 1e6),
+                        lambda: random.choice([True, False, None]), lambda: "s" * random.randint(0, 5) + "\"\\",
+                        lambda: {"ph": "X", "ts": str(random.random()), "dur": random.random(), "args": {}},
+                        lambda: [random.randint(0, 9) for _ in range(random.randint(0, 3))]]
+        for case_index in range(30):
+            data = [random.choice(value_makers)() for _ in range(random.randint(0, 20))]
+            content = json.dumps(data, indent=random.choice([None, 1]), separators=random.choice([None, (",", ":")]))
+            file_path = self.write_file(f"fuzz_{case_index}.json", content)
+            for chunk_size in (1, 2, 3, 7, 16, 64, len(content) + 1):
+                self.assertEqual(json.loads(content), list(JsonArrayReader(chunk_size).iter_items(file_path)))
+
+
+if __name__ == "__main__":
+    run_tests()
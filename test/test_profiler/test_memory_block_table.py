@@ -0,0 +1,44 @@
+import numpy as np
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.analysis.prof_common_func.memory_block_table import MemoryBlockTable
+
+
+def create_memory_block_table(record_ptr: list, record_size: list, record_pid: list) -> MemoryBlockTable:
+    record_num = len(record_ptr)
+    return MemoryBlockTable(np.arange(record_num, dtype=np.float64), np.array(record_ptr, dtype=np.int64),
+                            np.array(record_size, dtype=np.int64), np.zeros(record_num, dtype=np.int64),
+                            np.zeros(record_num, dtype=np.int64), np.array(record_pid, dtype=np.int64),
+                            np.zeros(record_num, dtype=np.int64))
+
+
+class TestMemoryBlockTable(TestCase):
+    def test_live_block_index(self):
+        # the pointer 1 is released at 2 and allocated again at 4, the pointer 3 is allocated before the
+        # profiling and released at 3, and the pointer 2 of the process 2 is another device. a block is live
+        # at its allocation record but not at its release record
+        memory_block_table = create_memory_block_table([1, 2, 1, 3, 1, 2], [8, 4, -8, -2, 16, -4],
+                                                       [1, 2, 1, 1, 1, 2])
+        self.assertEqual({8, 4, 16, 2}, set(memory_block_table.block_size.tolist()))
+        live_size_list = [sorted(memory_block_table.block_size[block_index].tolist())
+                          for block_index in memory_block_table.get_live_block_index([0, 1, 2, 3, 4, 5, 0])]
+        self.assertEqual([[2, 8], [4], [2], [], [16], [], [2, 8]], live_size_list)
+        self.assertEqual([], memory_block_table.get_live_block_index([]))
+
+    def test_live_block_index_matches_scan(self):
+        rng = np.random.default_rng(0)
+        record_num = 300
+        memory_block_table = create_memory_block_table(
+            rng.integers(0, 20, record_num).tolist(),
+            (rng.integers(1, 100, record_num) * rng.choice([1, -1], record_num)).tolist(),
+            rng.integers(0, 3, record_num).tolist())
+        record_pos_list = rng.integers(0, record_num, 50).tolist()
+        for record_pos, block_index in zip(record_pos_list,
+                                           memory_block_table.get_live_block_index(record_pos_list)):
+            is_live = (memory_block_table.alloc_pos <= record_pos) & (memory_block_table.free_pos > record_pos) & \
+                      (memory_block_table.block_device == memory_block_table.record_device[record_pos])
+            self.assertEqual(sorted(np.flatnonzero(is_live).tolist()), sorted(block_index.tolist()))
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,57 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.analysis.prof_common_func.global_var import GlobalVar
+from torch_npu.profiler.analysis.prof_parse.cann_file_parser import CANNFileParser
+from torch_npu.profiler.analysis.prof_view.memory_leak_view_parser import MemoryLeakViewParser
+
+from profiler_data_builder import create_profiler_data, pack_memory_record, pack_torch_op
+
+STEP_NS = 1000000
+STEP_NUM = 4
+
+
+class TestMemoryLeakViewParser(TestCase):
+    def setUp(self):
+        self.work_path = tempfile.mkdtemp()
+        self.profiler_path = os.path.join(self.work_path, "worker_ascend_pt")
+        self.output_path = os.path.join(self.work_path, "output")
+        os.makedirs(self.output_path)
+        torch_ops, memory_records = [], []
+        for step in range(STEP_NUM):
+            start = step * STEP_NS
+            torch_ops.append(pack_torch_op(start, start + STEP_NS - 1000, name=f"ProfilerStep#{step + 1}"))
+            torch_ops.append(pack_torch_op(start + 1000, start + 2000, name="aten::cat", call_stack="cache.py(7)"))
+            torch_ops.append(pack_torch_op(start + 3000, start + 4000, name="aten::add", call_stack="model.py(3)"))
+            # aten::cat keeps 1 KB more every step, aten::add frees its block in the same step
+            memory_records.append(pack_memory_record(100 + step, start + 1500, 1024, 0, 0))
+            memory_records.append(pack_memory_record(1, start + 3500, 2048, 0, 0))
+            memory_records.append(pack_memory_record(1, start + 5000, -2048, 0, 0))
+        create_profiler_data(self.profiler_path, torch_ops, memory_records)
+        CANNFileParser.clear_cache()
+        GlobalVar.init(self.profiler_path)
+
+    def tearDown(self):
+        GlobalVar.reset()
+        CANNFileParser.clear_cache()
+        shutil.rmtree(self.work_path)
+
+    def test_growing_site(self):
+        for site_chunk_size in (1, MemoryLeakViewParser.SITE_CHUNK_SIZE):
+            with mock.patch.object(MemoryLeakViewParser, "SITE_CHUNK_SIZE", site_chunk_size):
+                MemoryLeakViewParser(self.profiler_path).generate_view(self.output_path)
+            with open(os.path.join(self.output_path, MemoryLeakViewParser.MEMORY_LEAK_DETAIL)) as file:
+                leak_detail = json.load(file)
+            self.assertEqual([("aten::cat", "cache.py(7)")],
+                             [(leak["name"], leak["call_stack"]) for leak in leak_detail])
+            self.assertAlmostEqual(1.0, leak_detail[0]["growth_rate(KB/step)"])
+            self.assertEqual([1.0, 2.0, 3.0, 4.0], [step["live(KB)"] for step in leak_detail[0]["steps"]])
+            self.assertEqual([1.0] * STEP_NUM, [step["retained(KB)"] for step in leak_detail[0]["steps"]])
+
+
+if __name__ == "__main__":
+    run_tests()
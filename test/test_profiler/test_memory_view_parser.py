@@ -0,0 +1,43 @@
+import os
+import shutil
+import tempfile
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.analysis.prof_view.memory_view_parser import MemoryViewParser
+
+from profiler_data_builder import create_profiler_data, pack_memory_record, pack_torch_op
+
+
+class TestMemoryViewParser(TestCase):
+    def setUp(self):
+        self.work_path = tempfile.mkdtemp()
+        self.profiler_path = os.path.join(self.work_path, "worker_ascend_pt")
+        torch_ops = [pack_torch_op(1000, 9000, name="aten::linear"),
+                     pack_torch_op(2000, 3000, name="aten::empty"),
+                     pack_torch_op(20000, 30000, name="aten::add")]
+        memory_records = [pack_memory_record(1, 2000, 1024, 1024, 2048),
+                          pack_memory_record(2, 5000, 512, 1536, 2048),
+                          pack_memory_record(1, 25000, -1024, 512, 2048),
+                          pack_memory_record(3, 15000, 256, 768, 2048),
+                          pack_memory_record(4, 40000, -128, 640, 2048)]
+        create_profiler_data(self.profiler_path, torch_ops, memory_records)
+
+    def tearDown(self):
+        shutil.rmtree(self.work_path)
+
+    def test_pta_memory_data(self):
+        parser = MemoryViewParser(self.profiler_path)
+        parser._add_pta_memory_data()
+        # name, size in KB and allocation time -> release time and duration
+        rows = {(row[0], row[1], row[2]): row[3:5] for row in parser.memory_data}
+        # the allocation at 2 us is inside both aten::linear and aten::empty, the innermost one wins
+        self.assertEqual([25.0, 23.0], rows[("aten::empty", 1.0, 2.0)])
+        self.assertEqual([None, None], rows[("aten::linear", 0.5, 5.0)])
+        # no torch op encloses 15 us, and the release at 40 us has no allocation
+        self.assertEqual([None, None], rows[("", 0.25, 15.0)])
+        self.assertEqual([40.0, None], rows[("", -0.125, None)])
+        self.assertEqual(4, len(parser.memory_data))
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,105 @@
+import csv
+import json
+import os
+import shutil
+import tempfile
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.analysis.prof_common_func.global_var import GlobalVar
+from torch_npu.profiler.analysis.prof_parse.cann_file_parser import CANNFileParser
+from torch_npu.profiler.analysis.prof_view.module_view_parser import ModuleViewParser
+
+from profiler_data_builder import create_profiler_data, pack_memory_record, pack_torch_op
+
+MODEL = "Model::forward"
+ENCODER = MODEL + ";encoder(Encoder)::forward"
+LAYER_0 = ENCODER + ";l0(Layer)::forward"
+LAYER_1 = ENCODER + ";l1(Layer)::forward"
+INNER_LAYER = LAYER_1 + ";inner(Layer)::forward"
+# the flow joins the acl api at 15 us, inside aten::mm, to the kernel at 200 us
+TIMELINE = [
+    {"ph": "s", "cat": "HostToDevice", "id": "1", "pid": 3, "tid": 3, "ts": 15.0, "name": "HostToDevice"},
+    {"ph": "f", "cat": "HostToDevice", "id": "1", "pid": 7, "tid": 1, "ts": 200.0, "name": "HostToDevice"},
+    {"ph": "X", "name": "MatMul", "pid": 7, "tid": 1, "ts": 200.0, "dur": 3.0, "args": {"Task Type": "AI_CORE"}}
+]
+
+
+class TestModuleViewParser(TestCase):
+    def setUp(self):
+        self.work_path = tempfile.mkdtemp()
+        self.profiler_path = os.path.join(self.work_path, "worker_ascend_pt")
+        self.output_path = os.path.join(self.work_path, "output")
+        CANNFileParser.clear_cache()
+
+    def tearDown(self):
+        GlobalVar.reset()
+        CANNFileParser.clear_cache()
+        shutil.rmtree(self.work_path)
+
+    def read_csv(self, file_name: str) -> dict:
+        with open(os.path.join(self.output_path, file_name), newline="") as file:
+            return {row[next(iter(row))]: row for row in csv.DictReader(file)}
+
+    def test_module_view(self):
+        # aten::mm has no hierarchy of its own and belongs to the module of its parent aten::linear
+        torch_ops = [pack_torch_op(0, 1000000, name="ProfilerStep#1"),
+                     pack_torch_op(10000, 50000, name="aten::linear", module_hierarchy=LAYER_0),
+                     pack_torch_op(12000, 30000, name="aten::mm"),
+                     pack_torch_op(60000, 70000, name="aten::add", module_hierarchy=LAYER_1),
+                     pack_torch_op(80000, 90000, name="aten::relu", module_hierarchy=MODEL),
+                     pack_torch_op(100000, 110000, name="aten::mul", module_hierarchy=INNER_LAYER)]
+        memory_records = [pack_memory_record(1, 15000, 1024, 1024, 4096),
+                          pack_memory_record(2, 105000, 2048, 3072, 4096),
+                          pack_memory_record(1, 120000, -1024, 2048, 4096)]
+        create_profiler_data(self.profiler_path, torch_ops, memory_records, timeline=TIMELINE)
+        GlobalVar.init(self.profiler_path)
+        ModuleViewParser(self.profiler_path).generate_view(self.output_path)
+
+        module_rows = self.read_csv(ModuleViewParser.MODULE_VIEW)
+        path_list = ["Model::forward", "Model::forward/encoder(Encoder)::forward",
+                     "Model::forward/encoder(Encoder)::forward/l0(Layer)::forward",
+                     "Model::forward/encoder(Encoder)::forward/l1(Layer)::forward",
+                     "Model::forward/encoder(Encoder)::forward/l1(Layer)::forward/inner(Layer)::forward"]
+        self.assertEqual(path_list, list(module_rows))
+        rows = [module_rows[path] for path in path_list]
+        self.assertEqual(["Model", "Encoder", "Layer", "Layer", "Layer"], [row["Module Type"] for row in rows])
+        self.assertEqual(["0", "1", "2", "2", "3"], [row["Depth"] for row in rows])
+        self.assertEqual(["1", "0", "2", "1", "1"], [row["Exclusive Op Count"] for row in rows])
+        self.assertEqual(["5", "4", "2", "2", "1"], [row["Inclusive Op Count"] for row in rows])
+        self.assertEqual([10.0, 0.0, 40.0, 10.0, 10.0], [float(row["Exclusive Host Duration(us)"]) for row in rows])
+        self.assertEqual([70.0, 60.0, 40.0, 20.0, 10.0], [float(row["Inclusive Host Duration(us)"]) for row in rows])
+        self.assertEqual([3.0, 3.0, 3.0, 0.0, 0.0], [float(row["Inclusive Device Duration(us)"]) for row in rows])
+        self.assertEqual(["0", "0", "1", "0", "1"], [row["Exclusive Allocation Count"] for row in rows])
+        self.assertEqual([3.0, 3.0, 1.0, 2.0, 2.0], [float(row["Inclusive Allocated Memory(KB)"]) for row in rows])
+
+        # the inclusive numbers of Layer count inner only once, through l1
+        type_rows = self.read_csv(ModuleViewParser.MODULE_TYPE_VIEW)
+        self.assertEqual({"Model", "Encoder", "Layer"}, set(type_rows))
+        self.assertEqual("3", type_rows["Layer"]["Instance Count"])
+        self.assertEqual(60.0, float(type_rows["Layer"]["Exclusive Host Duration(us)"]))
+        self.assertEqual(60.0, float(type_rows["Layer"]["Inclusive Host Duration(us)"]))
+        self.assertEqual(70.0, float(type_rows["Model"]["Inclusive Host Duration(us)"]))
+
+        with open(os.path.join(self.output_path, ModuleViewParser.MODULE_TREE)) as file:
+            module_tree = json.load(file)
+        self.assertEqual(["Model::forward"], [node["name"] for node in module_tree])
+        encoder_node = module_tree[0]["children"][0]
+        self.assertEqual(["l0(Layer)::forward", "l1(Layer)::forward"],
+                         [node["name"] for node in encoder_node["children"]])
+        self.assertEqual(["inner(Layer)::forward"], [node["name"] for node in encoder_node["children"][1]["children"]])
+        self.assertEqual(20.0, encoder_node["children"][1]["inclusive"]["Host Duration(us)"])
+
+    def test_no_module_hierarchy(self):
+        create_profiler_data(self.profiler_path, [pack_torch_op(0, 1000, name="aten::add")])
+        GlobalVar.init(self.profiler_path)
+        ModuleViewParser(self.profiler_path).generate_view(self.output_path)
+        self.assertFalse(os.path.exists(self.output_path))
+
+    def test_module_type(self):
+        self.assertEqual("Layer", ModuleViewParser._get_module_type("l0(Layer)::forward"))
+        self.assertEqual("Model", ModuleViewParser._get_module_type("Model::forward"))
+        self.assertEqual("Model", ModuleViewParser._get_module_type("Model"))
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,85 @@
+import csv
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.analysis.npu_profiler import NpuProfiler
+from torch_npu.profiler.analysis.prof_common_func.columnar_file import ColumnarFile
+from torch_npu.profiler.analysis.prof_common_func.global_var import GlobalVar
+
+from profiler_data_builder import create_profiler_data, pack_torch_op, read_columnar_file
+
+STEP_NS = 1000000
+
+
+def create_rank_data(profiler_path: str, step_ids: list) -> None:
+    torch_ops = []
+    for index, step_id in enumerate(step_ids):
+        start = index * STEP_NS
+        torch_ops.append(pack_torch_op(start, start + STEP_NS - 1000, name=f"ProfilerStep#{step_id}"))
+        torch_ops.append(pack_torch_op(start + 1000, start + 2000, name="aten::mm",
+                                       flops="mat1_size:[4, 8];mat2_size:[8, 16]"))
+    create_profiler_data(profiler_path, torch_ops)
+
+
+class TestMultiRankAnalysis(TestCase):
+    def setUp(self):
+        self.work_path = tempfile.mkdtemp()
+        self.rank_step_dict = {"rank0_ascend_pt": ["1", "2", "3"], "rank1_ascend_pt": ["7", "8"]}
+        for rank_name, step_ids in self.rank_step_dict.items():
+            create_rank_data(os.path.join(self.work_path, rank_name), step_ids)
+
+    def tearDown(self):
+        GlobalVar.reset()
+        shutil.rmtree(self.work_path)
+
+    def test_ranks_in_one_worker_keep_their_own_steps(self):
+        # a single pool worker analyses both ranks one after the other
+        NpuProfiler.analyse(self.work_path, max_workers=1)
+        for rank_name, step_ids in self.rank_step_dict.items():
+            summary_path = os.path.join(self.work_path, rank_name, "ASCEND_PROFILER_OUTPUT", "flops_summary.json")
+            with open(summary_path) as file:
+                summary = json.load(file)
+            self.assertEqual(step_ids, [step["step"] for step in summary["steps"]])
+
+    def test_export_type_of_each_rank(self):
+        info = {"config": {"experimental_config": {"_export_type": "columnar"}}}
+        with open(os.path.join(self.work_path, "rank0_ascend_pt", "profiler_info.json"), "w") as file:
+            json.dump(info, file)
+        NpuProfiler.analyse(self.work_path, max_workers=1)
+        for rank_name, has_columnar_file in (("rank0_ascend_pt", True), ("rank1_ascend_pt", False)):
+            output_path = os.path.join(self.work_path, rank_name, "ASCEND_PROFILER_OUTPUT")
+            self.assertTrue(os.path.isfile(os.path.join(output_path, "flops_statistic.csv")))
+            columnar_file_list = [file_name for file_name in os.listdir(output_path)
+                                  if file_name.startswith("flops_statistic.") and not file_name.endswith(".csv")]
+            self.assertEqual(has_columnar_file, bool(columnar_file_list))
+        # the columnar copy holds the csv columns with their inferred types
+        output_path = os.path.join(self.work_path, "rank0_ascend_pt", "ASCEND_PROFILER_OUTPUT")
+        with open(os.path.join(output_path, "flops_statistic.csv"), newline="") as file:
+            csv_rows = list(csv.reader(file))
+        columns = read_columnar_file(os.path.join(output_path, ColumnarFile.get_file_name("flops_statistic.csv")))
+        self.assertEqual(csv_rows[0], list(columns))
+        self.assertEqual(["aten::mm"], [str(value) for value in columns["Name"]])
+        self.assertEqual("f", columns["GFLOPs"].dtype.kind)
+        for name, csv_column in zip(csv_rows[0], zip(*csv_rows[1:])):
+            self.assertEqual(len(csv_column), len(columns[name]))
+            if columns[name].dtype.kind in "if":
+                np.testing.assert_array_equal(np.array([float(value) if value else np.nan for value in csv_column]),
+                                              columns[name].astype(np.float64))
+
+    def test_init_drops_the_last_profiling_data(self):
+        GlobalVar.init(os.path.join(self.work_path, "rank0_ascend_pt"))
+        self.assertEqual(["1", "2", "3"], [step[0] for step in GlobalVar.step_range])
+        empty_path = os.path.join(self.work_path, "empty_ascend_pt")
+        create_profiler_data(empty_path)
+        GlobalVar.init(empty_path)
+        self.assertEqual([], GlobalVar.step_range)
+        self.assertEqual(0, len(GlobalVar.torch_op_tree_node))
+
+
+if __name__ == "__main__":
+    run_tests()
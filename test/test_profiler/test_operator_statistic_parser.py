@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.analysis.prof_common_func.cache_manager import CacheManager
+from torch_npu.profiler.analysis.prof_parse.cann_file_parser import CANNFileParser
+from torch_npu.profiler.analysis.prof_view.operator_statistic_parser import OperatorStatisticParser
+
+from profiler_data_builder import create_profiler_data, pack_torch_op
+
+# the flow joins the acl api at 2 us, inside the first aten::add, to the kernel at 10 us
+TIMELINE = [
+    {"ph": "s", "cat": "HostToDevice", "id": "1", "pid": 3, "tid": 3, "ts": 2.0, "name": "HostToDevice"},
+    {"ph": "f", "cat": "HostToDevice", "id": "1", "pid": 7, "tid": 1, "ts": 10.0, "name": "HostToDevice"},
+    {"ph": "X", "name": "Add", "pid": 7, "tid": 1, "ts": 10.0, "dur": 3.0, "args": {"Task Type": "AI_CORE"}}
+]
+
+
+class TestOperatorStatisticParser(TestCase):
+    def setUp(self):
+        self.work_path = tempfile.mkdtemp()
+        self.profiler_path = os.path.join(self.work_path, "worker_ascend_pt")
+        torch_ops = [pack_torch_op(0, 100000, name="ProfilerStep#1"),
+                     pack_torch_op(1000, 5000, name="aten::add", input_shapes="[2, 3]",
+                                   call_stack="model.py(3): forward;train.py(9): main"),
+                     pack_torch_op(6000, 8000, name="aten::add", input_shapes="[4]",
+                                   call_stack="model.py(5): forward;train.py(9): main"),
+                     pack_torch_op(9000, 10000, name="aten::add", input_shapes="[2, 3]",
+                                   call_stack="model.py(3): forward;train.py(10): main"),
+                     pack_torch_op(20000, 30000, name="aten::mm"),
+                     pack_torch_op(21000, 22000, name="aten::add", input_shapes="[4]")]
+        create_profiler_data(self.profiler_path, torch_ops, timeline=TIMELINE)
+        # mark the timeline as exported, there is no msprof here
+        cache_manager = CacheManager(self.profiler_path)
+        cache_manager.save(CANNFileParser.CANN_EXPORT, cache_manager.get_key(CANNFileParser.CANN_EXPORT, [], False),
+                           {}, True)
+        CANNFileParser.clear_cache()
+
+    def tearDown(self):
+        CANNFileParser.clear_cache()
+        shutil.rmtree(self.work_path)
+
+    def test_group_stats_match_numpy(self):
+        values = np.random.default_rng(0).exponential(10.0, 1000)
+        group = np.random.default_rng(1).integers(0, 7, 1000)
+        count = np.bincount(group, minlength=7)
+        stats = OperatorStatisticParser._get_group_stats(values, group, count)
+        for index in range(7):
+            group_values = values[group == index]
+            expected = [np.sum(group_values), np.mean(group_values), np.min(group_values), np.max(group_values)] + \
+                       [np.quantile(group_values, quantile) for quantile in OperatorStatisticParser.QUANTILES]
+            np.testing.assert_allclose(expected, stats[:, index])
+
+    def test_profiler_statistic(self):
+        statistic = OperatorStatisticParser.get_profiler_statistic(self.profiler_path)
+        self.assertEqual(["aten::add", "aten::mm"], [row["Name"] for row in statistic])
+        add_row = statistic[0]
+        self.assertEqual(4, add_row["Count"])
+        self.assertEqual(8.0, add_row["Total Host Self Duration(us)"])
+        self.assertEqual(1.5, add_row["P50 Host Self Duration(us)"])
+        self.assertEqual(3.0, add_row["Total Device Self Duration(us)"])
+        # the host self time of aten::mm excludes its aten::add child
+        self.assertEqual(9.0, statistic[1]["Total Host Self Duration(us)"])
+        self.assertEqual(10.0, statistic[1]["Total Host Total Duration(us)"])
+        # the training process keeps no flow join
+        self.assertEqual({}, CANNFileParser._acl_to_npu_cache)
+
+    def test_profiler_statistic_group_by(self):
+        statistic = OperatorStatisticParser.get_profiler_statistic(self.profiler_path, group_by_input_shape=True)
+        self.assertEqual({("aten::add", "[2, 3]"): 2, ("aten::add", "[4]"): 2, ("aten::mm", ""): 1},
+                         {(row["Name"], row["Input Shapes"]): row["Count"] for row in statistic})
+        statistic = OperatorStatisticParser.get_profiler_statistic(self.profiler_path, group_by_stack_n=1)
+        self.assertEqual({("aten::add", "model.py(3): forward"): 2, ("aten::add", "model.py(5): forward"): 1,
+                          ("aten::add", ""): 1, ("aten::mm", ""): 1},
+                         {(row["Name"], row["Call Stack"]): row["Count"] for row in statistic})
+
+
+if __name__ == "__main__":
+    run_tests()
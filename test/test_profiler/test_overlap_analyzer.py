@@ -0,0 +1,39 @@
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.analysis.prof_common_func.overlap_analyzer import OverlapAnalyzer
+
+
+def process_name_event(pid: int, name: str) -> dict:
+    return {"ph": "M", "name": "process_name", "pid": pid, "args": {"name": name}}
+
+
+def task_event(pid: int, tid: int, ts: float, dur: float, name: str = "Add") -> dict:
+    return {"ph": "X", "name": name, "pid": pid, "tid": tid, "ts": ts, "dur": dur}
+
+
+class TestOverlapAnalyzer(TestCase):
+    def test_step_overlap(self):
+        analyzer = OverlapAnalyzer()
+        # the events of a pid may come before its process name
+        for data in (task_event(7, 1, 0, 40), task_event(7, 1, 50, 20), task_event(8, 2, 30, 30, "hcom_allReduce"),
+                     task_event(9, 3, 0, 100, "aten::add"), process_name_event(7, "Ascend Hardware"),
+                     process_name_event(8, "HCCL"), process_name_event(9, "Python")):
+            analyzer.add_event(data)
+        self.assertTrue(analyzer.has_data())
+        rows = analyzer.get_step_overlap([["1", 0.0, 100.0]])
+        # compute 0-40 and 50-70, communication 30-60 overlapped with compute at 30-40 and 50-60
+        self.assertEqual(["1", "", OverlapAnalyzer.TOTAL, "", 60.0, 30.0, 20.0, 10.0, 30.0], rows[0])
+        self.assertEqual([(7, 1), (8, 2)], [(row[1], row[3]) for row in rows[1:]])
+        self.assertEqual([60.0, 0.0, 20.0, 0.0, 40.0], rows[1][4:])
+
+    def test_events_of_other_processes_are_dropped(self):
+        analyzer = OverlapAnalyzer()
+        analyzer.add_event(task_event(9, 3, 0, 100))
+        analyzer.add_event(process_name_event(9, "Python"))
+        analyzer.add_event(task_event(9, 3, 100, 100))
+        self.assertEqual({}, analyzer._interval_dict)
+        self.assertFalse(analyzer.has_data())
+        self.assertEqual([], analyzer.get_step_overlap([["1", 0.0, 100.0]]))
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,103 @@
+import csv
+import json
+import os
+import shutil
+import tempfile
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.analysis.prof_common_func.cache_manager import CacheManager
+from torch_npu.profiler.analysis.prof_common_func.csv_headers import CsvHeaders
+from torch_npu.profiler.analysis.prof_parse.cann_file_parser import CANNFileParser
+from torch_npu.profiler.analysis.profile_diff import ProfileDiff
+
+from profiler_data_builder import create_profiler_data, pack_memory_record, pack_torch_op
+
+MB = 1024 * 1024
+
+
+def create_diff_data(profiler_path: str, torch_ops: list, memory_records: list, kernel_list: list) -> None:
+    create_profiler_data(profiler_path, torch_ops, memory_records, timeline=[])
+    summary_path = os.path.join(profiler_path, "PROF_000001_20230101000000_abc", "device_0", "summary")
+    os.makedirs(summary_path)
+    with open(os.path.join(summary_path, "op_summary_0_1.csv"), "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow([CsvHeaders.OP_NAME, CsvHeaders.OP_TYPE, CsvHeaders.TASK_START_TIME, CsvHeaders.TASK_DURATION])
+        writer.writerows(kernel_list)
+    # mark the timeline as exported, there is no msprof here
+    cache_manager = CacheManager(profiler_path)
+    cache_manager.save(CANNFileParser.CANN_EXPORT, cache_manager.get_key(CANNFileParser.CANN_EXPORT, [], False),
+                       {}, True)
+
+
+class TestProfileDiff(TestCase):
+    def setUp(self):
+        self.work_path = tempfile.mkdtemp()
+        self.base_path = os.path.join(self.work_path, "base_ascend_pt")
+        self.compare_path = os.path.join(self.work_path, "compare_ascend_pt")
+        self.output_path = os.path.join(self.work_path, "diff")
+        create_diff_data(self.base_path,
+                         [pack_torch_op(0, 1000000, name="ProfilerStep#1"),
+                          pack_torch_op(10000, 20000, name="aten::add", input_shapes="[2, 3]"),
+                          pack_torch_op(30000, 80000, name="aten::mm", input_shapes="[4, 8]"),
+                          pack_torch_op(100000, 110000, name="aten::relu")],
+                         [pack_memory_record(1, 10000, 2 * MB, 2 * MB, 4 * MB),
+                          pack_memory_record(1, 20000, -2 * MB, 0, 4 * MB)],
+                         [["Add", "Add", 11.0, 2.0], ["MatMul", "MatMul", 31.0, 40.0], ["Relu", "Relu", 101.0, 5.0]])
+        create_diff_data(self.compare_path,
+                         [pack_torch_op(0, 1000000, name="ProfilerStep#1"),
+                          pack_torch_op(10000, 20000, name="aten::add", input_shapes="[2, 3]"),
+                          pack_torch_op(30000, 130000, name="aten::mm", input_shapes="[4, 8]"),
+                          pack_torch_op(150000, 160000, name="aten::sub")],
+                         [pack_memory_record(1, 10000, 3 * MB, 3 * MB, 4 * MB)],
+                         [["Add", "Add", 11.0, 2.0], ["MatMul", "MatMul", 31.0, 90.0], ["Sub", "Sub", 151.0, 3.0]])
+        CANNFileParser.clear_cache()
+
+    def tearDown(self):
+        CANNFileParser.clear_cache()
+        shutil.rmtree(self.work_path)
+
+    def read_output(self) -> tuple:
+        with open(os.path.join(self.output_path, ProfileDiff.OP_DIFF), newline="") as file:
+            op_rows = list(csv.DictReader(file))
+        with open(os.path.join(self.output_path, ProfileDiff.DIFF_SUMMARY)) as file:
+            summary = json.load(file)
+        return op_rows, summary
+
+    def test_compare_two_profiles(self):
+        ProfileDiff.compare(self.base_path, self.compare_path, self.output_path)
+        op_rows, summary = self.read_output()
+        self.assertEqual([("aten::mm", "matched", "50.0"), ("aten::sub", "new", "10.0"),
+                          ("aten::add", "matched", "0.0"), ("aten::relu", "vanished", "-10.0")],
+                         [(row["Name"], row["Status"], row["Host Total Delta(us)"]) for row in op_rows])
+        self.assertEqual(["[4, 8]", "1", "1"], [op_rows[0]["Input Shapes"], op_rows[0]["Base Count"],
+                                                op_rows[0]["Compare Count"]])
+        self.assertEqual({"base": 70.0, "compare": 120.0, "delta": 50.0}, summary["total"]["host_duration(us)"])
+        self.assertEqual({"base": 47.0, "compare": 95.0, "delta": 48.0}, summary["total"]["kernel_duration(us)"])
+        self.assertEqual(["aten::mm", "aten::sub"], [op["name"] for op in summary["top_op_regressions"]])
+        self.assertEqual(["MatMul", "Sub"], [kernel["name"] for kernel in summary["top_kernel_regressions"]])
+        self.assertEqual(["Sub"], summary["new_kernels"])
+        self.assertEqual(["Relu"], summary["vanished_kernels"])
+        self.assertEqual([{"device": "NPU:0", "base_peak_allocated(MB)": 2.0, "compare_peak_allocated(MB)": 3.0,
+                           "peak_allocated_delta(MB)": 1.0, "base_peak_reserved(MB)": 4.0,
+                           "compare_peak_reserved(MB)": 4.0, "peak_reserved_delta(MB)": 0.0}],
+                         summary["memory_peak"])
+
+    def test_compare_steps_of_one_profile(self):
+        with self.assertRaises(RuntimeError):
+            ProfileDiff.compare(self.base_path, output_path=self.output_path)
+        with self.assertRaises(RuntimeError):
+            ProfileDiff.compare(self.base_path, output_path=self.output_path, base_step=1, compare_step=3)
+
+    def test_invalid_output_path(self):
+        file_path = os.path.join(self.work_path, "output.csv")
+        open(file_path, "w").close()
+        link_path = os.path.join(self.work_path, "output_link")
+        os.symlink(self.work_path, link_path)
+        for output_path in (file_path, link_path):
+            with self.assertRaises(RuntimeError):
+                ProfileDiff.compare(self.base_path, self.compare_path, output_path)
+        self.assertFalse(os.path.exists(self.output_path))
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,63 @@
+import random
+
+import numpy as np
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.analysis.prof_common_func.step_index import StepIndex
+
+INVALID = StepIndex.INVALID_INDEX
+
+
+def find_step_by_scan(step_range: list, ts: float, closed: bool) -> int:
+    for index, (_, start, end) in enumerate(step_range):
+        if (start <= ts <= end) if closed else (start < ts < end):
+            return index
+    return INVALID
+
+
+class TestStepIndex(TestCase):
+    def test_closed_and_open_ends(self):
+        step_index = StepIndex([["1", 0.0, 10.0], ["2", 10.0, 20.0], ["3", 30.0, 40.0]])
+        ts_list = [-1.0, 0.0, 5.0, 10.0, 15.0, 20.0, 25.0, 30.0, 40.0, 41.0]
+        self.assertEqual([INVALID, 0, 0, 0, 1, 1, INVALID, 2, 2, INVALID],
+                         step_index.find_step_index(ts_list).tolist())
+        self.assertEqual([INVALID, INVALID, 0, INVALID, 1, INVALID, INVALID, INVALID, INVALID, INVALID],
+                         step_index.find_step_index(ts_list, closed=False).tolist())
+        self.assertEqual(["1", "2", None], step_index.find_step_id([10.0, 10.5, 25.0]))
+        self.assertEqual([None], step_index.find_step_id(10.0, closed=False))
+
+    def test_overlapping_ranges(self):
+        # step 2 is nested in step 1 and step 3 overlaps the end of step 1
+        step_index = StepIndex([["1", 0.0, 50.0], ["2", 10.0, 20.0], ["3", 40.0, 70.0], ["4", 60.0, 65.0]])
+        self.assertEqual([0, 0, 0, 2, 2, 2, INVALID],
+                         step_index.find_step_index([5.0, 15.0, 45.0, 55.0, 62.0, 70.0, 71.0]).tolist())
+        self.assertEqual([INVALID, 0, 2], step_index.find_step_index([0.0, 40.0, 50.0], closed=False).tolist())
+
+    def test_unsorted_step_range(self):
+        step_index = StepIndex([["2", 10.0, 20.0], ["1", 0.0, 15.0]])
+        self.assertEqual([1, 1, 0, INVALID], step_index.find_step_index([5.0, 12.0, 18.0, 21.0]).tolist())
+        self.assertEqual(["2", "1"], step_index.step_ids)
+
+    def test_empty_step_range(self):
+        step_index = StepIndex([])
+        self.assertEqual(0, len(step_index))
+        self.assertEqual([INVALID, INVALID], step_index.find_step_index([0.0, 1.0]).tolist())
+        self.assertEqual([], step_index.find_step_id(np.empty(0)))
+
+    def test_matches_linear_scan(self):
+        random.seed(11)
+        for _ in range(20):
+            step_range = []
+            for step_id in range(random.randint(1, 8)):
+                start = float(random.randint(0, 100))
+                step_range.append([str(step_id), start, start + random.randint(0, 40)])
+            step_range.sort(key=lambda step: step[1])
+            step_index = StepIndex(step_range)
+            ts_list = [float(random.randint(-5, 150)) for _ in range(200)]
+            for closed in (True, False):
+                self.assertEqual([find_step_by_scan(step_range, ts, closed) for ts in ts_list],
+                                 step_index.find_step_index(ts_list, closed).tolist())
+
+
+if __name__ == "__main__":
+    run_tests()
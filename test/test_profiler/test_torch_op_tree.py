@@ -0,0 +1,153 @@
+import random
+import warnings
+from collections import deque
+
+import numpy as np
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.analysis.prof_bean.event_bean import EventBean
+from torch_npu.profiler.analysis.prof_bean.node_info_bean import NodeInfoBean
+from torch_npu.profiler.analysis.prof_bean.torch_op_bean import TorchOpBean
+from torch_npu.profiler.analysis.prof_common_func.column_decoder import ColumnDecoder
+from torch_npu.profiler.analysis.prof_common_func.tlv_decoder import TLVDecoder
+from torch_npu.profiler.analysis.prof_common_func.torch_op_tree import TorchOpTree
+from torch_npu.profiler.analysis.prof_common_func.tree_builder import TreeBuilder
+
+from profiler_data_builder import pack_torch_op
+
+TORCH_OP_STRUCT_SIZE = 57
+INVALID = TorchOpTree.INVALID_INDEX
+
+# (name, start us, end us): aten::add starts where aten::mm ends, ProfilerStep#2 where ProfilerStep#1 ends,
+# and aten::overflow outlives its parent aten::mul
+NESTED_OPS = [
+    ("ProfilerStep#1", 0, 100), ("aten::linear", 10, 50), ("aten::mm", 12, 30), ("aten::add", 30, 45),
+    ("aten::relu", 60, 70), ("ProfilerStep#2", 100, 200), ("aten::mul", 110, 150), ("aten::overflow", 140, 180)
+]
+
+
+def pack_ops(op_list: list) -> bytes:
+    return b"".join(pack_torch_op(start * 1000, end * 1000, name=name) for name, start, end in op_list)
+
+
+def build_tree(op_list: list) -> TorchOpTree:
+    torch_op_table = ColumnDecoder.decode(pack_ops(op_list), TorchOpBean, TORCH_OP_STRUCT_SIZE)
+    return TreeBuilder.build_tree(torch_op_table)
+
+
+def build_reference_tree(op_list: list) -> list:
+    """
+    the object tree of the previous TreeBuilder, flattened breadth-first into [event, parent, children]
+    """
+    event_list = TLVDecoder.decode(pack_ops(op_list), TorchOpBean, TORCH_OP_STRUCT_SIZE)
+    event_list.sort(key=lambda x: x.ts)
+    root_node = [None, None, []]
+    last_node = root_node
+    for event in event_list:
+        while last_node:
+            if last_node is root_node or event.ts < last_node[0].ts + last_node[0].dur:
+                tree_node = [event, last_node, []]
+                last_node[2].append(tree_node)
+                last_node = tree_node
+                break
+            last_node = last_node[1]
+    node_list, node_queue = [], deque(root_node[2])
+    while node_queue:
+        node_list.append(node_queue.popleft())
+        node_queue.extend(node_list[-1][2])
+    return node_list
+
+
+def create_node_info(kernel_list: list) -> NodeInfoBean:
+    return NodeInfoBean([EventBean({"ts": ts, "dur": dur, "args": {"Task Type": task_type}})
+                         for ts, dur, task_type in kernel_list])
+
+
+class TestTorchOpTree(TestCase):
+    def test_nested_ops(self):
+        tree = build_tree(NESTED_OPS)
+        self.assertEqual(["ProfilerStep#1", "ProfilerStep#2", "aten::linear", "aten::relu", "aten::mul", "aten::mm",
+                          "aten::add", "aten::overflow"], [node.name for node in tree])
+        self.assertEqual([INVALID, INVALID, 0, 0, 1, 2, 2, 4], tree.parent.tolist())
+        self.assertEqual([2, 4, 5, INVALID, 7, INVALID, INVALID, INVALID], tree.first_child.tolist())
+        self.assertEqual([1, INVALID, 3, INVALID, INVALID, 6, INVALID, INVALID], tree.next_sibling.tolist())
+        self.assertEqual([100, 100, 40, 10, 40, 18, 15, 40], tree.host_total_dur.tolist())
+        self.assertEqual([50, 60, 7, 10, 0, 18, 15, 40], tree.host_self_dur.tolist())
+        self.assertEqual(["ProfilerStep#1", "ProfilerStep#2"], [node.name for node in tree.get_top_level_nodes()])
+        self.assertEqual(["aten::mm", "aten::add"], [node.name for node in tree[2].child_node_list])
+        self.assertEqual("aten::mul", tree[7].parent_node.name)
+        self.assertIsNone(tree[1].parent_node)
+
+    def test_tree_matches_previous_builder(self):
+        random.seed(7)
+        op_list = []
+        for index in range(300):
+            start = random.randint(0, 2000)
+            op_list.append((f"op{index}", start, start + random.choice([0, 1, 5, 50, 400])))
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            tree = build_tree(op_list)
+            reference_list = build_reference_tree(op_list)
+        self.assertEqual([node[0].name for node in reference_list], [node.name for node in tree])
+        position_dict = {id(node): index for index, node in enumerate(reference_list)}
+        expected_parent, expected_first_child, expected_next_sibling = [], [], []
+        for node in reference_list:
+            expected_parent.append(position_dict.get(id(node[1]), INVALID))
+            expected_first_child.append(position_dict[id(node[2][0])] if node[2] else INVALID)
+            expected_next_sibling.append(INVALID)
+        for node in reference_list + [[None, None, [node for node in reference_list if node[1][0] is None]]]:
+            for child_node, sibling_node in zip(node[2], node[2][1:]):
+                expected_next_sibling[position_dict[id(child_node)]] = position_dict[id(sibling_node)]
+        self.assertEqual(expected_parent, tree.parent.tolist())
+        self.assertEqual(expected_first_child, tree.first_child.tolist())
+        self.assertEqual(expected_next_sibling, tree.next_sibling.tolist())
+        self.assertEqual([node[0].dur for node in reference_list], tree.host_total_dur.tolist())
+        expected_self_dur = [node[0].dur - sum(child_node[0].dur for child_node in node[2]) for node in reference_list]
+        np.testing.assert_allclose(expected_self_dur, tree.host_self_dur)
+
+    def test_init_links(self):
+        start = np.array([0.0, 50.0, 0.0, 10.0, 20.0, 60.0])
+        dur = np.array([40.0, 30.0, 5.0, 5.0, 5.0, 5.0])
+        tree = TorchOpTree(None, start, dur, np.array([INVALID, INVALID, 0, 0, 0, 1]))
+        self.assertEqual([2, 5, INVALID, INVALID, INVALID, INVALID], tree.first_child.tolist())
+        self.assertEqual([1, INVALID, 3, 4, INVALID, INVALID], tree.next_sibling.tolist())
+        self.assertEqual([25.0, 25.0, 5.0, 5.0, 5.0, 5.0], tree.host_self_dur.tolist())
+        self.assertEqual([2, 3, 4], list(tree.get_child_index_list(0)))
+        self.assertEqual([], list(tree.get_child_index_list(2)))
+        self.assertEqual([0, 1], [node.index for node in tree.get_top_level_nodes()])
+        single_tree = TorchOpTree(None, np.array([1.0]), np.array([2.0]), np.array([INVALID]))
+        self.assertEqual([INVALID], single_tree.first_child.tolist())
+        self.assertEqual([INVALID], single_tree.next_sibling.tolist())
+        empty_tree = TorchOpTree()
+        self.assertEqual(0, len(empty_tree))
+        self.assertEqual([], empty_tree.get_top_level_nodes())
+
+    def test_update_device_info(self):
+        tree = build_tree(NESTED_OPS)
+        node_info_list = [create_node_info([(20, 2, "AI_CORE"), (25, 1, "AI_CPU")]),
+                          create_node_info([(5, 4, "AI_CORE")]),
+                          create_node_info([(300, 3, "AI_CPU")])]
+        tree.update_device_info(node_info_list, [0, 2, 5, 0, 2, 5, 1], [0, 0, 0, 1, 1, 1, 2], [5, 5, 1], [0, 1, 2])
+        self.assertEqual([0, 3, 0, 0, 0, 7, 0, 0], tree.device_dur[TorchOpTree.DEVICE_SELF].tolist())
+        self.assertEqual([0, 0, 0, 0, 0, 6, 0, 0], tree.device_dur[TorchOpTree.DEVICE_SELF_WITH_AI_CORE].tolist())
+        self.assertEqual([7, 3, 7, 0, 0, 7, 0, 0], tree.device_dur[TorchOpTree.DEVICE_TOTAL].tolist())
+        self.assertEqual([6, 0, 6, 0, 0, 6, 0, 0], tree.device_dur[TorchOpTree.DEVICE_TOTAL_WITH_AI_CORE].tolist())
+        self.assertEqual([5, 300, 5, np.inf], tree.device_start[[0, 1, 2, 3]].tolist())
+        self.assertEqual([26, 303, 26, -np.inf], tree.device_end[[0, 1, 2, 3]].tolist())
+        self.assertEqual([5], [kernel.ts for kernel in tree.get_kernel_list(5)])
+        self.assertEqual([], tree.get_kernel_list(3))
+
+    def test_find_call_nodes(self):
+        tree = build_tree(NESTED_OPS)
+        enqueue_ts_list = [20, 145, 160, 250]
+        node_info_list = [create_node_info([(ts + 1, 1, "AI_CORE")]) for ts in enqueue_ts_list]
+        TreeBuilder.find_call_nodes(enqueue_ts_list, node_info_list, tree)
+        # 160 is inside aten::overflow but past the end of its parent aten::mul, so it stops at ProfilerStep#2
+        self.assertEqual([0, 1, 0, 0, 0, 1, 0, 1], tree.device_dur[TorchOpTree.DEVICE_SELF].tolist())
+        self.assertEqual([1, 2, 1, 0, 1, 1, 0, 1], tree.device_dur[TorchOpTree.DEVICE_TOTAL].tolist())
+        self.assertEqual([146, 162], [tree.device_start[1], tree.device_end[1]])
+        self.assertEqual([161], [kernel.ts for kernel in tree.get_kernel_list(1)])
+
+
+if __name__ == "__main__":
+    run_tests()
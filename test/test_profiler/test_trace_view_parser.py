@@ -0,0 +1,60 @@
+import json
+import os
+import shutil
+import tempfile
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.analysis.prof_common_func.global_var import GlobalVar
+from torch_npu.profiler.analysis.prof_parse.cann_file_parser import CANNFileParser
+from torch_npu.profiler.analysis.prof_view.trace_view_parser import TraceViewParser
+
+from profiler_data_builder import create_profiler_data, pack_torch_op
+
+STEP_NS = 1000000
+
+
+class TestTraceViewParser(TestCase):
+    def setUp(self):
+        self.work_path = tempfile.mkdtemp()
+        self.profiler_path = os.path.join(self.work_path, "worker_ascend_pt")
+        self.output_path = os.path.join(self.work_path, "output")
+        os.makedirs(self.output_path)
+        torch_ops, timeline = [], [{"ph": "M", "name": "process_name", "pid": 7, "args": {"name": "NPU"}}]
+        for step_id in range(1, 4):
+            start = (step_id - 1) * STEP_NS
+            torch_ops.append(pack_torch_op(start, start + STEP_NS - 1000, name=f"ProfilerStep#{step_id}"))
+            torch_ops.append(pack_torch_op(start + 1000, start + 2000, name="aten::add"))
+            timeline.append({"ph": "X", "name": "Add", "pid": 7, "tid": 1, "ts": str((start + 3000) / 1000),
+                             "dur": 1.0})
+        create_profiler_data(self.profiler_path, torch_ops, timeline=timeline)
+        CANNFileParser.clear_cache()
+        GlobalVar.init(self.profiler_path)
+
+    def tearDown(self):
+        GlobalVar.reset()
+        CANNFileParser.clear_cache()
+        shutil.rmtree(self.work_path)
+
+    def test_shard_trace_by_step(self):
+        TraceViewParser(self.profiler_path).generate_view(self.output_path, shard_trace=True)
+        self.assertFalse(os.path.exists(os.path.join(self.output_path, "trace_view.json")))
+        with open(os.path.join(self.output_path, "trace_view_index.json")) as file:
+            index = json.load(file)
+        self.assertEqual("step", index["shard_by"])
+        self.assertEqual(["1", "2", "3"], [shard["step"] for shard in index["shards"]])
+        for shard in index["shards"]:
+            with open(os.path.join(self.output_path, shard["file"])) as file:
+                shard_data = json.load(file)
+            self.assertEqual(shard["event_count"], len(shard_data))
+            self.assertEqual({"ProfilerStep#" + shard["step"], "aten::add", "Add"},
+                             {data["name"] for data in shard_data if data["ph"] == "X"})
+            self.assertIn("process_name", [data["name"] for data in shard_data if data["ph"] == "M"])
+
+    def test_shard_trace_with_mismatched_step_range(self):
+        GlobalVar.step_range.append(["9", 0.0, 1.0])
+        with self.assertRaises(RuntimeError):
+            TraceViewParser(self.profiler_path).generate_view(self.output_path, shard_trace=True)
+
+
+if __name__ == "__main__":
+    run_tests()
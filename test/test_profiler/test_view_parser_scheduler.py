@@ -0,0 +1,103 @@
+import os
+import shutil
+import tempfile
+import time
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler.analysis.prof_common_func.constant import Constant
+from torch_npu.profiler.analysis.prof_config.view_parser_config import ViewParserConfig
+from torch_npu.profiler.analysis.prof_view.base_view_parser import BaseViewParser
+from torch_npu.profiler.analysis.prof_view.memory_peak_view_parser import MemoryPeakViewParser
+from torch_npu.profiler.analysis.prof_view.view_parser_scheduler import ViewParserScheduler
+
+
+class RecordViewParser(BaseViewParser):
+    """
+    appends its name, start and end time to a record file of the output path
+    """
+    FAIL = False
+
+    def generate_view(self, output_path: str, **kwargs) -> None:
+        start = time.time()
+        time.sleep(0.05)
+        if self.FAIL:
+            raise RuntimeError("failed")
+        with open(os.path.join(output_path, "record.txt"), "a") as file:
+            file.write(f"{type(self).__name__} {start} {time.time()}\n")
+
+
+class ProducerViewParser(RecordViewParser):
+    pass
+
+
+class FailedViewParser(RecordViewParser):
+    FAIL = True
+
+
+class ConsumerViewParser(RecordViewParser):
+    DEPENDENCIES = [ProducerViewParser]
+
+
+class SecondConsumerViewParser(RecordViewParser):
+    DEPENDENCIES = [ProducerViewParser]
+
+
+class FailedConsumerViewParser(RecordViewParser):
+    DEPENDENCIES = [FailedViewParser]
+
+
+class CycleViewParser(RecordViewParser):
+    pass
+
+
+CycleViewParser.DEPENDENCIES = [CycleViewParser]
+
+
+class TestViewParserScheduler(TestCase):
+    def setUp(self):
+        self.output_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_path)
+
+    def test_dependents_start_after_their_dependency(self):
+        parser_list = [ConsumerViewParser, SecondConsumerViewParser, ProducerViewParser]
+        for max_workers in (1, 3):
+            ViewParserScheduler.run(parser_list, "", self.output_path, {}, max_workers)
+            record_dict = self._read_record()
+            self.assertEqual({parser.__name__ for parser in parser_list}, set(record_dict))
+            producer_end = record_dict["ProducerViewParser"][1]
+            self.assertLessEqual(producer_end, record_dict["ConsumerViewParser"][0])
+            self.assertLessEqual(producer_end, record_dict["SecondConsumerViewParser"][0])
+
+    def test_dependents_of_a_failed_parser_are_skipped(self):
+        parser_list = [FailedConsumerViewParser, FailedViewParser, ProducerViewParser]
+        for max_workers in (1, 3):
+            with self.assertRaises(RuntimeError) as context:
+                ViewParserScheduler.run(parser_list, "", self.output_path, {}, max_workers)
+            self.assertIn("FailedConsumerViewParser(dependency failed)", str(context.exception))
+            self.assertEqual(["ProducerViewParser"], list(self._read_record()))
+
+    def test_circular_dependency(self):
+        with self.assertRaises(RuntimeError):
+            ViewParserScheduler.run([CycleViewParser], "", self.output_path, {}, 1)
+
+    def test_memory_block_table_is_built_by_the_memory_peak_view_first(self):
+        parser_list = ViewParserConfig.CONFIG_DICT[Constant.TENSORBOARD_TRACE_HANDLER]
+        dependency_dict = ViewParserScheduler._get_dependency_dict(parser_list)
+        dependent_list = [parser.__name__ for parser, dependencies in dependency_dict.items()
+                          if MemoryPeakViewParser in dependencies]
+        self.assertEqual(["ModuleViewParser", "MemoryLeakViewParser"], dependent_list)
+
+    def _read_record(self) -> dict:
+        record_file = os.path.join(self.output_path, "record.txt")
+        if not os.path.isfile(record_file):
+            return {}
+        with open(record_file) as file:
+            record_list = [line.split() for line in file]
+        os.remove(record_file)
+        return {name: (float(start), float(end)) for name, start, end in record_list}
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -3,9 +3,12 @@ from .msprofiler_c_interface import ProfilerActivity
 from .msprofiler_c_interface import supported_ms_activities as supported_activities
 from .profiler import tensorboard_trace_handler
 from .scheduler import Schedule as schedule
+from .scheduler import AdaptiveSchedule as adaptive_schedule
 from .scheduler import ProfilerAction
 from .experimental_config import _ExperimentalConfig, supported_profiler_level, supported_ai_core_metrics, \
-    ProfilerLevel, AiCMetrics
+    ProfilerLevel, AiCMetrics, ExportType
 
-__all__ = [profile, ProfilerActivity, supported_activities, tensorboard_trace_handler, schedule, ProfilerAction,
-           _ExperimentalConfig, supported_profiler_level, supported_ai_core_metrics, ProfilerLevel, AiCMetrics]
+__all__ = [profile, ProfilerActivity, supported_activities, tensorboard_trace_handler, schedule, adaptive_schedule,
+           ProfilerAction,
+           _ExperimentalConfig, supported_profiler_level, supported_ai_core_metrics, ProfilerLevel, AiCMetrics,
+           ExportType]
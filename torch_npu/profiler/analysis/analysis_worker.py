@@ -0,0 +1,163 @@
+import atexit
+import json
+import multiprocessing
+import os
+import queue
+import threading
+from datetime import datetime
+
+from .npu_profiler import NpuProfiler
+from .prof_common_func.constant import Constant, print_warn_msg
+from .prof_common_func.file_manager import FileManager
+
+
+class AnalysisWorker:
+    """
+    long-lived background process which analyses the finished profiling directories one after another,
+    so that on_trace_ready returns at once. the progress of every directory is kept in its status file
+    """
+    STATUS_FILE = "analysis_status.json"
+    QUEUED = "queued"
+    RUNNING = "running"
+    FINISHED = "finished"
+    FAILED = "failed"
+    DROPPED = "dropped"
+
+    def __init__(self, max_queue_size: int = Constant.ANALYSIS_QUEUE_SIZE, drop_when_full: bool = False):
+        self._max_queue_size = max_queue_size
+        self._drop_when_full = drop_when_full
+        self._task_queue = None
+        self._process = None
+        # the queued tasks which are not finished yet, they are queued again when the worker is restarted
+        self._task_list = []
+        atexit.register(self.close)
+
+    def __str__(self) -> str:
+        return f"AnalysisWorker(max_queue_size={self._max_queue_size}, drop_when_full={self._drop_when_full})"
+
+    @classmethod
+    def update_status(cls, profiler_path: str, status: str, error: str = "") -> None:
+        """
+        a failed write of the status file is only reported, it must not stop the training or the worker
+        """
+        if not os.path.isdir(profiler_path):
+            print_warn_msg(f"Failed to update the analysis status of {profiler_path} to {status}, "
+                           f"the directory does not exist.")
+            return
+        status_file = os.path.join(profiler_path, cls.STATUS_FILE)
+        tmp_file = status_file + ".tmp"
+        try:
+            FileManager.create_json_file_by_path(tmp_file, {"path": profiler_path, "status": status, "error": error,
+                                                            "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")})
+            os.replace(tmp_file, status_file)
+        except Exception as err:
+            print_warn_msg(f"Failed to update the analysis status of {profiler_path} to {status}: {err}")
+
+    @classmethod
+    def get_status(cls, profiler_path: str) -> str:
+        try:
+            status_data = json.loads(FileManager.file_read_all(os.path.join(profiler_path, cls.STATUS_FILE), "rt"))
+        except Exception:
+            return ""
+        return status_data.get("status", "") if isinstance(status_data, dict) else ""
+
+    def submit(self, profiler_path: str, kwargs: dict) -> bool:
+        """
+        queue a profiling directory, block while the queue is full or drop it when drop_when_full is set
+        """
+        self._start()
+        self._task_list = [task for task in self._task_list if self.get_status(task[0]) in (self.QUEUED, self.RUNNING)]
+        self.update_status(profiler_path, self.QUEUED)
+        while True:
+            try:
+                self._task_queue.put((profiler_path, kwargs), block=not self._drop_when_full,
+                                     timeout=Constant.ANALYSIS_WAIT_INTERVAL)
+                self._task_list.append((profiler_path, kwargs))
+                return True
+            except queue.Full:
+                if self._drop_when_full:
+                    break
+                # a dead worker never frees the queue
+                self._start()
+        self.update_status(profiler_path, self.DROPPED, "The analysis queue is full.")
+        print_warn_msg(f"The analysis queue is full, skip the analysis of {profiler_path}, "
+                       f"which can be analysed offline.")
+        return False
+
+    def wait(self) -> None:
+        """
+        block until every queued profiling directory is analysed
+        """
+        if self._task_queue is None:
+            return
+        waiter = threading.Thread(target=self._task_queue.join, daemon=True)
+        waiter.start()
+        while waiter.is_alive():
+            waiter.join(Constant.ANALYSIS_WAIT_INTERVAL)
+            if waiter.is_alive() and not self._process.is_alive():
+                print_warn_msg("The analysis worker exited unexpectedly, stop waiting for the queued analysis.")
+                return
+
+    def close(self) -> None:
+        if self._process is None:
+            return
+        self.wait()
+        if self._process.is_alive():
+            self._task_queue.put(None)
+            self._process.join()
+        self._process = None
+        self._task_queue = None
+        self._task_list = []
+
+    def _start(self) -> None:
+        if self._process is not None and self._process.is_alive():
+            return
+        is_restart = self._process is not None
+        if is_restart:
+            print_warn_msg("The analysis worker exited unexpectedly, restart it.")
+        # a new queue, the dead worker may still hold the lock of the old one
+        self._task_queue = multiprocessing.JoinableQueue(maxsize=self._max_queue_size)
+        # not a daemon, so that the analysis can still start its own parser processes
+        self._process = multiprocessing.Process(target=_run_analysis_worker, args=(self._task_queue,))
+        self._process.start()
+        if is_restart:
+            self._requeue_tasks()
+
+    def _requeue_tasks(self) -> None:
+        """
+        the task the dead worker was running failed with it, the tasks still queued are put to the new queue
+        """
+        task_list, self._task_list = self._task_list, []
+        for profiler_path, kwargs in task_list:
+            status = self.get_status(profiler_path)
+            if status == self.RUNNING:
+                self.update_status(profiler_path, self.FAILED, "The analysis worker exited unexpectedly.")
+                continue
+            if status != self.QUEUED:
+                continue
+            try:
+                self._task_queue.put_nowait((profiler_path, kwargs))
+            except queue.Full:
+                self.update_status(profiler_path, self.DROPPED, "The analysis queue is full.")
+                print_warn_msg(f"The analysis queue is full, skip the analysis of {profiler_path}, "
+                               f"which can be analysed offline.")
+            else:
+                self._task_list.append((profiler_path, kwargs))
+
+
+def _run_analysis_worker(task_queue: any) -> None:
+    while True:
+        task = task_queue.get()
+        try:
+            if task is None:
+                return
+            profiler_path, kwargs = task
+            AnalysisWorker.update_status(profiler_path, AnalysisWorker.RUNNING)
+            try:
+                NpuProfiler.analyse(profiler_path, **kwargs)
+            except Exception as err:
+                AnalysisWorker.update_status(profiler_path, AnalysisWorker.FAILED, str(err))
+            else:
+                AnalysisWorker.update_status(profiler_path, AnalysisWorker.FINISHED)
+        finally:
+            task_queue.task_done()
@@ -0,0 +1,255 @@
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from json import JSONDecodeError
+
+import numpy as np
+
+from .npu_profiler import NpuProfiler
+from .prof_common_func.constant import Constant, print_info_msg, print_warn_msg
+from .prof_common_func.file_manager import FileManager
+from .prof_common_func.path_manager import ProfilerPathManager
+from .prof_view.communication_parser import CommunicationParser
+from ...utils.path_manager import PathManager
+
+
+class ClusterAnalysis:
+    """
+    communication stragglers and slow links of a cluster, from the communication.json and
+    communication_matrix.json results of every rank. a collective is aligned across the ranks by its step and
+    name, the delay of a rank is its start minus the earliest start of the collective, so the rank arriving
+    last makes the others wait. links are aggregated over the matrices of all ranks and compared to the
+    median bandwidth of their transport type
+    """
+    RANK_STATISTIC = "cluster_rank_statistic.csv"
+    COLLECTIVE_SKEW = "cluster_collective_skew.csv"
+    LINK_STATISTIC = "cluster_link_statistic.csv"
+    CLUSTER_SUMMARY = "cluster_summary.json"
+    RANK_HEADERS = ["Rank", "Collective Count", "Last Arrival Count", "Avg Arrival Delay(us)",
+                    "Max Arrival Delay(us)", "Wait Time(ms)", "Transit Time(ms)", "Synchronization Time(ms)",
+                    "Wait Time Ratio", "Straggler"]
+    SKEW_HEADERS = ["Step", "Name", "Rank Count", "Skew(us)", "Last Rank", "Min Elapse Time(ms)",
+                    "Max Elapse Time(ms)"]
+    LINK_HEADERS = ["Link", "Transport Type", "Op Count", "Transit Size(MB)", "Transit Time(ms)", "Bandwidth(GB/s)",
+                    "Bandwidth Ratio", "Slow Link"]
+    ELAPSE_TIME_MS = "Elapse Time(ms)"
+    RANK_INFO_PATTERN = r"^profiler_info_(\d+)\.json"
+    # a rank is a straggler when the robust z score of its average delay exceeds the threshold
+    STRAGGLER_Z_SCORE = 3.5
+    MAD_SCALE = 0.6745
+    # when most ranks have the same delay the deviation is zero, a straggler must then be this much later
+    MIN_STRAGGLER_DELAY_US = 100.0
+    # a link is slow below this ratio of the median bandwidth of its transport type
+    SLOW_LINK_RATIO = 0.5
+    TOP_NUM = 20
+
+    @classmethod
+    def analyse(cls, input_path: str, output_path: str = None, max_workers: int = None) -> None:
+        input_path = ProfilerPathManager.get_realpath(input_path)
+        PathManager.check_input_directory_path(input_path)
+        PathManager.check_path_owner_consistent(input_path)
+        profiler_path_list = sorted(ProfilerPathManager.get_profiler_path_list(input_path))
+        if not profiler_path_list:
+            raise RuntimeError(f"No profiling result is found in: {input_path}")
+        if output_path is None:
+            output_path = os.path.join(input_path, Constant.CLUSTER_OUTPUT_DIR)
+        output_path = ProfilerPathManager.get_realpath(output_path)
+        PathManager.check_input_directory_path(output_path)
+        max_workers = min(NpuProfiler._get_max_workers(max_workers), len(profiler_path_list))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            rank_data_list = list(executor.map(cls._load_rank_data, profiler_path_list))
+        rank_data_list = cls._assign_rank_ids(rank_data_list)
+        if not any(rank_data.get("ops") or rank_data.get("links") for rank_data in rank_data_list):
+            print_warn_msg(f"No communication data is found in: {input_path}, please analyse the ranks first.")
+            return
+
+        rank_rows, skew_rows = cls._get_rank_statistic(rank_data_list)
+        link_rows = cls._get_link_statistic(rank_data_list)
+        FileManager.create_csv_file(output_path, rank_rows, cls.RANK_STATISTIC, cls.RANK_HEADERS)
+        FileManager.create_csv_file(output_path, skew_rows, cls.COLLECTIVE_SKEW, cls.SKEW_HEADERS)
+        FileManager.create_csv_file(output_path, link_rows, cls.LINK_STATISTIC, cls.LINK_HEADERS)
+        summary = {
+            "rank_num": len(rank_data_list),
+            "stragglers": [dict(zip(cls.RANK_HEADERS, row)) for row in rank_rows if row[-1]],
+            "top_skew_collectives": [dict(zip(cls.SKEW_HEADERS, row)) for row in skew_rows[:cls.TOP_NUM]],
+            "slow_links": [dict(zip(cls.LINK_HEADERS, row)) for row in link_rows if row[-1]][:cls.TOP_NUM]
+        }
+        FileManager.create_json_file_by_path(os.path.join(output_path, cls.CLUSTER_SUMMARY), summary, indent=4)
+        print_info_msg(f"Cluster analysis results are saved in: {output_path}")
+
+    @classmethod
+    def _load_rank_data(cls, profiler_path: str) -> dict:
+        """
+        Returns: rank id, collective ops and links of a rank, flattened into rows so that little is sent back
+        from the worker processes
+        """
+        rank_id = None
+        info_file_path = ProfilerPathManager.get_info_file_path(profiler_path)
+        matched = re.match(cls.RANK_INFO_PATTERN, os.path.basename(info_file_path)) if info_file_path else None
+        if matched:
+            rank_id = int(matched.group(1))
+        output_path = os.path.join(profiler_path, Constant.OUTPUT_DIR)
+        op_rows = []
+        communication = cls._read_json(os.path.join(output_path, CommunicationParser.COMMUNICATION))
+        for step, step_data in communication.items():
+            for op_name, op_info in step_data.get(CommunicationParser.COLLECTIVE, {}).items():
+                time_info = op_info.get(CommunicationParser.COMMUNICATION_TIME_INFO, {})
+                if op_name.startswith(CommunicationParser.TOTAL) or \
+                        time_info.get(CommunicationParser.START_TIMESTAMP) is None:
+                    continue
+                op_rows.append((step, op_name, float(time_info.get(CommunicationParser.START_TIMESTAMP)),
+                                float(time_info.get(cls.ELAPSE_TIME_MS, 0)),
+                                float(time_info.get(CommunicationParser.WAIT_TIME_MS, 0)),
+                                float(time_info.get(CommunicationParser.TRANSIT_TIME_MS, 0)),
+                                float(time_info.get(CommunicationParser.SYNCHRONIZATION_TIME_MS, 0))))
+        link_rows = []
+        matrix = cls._read_json(os.path.join(output_path, CommunicationParser.COMMUNICATION_MATRIX))
+        for step, step_data in matrix.items():
+            for op_type in (CommunicationParser.P2P, CommunicationParser.COLLECTIVE):
+                for op_name, link_dict in step_data.get(op_type, {}).items():
+                    if op_name.startswith(CommunicationParser.TOTAL):
+                        continue
+                    link_rows.extend((step, op_name, link, link_info.get(CommunicationParser.TRANSPORT_TYPE, ""),
+                                      float(link_info.get(CommunicationParser.TRANSIT_SIZE_MB, 0)),
+                                      float(link_info.get(CommunicationParser.TRANSIT_TIME_MS, 0)))
+                                     for link, link_info in link_dict.items())
+        return {"rank": rank_id, "path": profiler_path, "ops": op_rows, "links": link_rows}
+
+    @classmethod
+    def _read_json(cls, file_path: str) -> dict:
+        if not os.path.isfile(file_path):
+            return {}
+        try:
+            data = json.loads(FileManager.file_read_all(file_path, "rt") or "{}")
+        except JSONDecodeError:
+            print_warn_msg(f"Invalid communication data, skip it: {file_path}")
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    @classmethod
+    def _assign_rank_ids(cls, rank_data_list: list) -> list:
+        """
+        the ranks without a rank id, or with a duplicated one, are numbered after the largest rank id
+        """
+        used_rank_set = set()
+        next_rank = max((rank_data.get("rank") for rank_data in rank_data_list
+                         if rank_data.get("rank") is not None), default=-1) + 1
+        for rank_data in rank_data_list:
+            rank_id = rank_data.get("rank")
+            if rank_id is None or rank_id in used_rank_set:
+                print_warn_msg(f"Failed to get a unique rank id of: {rank_data.get('path')}, set it to {next_rank}.")
+                rank_id = next_rank
+                next_rank += 1
+            rank_data["rank"] = rank_id
+            used_rank_set.add(rank_id)
+        return sorted(rank_data_list, key=lambda rank_data: rank_data.get("rank"))
+
+    @classmethod
+    def _get_rank_statistic(cls, rank_data_list: list) -> tuple:
+        """
+        Returns: statistic rows of every rank, and the skew rows of the collectives run by several ranks,
+        the most skewed first
+        """
+        collective_dict = {}
+        rank_index, collective_index, values = [], [], []
+        for index, rank_data in enumerate(rank_data_list):
+            for step, op_name, *op_values in rank_data.get("ops"):
+                rank_index.append(index)
+                collective_index.append(collective_dict.setdefault((step, op_name), len(collective_dict)))
+                values.append(op_values)
+        rank_num, collective_num = len(rank_data_list), len(collective_dict)
+        rank_index = np.array(rank_index, dtype=np.int64)
+        collective_index = np.array(collective_index, dtype=np.int64)
+        start, elapse, wait, transit, sync = np.array(values, dtype=np.float64).reshape(-1, 5).T
+
+        # one sort by collective then start, the last rank of a collective is the last row of its group
+        order = np.lexsort((rank_index, start, collective_index))
+        group_start = np.flatnonzero(np.diff(collective_index[order], prepend=-1) != 0)
+        group_end = np.append(group_start[1:], len(order)) - 1
+        collective_rank_num = np.bincount(collective_index, minlength=collective_num)
+        min_start = start[order][group_start]
+        max_start = start[order][group_end]
+        last_rank = rank_index[order][group_end]
+        delay = start - min_start[collective_index]
+        is_shared = collective_rank_num[collective_index] > 1
+
+        rank_count = np.bincount(rank_index, minlength=rank_num)
+        shared_count = np.bincount(rank_index[is_shared], minlength=rank_num)
+        last_count = np.bincount(last_rank[collective_rank_num > 1], minlength=rank_num)
+        delay_sum = np.bincount(rank_index[is_shared], weights=delay[is_shared], minlength=rank_num)
+        avg_delay = np.divide(delay_sum, shared_count, out=np.zeros(rank_num), where=shared_count > 0)
+        max_delay = np.zeros(rank_num)
+        np.maximum.at(max_delay, rank_index[is_shared], delay[is_shared])
+        wait_sum, transit_sum, sync_sum = [np.bincount(rank_index, weights=metric, minlength=rank_num)
+                                           for metric in (wait, transit, sync)]
+        is_straggler = cls._find_outliers(avg_delay) & (last_count > 0)
+        rank_rows = [[rank_data.get("rank"), int(rank_count[index]), int(last_count[index]),
+                      float(avg_delay[index]), float(max_delay[index]), float(wait_sum[index]),
+                      float(transit_sum[index]), float(sync_sum[index]),
+                      CommunicationParser.compute_ratio(wait_sum[index], wait_sum[index] + transit_sum[index]),
+                      bool(is_straggler[index])]
+                     for index, rank_data in enumerate(rank_data_list)]
+
+        min_elapse = np.full(collective_num, np.inf)
+        max_elapse = np.zeros(collective_num)
+        np.minimum.at(min_elapse, collective_index, elapse)
+        np.maximum.at(max_elapse, collective_index, elapse)
+        skew = max_start - min_start
+        collective_keys = list(collective_dict)
+        skew_rows = [[collective_keys[index][0], collective_keys[index][1], int(collective_rank_num[index]),
+                      float(skew[index]), rank_data_list[int(last_rank[index])].get("rank"),
+                      float(min_elapse[index]), float(max_elapse[index])]
+                     for index in np.argsort(-skew, kind="stable").tolist() if collective_rank_num[index] > 1]
+        return rank_rows, skew_rows
+
+    @classmethod
+    def _find_outliers(cls, values: np.ndarray) -> np.ndarray:
+        """
+        Returns: whether every value is above the median by more than STRAGGLER_Z_SCORE median absolute
+        deviations, which tolerates a few outliers among hundreds of ranks. without deviation, whether it is
+        above the median by more than MIN_STRAGGLER_DELAY_US
+        """
+        if len(values) < 3:
+            return np.zeros(len(values), dtype=bool)
+        median = np.median(values)
+        mad = np.median(np.abs(values - median))
+        if mad <= 0:
+            return values > median + cls.MIN_STRAGGLER_DELAY_US
+        return cls.MAD_SCALE * (values - median) / mad > cls.STRAGGLER_Z_SCORE
+
+    @classmethod
+    def _get_link_statistic(cls, rank_data_list: list) -> list:
+        """
+        Returns: rows of the links with a transit time, the slowest compared to their transport type first.
+        a link of an op reported by both of its ranks is counted once
+        """
+        link_op_set = set()
+        link_dict = {}
+        for rank_data in rank_data_list:
+            for step, op_name, link, transport_type, size, time in rank_data.get("links"):
+                if (step, op_name, link) in link_op_set:
+                    continue
+                link_op_set.add((step, op_name, link))
+                link_info = link_dict.setdefault((link, transport_type), [0, 0.0, 0.0])
+                link_info[0] += 1
+                link_info[1] += size
+                link_info[2] += time
+        link_list = [(link, transport_type, count, size, time)
+                     for (link, transport_type), (count, size, time) in link_dict.items() if time > 0]
+        if not link_list:
+            return []
+        bandwidth = np.array([size / time for _, _, _, size, time in link_list])
+        type_bandwidth_dict = {}
+        for index, link_info in enumerate(link_list):
+            type_bandwidth_dict.setdefault(link_info[1], []).append(bandwidth[index])
+        median_bandwidth = {transport_type: float(np.median(type_bandwidth))
+                            for transport_type, type_bandwidth in type_bandwidth_dict.items()}
+        ratio = np.array([bandwidth[index] / median_bandwidth[link_info[1]] if median_bandwidth[link_info[1]] > 0
+                          else 1.0 for index, link_info in enumerate(link_list)])
+        link_rows = []
+        for index in np.argsort(ratio, kind="stable").tolist():
+            link, transport_type, count, size, time = link_list[index]
+            link_rows.append([link, transport_type, count, size, time, float(bandwidth[index]), float(ratio[index]),
+                              bool(ratio[index] < cls.SLOW_LINK_RATIO)])
+        return link_rows
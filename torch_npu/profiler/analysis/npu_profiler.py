@@ -1,9 +1,11 @@
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from multiprocessing import Process
 
-from .prof_common_func.constant import Constant
+from .prof_common_func.constant import Constant, print_error_msg, print_warn_msg
 from .prof_view.view_parser_factory import ViewParserFactory
 from .prof_common_func.path_manager import ProfilerPathManager
+from .prof_parse.cann_file_parser import CANNFileParser
 from ...utils.path_manager import PathManager
 
 
@@ -11,23 +13,75 @@ class NpuProfiler:
 
     @classmethod
     def analyse(cls, input_path: str, analysis_type: str = Constant.TENSORBOARD_TRACE_HANDLER, output_path: str = None,
-                **kwargs):
+                max_workers: int = None, **kwargs):
         input_path = ProfilerPathManager.get_realpath(input_path)
         cls._check_input_path(input_path)
         profiler_path_list = ProfilerPathManager.get_profiler_path_list(input_path)
         if not profiler_path_list:
             return
-        # 多个profiler用多进程处理
-        process_list = []
         for profiler_path in profiler_path_list:
             PathManager.check_directory_path_writeable(profiler_path)
-            process = Process(target=ViewParserFactory.create_view_parser_and_run,
-                              args=(profiler_path, analysis_type, output_path, kwargs))
-            process.start()
-            process_list.append(process)
+        max_workers = cls._get_max_workers(max_workers)
+        if len(profiler_path_list) == 1:
+            failed_dict = cls._analyse_single(profiler_path_list[0], analysis_type, output_path, max_workers, kwargs)
+        else:
+            failed_dict = cls._analyse_multiple(profiler_path_list, analysis_type, output_path, max_workers, kwargs)
+        if failed_dict:
+            for profiler_path, err in failed_dict.items():
+                print_error_msg(f"Failed to parse profiling data: {profiler_path}, {err}")
+            raise RuntimeError(f"{len(failed_dict)} of {len(profiler_path_list)} profiling data parsing failed.")
 
-        for process in process_list:
-            process.join()
+    @classmethod
+    def _get_max_workers(cls, max_workers: int) -> int:
+        if max_workers is None:
+            max_workers = os.getenv(Constant.MAX_WORKERS_ENV)
+        if max_workers is None:
+            return os.cpu_count() or 1
+        try:
+            max_workers = int(max_workers)
+        except (TypeError, ValueError):
+            max_workers = 0
+        if max_workers <= 0:
+            print_warn_msg("Invalid parameter max_workers, which must be a positive integer, reset it to default.")
+            return os.cpu_count() or 1
+        return max_workers
+
+    @classmethod
+    def _analyse_single(cls, profiler_path: str, analysis_type: str, output_path: str, max_workers: int,
+                        kwargs: dict) -> dict:
+        # a non-daemonic process is kept so that the view parsers can still run in their own process pool
+        process = Process(target=ViewParserFactory.create_view_parser_and_run,
+                          args=(profiler_path, analysis_type, output_path, kwargs, max_workers))
+        process.start()
+        process.join()
+        if process.exitcode != 0:
+            return {profiler_path: f"exit code {process.exitcode}"}
+        return {}
+
+    @classmethod
+    def _analyse_multiple(cls, profiler_path_list: list, analysis_type: str, output_path: str, max_workers: int,
+                          kwargs: dict) -> dict:
+        # larger ranks first, so that the slowest one does not start last
+        profiler_path_list = sorted(profiler_path_list, key=cls._get_prof_data_size, reverse=True)
+        rank_workers = min(max_workers, len(profiler_path_list))
+        view_workers = max(1, max_workers // rank_workers)
+        failed_dict = {}
+        with ProcessPoolExecutor(max_workers=rank_workers) as executor:
+            future_dict = {executor.submit(ViewParserFactory.create_view_parser_and_run, profiler_path, analysis_type,
+                                           output_path, kwargs, view_workers): profiler_path
+                           for profiler_path in profiler_path_list}
+            for future in as_completed(future_dict):
+                try:
+                    future.result()
+                except Exception as err:
+                    failed_dict[future_dict[future]] = err
+        return failed_dict
+
+    @classmethod
+    def _get_prof_data_size(cls, profiler_path: str) -> int:
+        if not ProfilerPathManager.get_cann_path(profiler_path):
+            return 0
+        return CANNFileParser(profiler_path).get_prof_data_size()
 
     @classmethod
     def _check_input_path(cls, path: str):
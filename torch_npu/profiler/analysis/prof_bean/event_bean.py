@@ -9,6 +9,10 @@ class EventBean:
     def __init__(self, data: dict):
         self._origin_data = data
 
+    @property
+    def origin_data(self) -> dict:
+        return self._origin_data
+
     @property
     def ts(self) -> float:
         return self._origin_data.get("ts", 0)
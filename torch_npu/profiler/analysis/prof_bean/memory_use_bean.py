@@ -1,6 +1,8 @@
 import struct
 from enum import Enum
 
+import numpy as np
+
 from ..profiler_config import ProfilerConfig
 from ..prof_common_func.constant import Constant
 
@@ -18,7 +20,11 @@ class MemoryEnum(Enum):
 
 
 class MemoryUseBean:
+    TLV_TYPE_DICT = {}
     CONSTANT_STRUCT = "<5qbB2Q"
+    COLUMN_DTYPE = np.dtype([("ptr", "<i8"), ("time_ns", "<i8"), ("size", "<i8"), ("total_allocated", "<i8"),
+                             ("total_reserved", "<i8"), ("device_type", "i1"), ("device_index", "u1"),
+                             ("tid", "<u8"), ("pid", "<u8")])
     NPU_ID = 20
     CPU_ID = 0
 
@@ -1,6 +1,8 @@
 import struct
 from enum import Enum
 
+import numpy as np
+
 from ..profiler_config import ProfilerConfig
 from ..prof_common_func.constant import Constant
 
@@ -18,6 +20,13 @@ class OpMarkBean:
         Constant.NAME: 2
     }
     CONSTANT_STRUCT = "<q4Q"
+    COLUMN_DTYPE = np.dtype([("time_ns", "<i8"), ("category", "<u8"), ("corr_id", "<u8"), ("tid", "<u8"),
+                             ("pid", "<u8")])
+    # values of the category field, shared with the columnar path of FwkFileParser.get_task_queue_data
+    ENQUEUE_START = 0
+    ENQUEUE_END = 1
+    DEQUEUE_START = 2
+    DEQUEUE_END = 3
 
     def __init__(self, data: dict):
         self._origin_data = data
@@ -56,21 +65,25 @@ class OpMarkBean:
     def args(self) -> dict:
         return {"correlation_id": self.corr_id}
 
+    @property
+    def category(self) -> int:
+        return int(self._constant_data[OpMarkEnum.CATEGORY.value])
+
     @property
     def is_enqueue_start(self) -> bool:
-        return int(self._constant_data[OpMarkEnum.CATEGORY.value]) == 0
+        return self.category == self.ENQUEUE_START
 
     @property
     def is_enqueue_end(self) -> bool:
-        return int(self._constant_data[OpMarkEnum.CATEGORY.value]) == 1
+        return self.category == self.ENQUEUE_END
 
     @property
     def is_dequeue_start(self) -> bool:
-        return int(self._constant_data[OpMarkEnum.CATEGORY.value]) == 2
+        return self.category == self.DEQUEUE_START
 
     @property
     def is_dequeue_end(self) -> bool:
-        return int(self._constant_data[OpMarkEnum.CATEGORY.value]) == 3
+        return self.category == self.DEQUEUE_END
 
     @property
     def is_dequeue(self) -> bool:
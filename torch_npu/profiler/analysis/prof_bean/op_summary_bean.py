@@ -19,6 +19,41 @@ class OpSummaryBean:
     def ts(self) -> float:
         return float(self._data.get(CsvHeaders.TASK_START_TIME, 0))
 
+    @property
+    def name(self) -> str:
+        return self._data.get(CsvHeaders.OP_NAME, "")
+
+    @property
+    def op_type(self) -> str:
+        return self._data.get(CsvHeaders.OP_TYPE, "")
+
+    @property
+    def dur(self) -> float:
+        try:
+            return float(self._data.get(CsvHeaders.TASK_DURATION, 0))
+        except ValueError:
+            return 0.0
+
+    @property
+    def main_mem_bytes(self) -> any:
+        """
+        Returns: bytes read from and written to the main memory, None without the memory metrics
+        """
+        bandwidth = None
+        for header, value in self._data.items():
+            if not self.is_main_mem_header(header):
+                continue
+            try:
+                bandwidth = (bandwidth or 0.0) + float(value)
+            except (TypeError, ValueError):
+                continue
+        # GB/s multiplied by us is 1e3 bytes
+        return bandwidth * self.dur * 1e3 if bandwidth is not None else None
+
     @property
     def all_headers(self) -> list:
         return list(self._data.keys())
+
+    @classmethod
+    def is_main_mem_header(cls, header: str) -> bool:
+        return bool(header) and header.endswith((CsvHeaders.MAIN_MEM_READ_BW, CsvHeaders.MAIN_MEM_WRITE_BW))
@@ -1,6 +1,8 @@
 import struct
 from enum import Enum
 
+import numpy as np
+
 from ..profiler_config import ProfilerConfig
 from ..prof_common_func.constant import Constant
 
@@ -26,6 +28,8 @@ class TorchOpBean:
         Constant.FLOPS: 8
     }
     CONSTANT_STRUCT = "<3q4Q?"
+    COLUMN_DTYPE = np.dtype([("start_ns", "<i8"), ("end_ns", "<i8"), ("sequence_number", "<i8"), ("pid", "<u8"),
+                             ("tid", "<u8"), ("end_tid", "<u8"), ("fwd_tid", "<u8"), ("is_async", "?")])
 
     def __init__(self, data: dict):
         self._origin_data = data
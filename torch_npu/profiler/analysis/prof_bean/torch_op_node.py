@@ -1,116 +1,88 @@
-from math import ceil
-
-from .node_info_bean import NodeInfoBean
 from ..prof_common_func.constant import Constant
 
 
 class TorchOpNode:
-    def __init__(self, event=None, parent_node=None, all_node_num=None):
-        self._event = event
-        self._parent_node = parent_node
-        self._all_node_num = all_node_num
-        self._child_list = []
-        self._device_dur_list = [0, 0, 0, 0]
-        self._kernel_list = []
-        self._min_start = float('inf')
-        self._max_end = -float('inf')
+    """
+    lightweight view of one node of a TorchOpTree, all data lives in the tree arrays
+    """
+    __slots__ = ("_tree", "_index")
+
+    def __init__(self, tree: any, index: int):
+        self._tree = tree
+        self._index = index
+
+    @property
+    def index(self) -> int:
+        return self._index
 
     @property
     def event(self):
-        return self._event
+        return self._tree.get_event(self._index)
 
     @property
-    def all_node_num(self):
-        return self._all_node_num
+    def name(self) -> str:
+        return self._tree.get_name(self._index)
 
     @property
     def input_shape(self):
-        return self._event.args.get(Constant.INPUT_SHAPES, "")
+        return self.event.args.get(Constant.INPUT_SHAPES, "")
 
     @property
     def call_stack(self):
-        return self._event.args.get(Constant.CALL_STACK, "")
+        return self.event.args.get(Constant.CALL_STACK, "")
 
     @property
     def kernel_list(self):
-        return self._kernel_list
+        return self._tree.get_kernel_list(self._index)
 
     @property
     def start_time(self) -> float:
-        return self._event.ts
+        return float(self._tree.start[self._index])
 
     @property
     def end_time(self) -> float:
-        return self._event.ts + self._event.dur
+        return float(self._tree.end[self._index])
 
     @property
     def host_self_dur(self):
-        return self._event.dur - sum([node.event.dur for node in self._child_list])
+        return float(self._tree.host_self_dur[self._index])
 
     @property
     def host_total_dur(self):
-        return self._event.dur
+        return float(self._tree.host_total_dur[self._index])
 
     @property
     def device_self_dur(self):
-        return self._device_dur_list[0]
+        return float(self._tree.device_dur[self._tree.DEVICE_SELF][self._index])
 
     @property
     def device_self_dur_with_ai_core(self):
-        return self._device_dur_list[1]
+        return float(self._tree.device_dur[self._tree.DEVICE_SELF_WITH_AI_CORE][self._index])
 
     @property
     def device_total_dur(self):
-        return self._device_dur_list[2]
+        return float(self._tree.device_dur[self._tree.DEVICE_TOTAL][self._index])
 
     @property
     def device_total_dur_with_ai_core(self):
-        return self._device_dur_list[3]
+        return float(self._tree.device_dur[self._tree.DEVICE_TOTAL_WITH_AI_CORE][self._index])
 
     @property
     def child_node_list(self) -> list:
-        return self._child_list
+        return [TorchOpNode(self._tree, index) for index in self._tree.get_child_index_list(self._index)]
 
     @property
     def parent_node(self) -> any:
-        return self._parent_node
+        parent_index = int(self._tree.parent[self._index])
+        return TorchOpNode(self._tree, parent_index) if parent_index != self._tree.INVALID_INDEX else None
 
     @property
     def device_start(self) -> any:
-        return self._min_start
+        return float(self._tree.device_start[self._index])
 
     @property
     def device_end(self) -> any:
-        return self._max_end
+        return float(self._tree.device_end[self._index])
 
     def is_profiler_step(self) -> bool:
-        return self._event.name.find("ProfilerStep#") != -1
-
-    def add_child_node(self, child_node):
-        self._child_list.append(child_node)
-
-    def match_child_node(self, ts_time: float) -> any:
-        if not self._child_list:
-            return None
-        right = len(self._child_list) - 1
-        left = 0
-        while right > left:
-            mid = left + ceil((right - left) / 2)
-            if ts_time >= self._child_list[mid].start_time:
-                left = mid
-            else:
-                right = mid - 1
-        return self._child_list[left] if self._child_list[left].end_time > ts_time else None
-
-    def update_device_self(self, node_info_bean: NodeInfoBean):
-        self._device_dur_list[0] += node_info_bean.device_dur
-        self._device_dur_list[1] += node_info_bean.device_dur_with_ai_core
-        self._kernel_list = node_info_bean.kernel_list
-
-    def update_device_total(self, node_info_bean: NodeInfoBean):
-        self._device_dur_list[2] += node_info_bean.device_dur
-        self._device_dur_list[3] += node_info_bean.device_dur_with_ai_core
-
-    def update_device_range(self, node_info_bean: NodeInfoBean):
-        self._min_start = min([self._min_start, node_info_bean.min_start])
-        self._max_end = max([self._max_end, node_info_bean.max_end])
+        return self.name.find("ProfilerStep#") != -1
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import re
+import stat
+
+import numpy as np
+
+from ....utils.path_manager import PathManager
+from ..prof_common_func.constant import Constant, print_info_msg, print_warn_msg
+
+
+class CacheManager:
+    """
+    cache of intermediate analysis products, stored under the profiler directory. an entry is a npz file of
+    numpy arrays plus json metadata, loaded without pickle so that a cache file can never run code. the key of
+    an entry covers the cache version, the stage name, the extra args and, for every input file, its path
+    relative to the profiler directory, its size, its mtime in ns and a sha256 of its first and last 64 KB.
+    it is not a hash of the whole content: a file rewritten in the middle with the same size and mtime is not
+    detected. entries written by another user or writable by the group or others are ignored
+    """
+    CACHE_VERSION = 4
+    CACHE_SUFFIX = ".npz"
+    META_NAME = "__meta__"
+    SAMPLE_SIZE = 64 * 1024
+
+    def __init__(self, profiler_path: str):
+        self._profiler_path = profiler_path
+        self._cache_path = os.path.join(profiler_path, Constant.CACHE_DIR)
+
+    @classmethod
+    def get_file_fingerprint(cls, file_path: str) -> tuple:
+        """
+        size, mtime and a hash of the head and tail of the file, cheap enough for files of many GB
+        """
+        file_stat = os.stat(file_path)
+        sample_hash = hashlib.sha256()
+        with open(file_path, "rb") as file:
+            sample_hash.update(file.read(cls.SAMPLE_SIZE))
+            if file_stat.st_size > cls.SAMPLE_SIZE:
+                file.seek(max(file_stat.st_size - cls.SAMPLE_SIZE, cls.SAMPLE_SIZE))
+                sample_hash.update(file.read(cls.SAMPLE_SIZE))
+        return file_stat.st_size, file_stat.st_mtime_ns, sample_hash.hexdigest()
+
+    def get_key(self, stage: str, file_list: list, *extra_args) -> str:
+        key_hash = hashlib.sha256(f"{self.CACHE_VERSION}:{stage}:{extra_args}".encode())
+        for file_path in sorted(file_list):
+            if not os.path.isfile(file_path):
+                continue
+            relative_path = os.path.relpath(file_path, self._profiler_path)
+            key_hash.update(f"{relative_path}:{self.get_file_fingerprint(file_path)}".encode())
+        return key_hash.hexdigest()
+
+    def load(self, stage: str, key: str) -> tuple:
+        """
+        Returns: (is_hit, arrays, meta)
+        """
+        cache_file = self._get_cache_file(stage, key)
+        if not os.path.isfile(cache_file):
+            return False, None, None
+        if not self._is_trusted_file(cache_file):
+            print_warn_msg(f"Ignore analysis cache {os.path.basename(cache_file)} which does not belong to the "
+                           f"current user or is writable by others, it will be rebuilt.")
+            return False, None, None
+        try:
+            with np.load(cache_file, allow_pickle=False) as cache_data:
+                arrays = {name: cache_data[name] for name in cache_data.files if name != self.META_NAME}
+                meta = json.loads(cache_data[self.META_NAME].tobytes().decode("utf-8"))
+        except Exception:
+            print_warn_msg(f"Failed to load analysis cache {os.path.basename(cache_file)}, it will be rebuilt.")
+            return False, None, None
+        print_info_msg(f"Reuse cached analysis result: {stage}")
+        return True, arrays, meta
+
+    def save(self, stage: str, key: str, arrays: dict, meta: any) -> None:
+        """
+        arrays must not hold python objects, meta must be json serializable
+        """
+        cache_file = self._get_cache_file(stage, key)
+        tmp_file = cache_file + ".tmp"
+        try:
+            PathManager.make_dir_safety(self._cache_path)
+            self._remove_stage_cache(stage)
+            PathManager.create_file_safety(tmp_file)
+            meta_array = np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8)
+            with open(tmp_file, "wb") as file:
+                np.savez(file, **arrays, **{self.META_NAME: meta_array})
+            os.replace(tmp_file, cache_file)
+        except Exception:
+            print_warn_msg(f"Failed to save analysis cache: {stage}")
+            if os.path.isfile(tmp_file):
+                os.remove(tmp_file)
+
+    def get_or_compute(self, stage: str, file_list: list, compute_func: any, load_func: any, *extra_args) -> any:
+        """
+        the data returned by compute_func is saved with its to_cache_data, which returns its arrays and
+        metadata, and load_func rebuilds it from them
+        """
+        key = self.get_key(stage, file_list, *extra_args)
+        is_hit, arrays, meta = self.load(stage, key)
+        if is_hit:
+            try:
+                return load_func(arrays, meta)
+            except Exception:
+                print_warn_msg(f"Invalid analysis cache: {stage}, it will be rebuilt.")
+        data = compute_func()
+        self.save(stage, key, *data.to_cache_data())
+        return data
+
+    @classmethod
+    def _is_trusted_file(cls, file_path: str) -> bool:
+        file_stat = os.lstat(file_path)
+        if not stat.S_ISREG(file_stat.st_mode) or file_stat.st_uid != os.getuid():
+            return False
+        return not file_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+    def _get_cache_file(self, stage: str, key: str) -> str:
+        return os.path.join(self._cache_path, f"{stage}_{key}{self.CACHE_SUFFIX}")
+
+    def _remove_stage_cache(self, stage: str) -> None:
+        pattern = rf"{re.escape(stage)}_[0-9a-f]{{64}}\.(npz|pkl)"
+        for file_name in os.listdir(self._cache_path):
+            if re.fullmatch(pattern, file_name):
+                os.remove(os.path.join(self._cache_path, file_name))
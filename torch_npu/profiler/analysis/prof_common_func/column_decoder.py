@@ -0,0 +1,86 @@
+import struct
+from warnings import warn
+
+import numpy as np
+
+from ..prof_common_func.column_table import ColumnTable, StringTable
+from ..prof_common_func.tlv_decoder import TLVDecoder
+
+
+class ColumnDecoder:
+    GATHER_BATCH_SIZE = 65536
+
+    @classmethod
+    def decode(cls, all_bytes: bytes, class_bean: any, constant_struct_size: int, is_tlv: bool = True) -> ColumnTable:
+        dtype = class_bean.COLUMN_DTYPE
+        if dtype.itemsize != constant_struct_size:
+            raise RuntimeError(f"Column dtype of {class_bean.__name__} does not match the struct size.")
+        if not is_tlv:
+            record_num = len(all_bytes) // constant_struct_size
+            fixed_data = np.frombuffer(all_bytes, dtype=dtype, count=record_num)
+            return ColumnTable(class_bean, fixed_data, {}, StringTable())
+        record_offsets, record_ends = cls._scan_records(all_bytes, constant_struct_size)
+        fixed_data = cls._gather_fixed_data(all_bytes, record_offsets, dtype)
+        tlv_columns, string_table = cls._decode_tlv_fields(all_bytes, record_offsets + constant_struct_size,
+                                                           record_ends, class_bean)
+        return ColumnTable(class_bean, fixed_data, tlv_columns, string_table)
+
+    @classmethod
+    def _scan_records(cls, all_bytes: bytes, constant_struct_size: int) -> tuple:
+        header_len = TLVDecoder.T_LEN + TLVDecoder.L_LEN
+        all_bytes_len = len(all_bytes)
+        record_offsets, record_ends = [], []
+        index = 0
+        while index < all_bytes_len:
+            if index + header_len > all_bytes_len:
+                warn("The collected data has been lost")
+                break
+            value_len = struct.unpack_from("<I", all_bytes, index + TLVDecoder.T_LEN)[0]
+            index += header_len
+            if index + value_len > all_bytes_len:
+                warn("The collected data has been lost")
+                break
+            if value_len < constant_struct_size:
+                warn("The collected data has been lost")
+            else:
+                record_offsets.append(index)
+                record_ends.append(index + value_len)
+            index += value_len
+        return np.array(record_offsets, dtype=np.int64), np.array(record_ends, dtype=np.int64)
+
+    @classmethod
+    def _gather_fixed_data(cls, all_bytes: bytes, record_offsets: np.ndarray, dtype: np.dtype) -> np.ndarray:
+        fixed_data = np.empty(len(record_offsets), dtype=dtype)
+        if not len(record_offsets):
+            return fixed_data
+        raw_data = np.frombuffer(all_bytes, dtype=np.uint8)
+        byte_range = np.arange(dtype.itemsize, dtype=np.int64)
+        fixed_bytes = fixed_data.view(np.uint8).reshape(len(record_offsets), dtype.itemsize)
+        for start in range(0, len(record_offsets), cls.GATHER_BATCH_SIZE):
+            batch_offsets = record_offsets[start: start + cls.GATHER_BATCH_SIZE]
+            fixed_bytes[start: start + len(batch_offsets)] = raw_data[batch_offsets[:, None] + byte_range]
+        return fixed_data
+
+    @classmethod
+    def _decode_tlv_fields(cls, all_bytes: bytes, field_offsets: np.ndarray, record_ends: np.ndarray,
+                           class_bean: any) -> tuple:
+        string_table = StringTable()
+        record_num = len(field_offsets)
+        tlv_columns = {type_id: np.full(record_num, StringTable.INVALID_ID, dtype=np.int32)
+                       for type_id in class_bean.TLV_TYPE_DICT.values()}
+        header_len = TLVDecoder.T_LEN + TLVDecoder.L_LEN
+        for record_index, (index, end_index) in enumerate(zip(field_offsets.tolist(), record_ends.tolist())):
+            while index < end_index:
+                if index + header_len > end_index:
+                    warn("The collected data has been lost")
+                    break
+                type_id, value_len = struct.unpack_from("<HI", all_bytes, index)
+                index += header_len
+                if index + value_len > end_index:
+                    warn("The collected data has been lost")
+                    break
+                string_ids = tlv_columns.get(type_id)
+                if string_ids is not None:
+                    string_ids[record_index] = string_table.intern(all_bytes[index: index + value_len])
+                index += value_len
+        return tlv_columns, string_table
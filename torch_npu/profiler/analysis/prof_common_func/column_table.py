@@ -0,0 +1,116 @@
+import numpy as np
+
+from ..prof_common_func.constant import Constant
+
+
+class StringTable:
+    """
+    intern table for the tlv string fields, every distinct value is decoded and stored only once
+    """
+    INVALID_ID = -1
+
+    def __init__(self, string_list: list = None):
+        self._string_list = list(string_list) if string_list else []
+        self._string_dict = {}
+        for string_id, value in enumerate(self._string_list):
+            self._string_dict.setdefault(value, string_id)
+
+    def __len__(self):
+        return len(self._string_list)
+
+    @property
+    def string_list(self) -> list:
+        return self._string_list
+
+    def intern(self, value: any) -> int:
+        string_id = self._string_dict.get(value)
+        if string_id is not None:
+            return string_id
+        string_id = len(self._string_list)
+        self._string_dict[value] = string_id
+        if isinstance(value, bytes):
+            try:
+                value = bytes.decode(value)
+            except UnicodeDecodeError:
+                value = 'N/A'
+        self._string_list.append(value)
+        return string_id
+
+    def get_string(self, string_id: int, default: str = "") -> str:
+        if string_id < 0 or string_id >= len(self._string_list):
+            return default
+        return self._string_list[string_id]
+
+
+class ColumnTable:
+    """
+    columnar view of the framework records: the constant part of every record lives in a numpy structured
+    array and every tlv string field is an int32 column indexing the shared string table
+    """
+
+    FIXED_DATA = "fixed_data"
+    TLV_PREFIX = "tlv_"
+
+    def __init__(self, class_bean: any, fixed_data: np.ndarray, tlv_columns: dict, string_table: StringTable):
+        self._class_bean = class_bean
+        self._fixed_data = fixed_data
+        self._tlv_columns = tlv_columns
+        self._string_table = string_table
+
+    def __len__(self):
+        return len(self._fixed_data)
+
+    def __iter__(self):
+        for index in range(len(self._fixed_data)):
+            yield self[index]
+
+    def __getitem__(self, index: int) -> any:
+        data = {Constant.CONSTANT_BYTES: self._fixed_data[index].tobytes()}
+        for type_id, string_ids in self._tlv_columns.items():
+            string_id = int(string_ids[index])
+            if string_id != StringTable.INVALID_ID:
+                data[type_id] = self._string_table.get_string(string_id)
+        return self._class_bean(data)
+
+    @classmethod
+    def from_cache_data(cls, class_bean: any, arrays: dict, meta: dict) -> any:
+        tlv_columns = {int(name[len(cls.TLV_PREFIX):]): string_ids for name, string_ids in arrays.items()
+                       if name.startswith(cls.TLV_PREFIX)}
+        return cls(class_bean, arrays[cls.FIXED_DATA], tlv_columns, StringTable(meta.get("string_list")))
+
+    @property
+    def class_bean(self) -> any:
+        return self._class_bean
+
+    @property
+    def string_table(self) -> StringTable:
+        return self._string_table
+
+    @property
+    def column_names(self) -> tuple:
+        return self._fixed_data.dtype.names
+
+    def column(self, name: str) -> np.ndarray:
+        return self._fixed_data[name]
+
+    def tlv_column(self, type_name: str) -> np.ndarray:
+        type_id = self._class_bean.TLV_TYPE_DICT.get(type_name)
+        string_ids = self._tlv_columns.get(type_id)
+        if string_ids is None:
+            return np.full(len(self._fixed_data), StringTable.INVALID_ID, dtype=np.int32)
+        return string_ids
+
+    def get_string(self, string_id: int, default: str = "") -> str:
+        return self._string_table.get_string(string_id, default)
+
+    def take(self, indices: np.ndarray) -> any:
+        tlv_columns = {type_id: string_ids[indices] for type_id, string_ids in self._tlv_columns.items()}
+        return ColumnTable(self._class_bean, self._fixed_data[indices], tlv_columns, self._string_table)
+
+    def to_cache_data(self) -> tuple:
+        """
+        Returns: arrays of the fixed data and the tlv columns, and the strings as metadata
+        """
+        arrays = {self.FIXED_DATA: self._fixed_data}
+        arrays.update({f"{self.TLV_PREFIX}{type_id}": string_ids for type_id, string_ids in self._tlv_columns.items()})
+        return arrays, {"string_list": self._string_table.string_list}
@@ -0,0 +1,136 @@
+import json
+import os
+from itertools import islice
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+
+    HAS_PYARROW = True
+except ModuleNotFoundError:
+    pa = None  # type: ignore[assignment]
+    HAS_PYARROW = False
+
+
+class ColumnarFile:
+    """
+    self-describing columnar copy of a result table: an arrow ipc file when pyarrow is importable,
+    otherwise a numpy structured .npy file. both carry their schema and can be memory mapped
+    """
+    ARROW_SUFFIX = ".arrow"
+    NPY_SUFFIX = ".npy"
+    INT_TYPE = "int64"
+    FLOAT_TYPE = "float64"
+    STRING_TYPE = "string"
+    JSON_TYPE = "json"
+
+    @classmethod
+    def get_file_name(cls, file_name: str) -> str:
+        return os.path.splitext(file_name)[0] + (cls.ARROW_SUFFIX if HAS_PYARROW else cls.NPY_SUFFIX)
+
+    @classmethod
+    def get_stream_file_name(cls, file_name: str) -> str:
+        return os.path.splitext(file_name)[0] + cls.ARROW_SUFFIX
+
+    @classmethod
+    def is_stream_supported(cls) -> bool:
+        return HAS_PYARROW
+
+    @classmethod
+    def write_table(cls, file, data: list, headers: list = None) -> None:
+        column_names = cls._get_column_names(data, headers)
+        column_list = [cls._to_column([row[index] if index < len(row) else None for row in data])
+                       for index in range(len(column_names))]
+        if HAS_PYARROW:
+            table = pa.table({name: pa.array(column.tolist(), type=cls._get_arrow_type(column.dtype))
+                              for name, column in zip(column_names, column_list)})
+            with pa.ipc.new_file(file, table.schema) as writer:
+                writer.write_table(table)
+            return
+        structured_data = np.empty(len(data), dtype=[(name, column.dtype)
+                                                     for name, column in zip(column_names, column_list)])
+        for name, column in zip(column_names, column_list):
+            structured_data[name] = column
+        np.save(file, structured_data, allow_pickle=False)
+
+    @classmethod
+    def iter_with_record_batches(cls, file, data_iter: any, field_types: dict, batch_size: int) -> iter:
+        """
+        pass the dict records of data_iter through while writing them as arrow record batches of a fixed schema
+        """
+        schema = pa.schema([(name, cls._get_arrow_type(field_type)) for name, field_type in field_types.items()])
+        data_iter = iter(data_iter)
+        with pa.ipc.new_file(file, schema) as writer:
+            batch = list(islice(data_iter, batch_size))
+            while batch:
+                writer.write_batch(pa.record_batch(
+                    [pa.array([cls._convert_field(data.get(name), field_type) for data in batch],
+                              type=schema.field(name).type)
+                     for name, field_type in field_types.items()], schema=schema))
+                yield from batch
+                batch = list(islice(data_iter, batch_size))
+
+    @classmethod
+    def _get_column_names(cls, data: list, headers: list) -> list:
+        column_num = max(len(headers) if headers else 0, max(len(row) for row in data))
+        column_names = []
+        for index in range(column_num):
+            name = str(headers[index]) if headers and index < len(headers) else f"column_{index}"
+            while name in column_names:
+                name = f"{name}_{index}"
+            column_names.append(name)
+        return column_names
+
+    @classmethod
+    def _to_column(cls, values: list) -> np.ndarray:
+        """
+        int64 or float64 when every value is a number or a numeric string, missing numbers become nan,
+        anything else is kept as unicode strings
+        """
+        numbers = []
+        is_int = True
+        for value in values:
+            if value is None or value == "":
+                numbers.append(None)
+                continue
+            if isinstance(value, bool):
+                break
+            if isinstance(value, (int, np.integer)) or \
+                    (isinstance(value, str) and value.strip().lstrip("-").isdecimal()):
+                numbers.append(int(value))
+                continue
+            try:
+                numbers.append(float(value))
+            except (TypeError, ValueError):
+                break
+            is_int = False
+        else:
+            if is_int and None not in numbers and all(abs(number) < 2 ** 63 for number in numbers):
+                return np.array(numbers, dtype=np.int64)
+            return np.array([np.nan if number is None else number for number in numbers], dtype=np.float64)
+        return np.array(["" if value is None else str(value) for value in values], dtype=str)
+
+    @classmethod
+    def _convert_field(cls, value: any, field_type: str) -> any:
+        if value is None:
+            return None
+        if field_type == cls.JSON_TYPE:
+            return json.dumps(value)
+        if field_type == cls.FLOAT_TYPE:
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return None
+        return str(value)
+
+    @classmethod
+    def _get_arrow_type(cls, column_type: any) -> any:
+        if isinstance(column_type, np.dtype):
+            column_type = {"i": cls.INT_TYPE, "f": cls.FLOAT_TYPE}.get(column_type.kind, cls.STRING_TYPE)
+        if column_type == cls.INT_TYPE:
+            return pa.int64()
+        if column_type == cls.FLOAT_TYPE:
+            return pa.float64()
+        return pa.string()
@@ -8,8 +8,15 @@ class Constant(object):
     # dir name
     FRAMEWORK_DIR = "FRAMEWORK"
     OUTPUT_DIR = "ASCEND_PROFILER_OUTPUT"
+    CLUSTER_OUTPUT_DIR = "cluster_analysis_output"
+    CACHE_DIR = "ASCEND_PROFILER_CACHE"
     ASCEND_WORK_PATH = "ASCEND_WORK_PATH"
     PROFILING_WORK_PATH = "profiling_data"
+    MAX_WORKERS_ENV = "ASCEND_PROFILER_MAX_WORKERS"
+    ANALYSIS_QUEUE_SIZE = 4
+    ANALYSIS_WAIT_INTERVAL = 1
+    PEAK_TFLOPS_ENV = "ASCEND_PROFILER_PEAK_TFLOPS"
+    PEAK_BANDWIDTH_ENV = "ASCEND_PROFILER_PEAK_BANDWIDTH"
 
     # file authority
     FILE_AUTHORITY = 0o640
@@ -20,6 +27,18 @@ class Constant(object):
     MAX_WORKER_NAME_LENGTH = 226
     MAX_FILE_NAME_LENGTH = 255
     PROF_WARN_SIZE = 1024 * 1024 * 400
+    JSON_WRITE_CHUNK_SIZE = 10000
+    JSON_READ_CHUNK_SIZE = 1024 * 1024 * 8
+    JSON_READ_BATCH_SIZE = 10000
+    TRACE_SHARD_BUFFER_SIZE = 100000
+    # width in us of the trace shards when there is no step
+    TRACE_SHARD_WINDOW = 1000000
+    MSPROF_EXPORT_MAX_WORKERS = 8
+    MSPROF_EXPORT_TIMEOUT = 3600
+    GZIP_CHUNK_SIZE = 1024 * 1024 * 4
+    GZIP_MAX_WORKERS = 4
+    GZIP_COMPRESS_LEVEL = 6
+    GZIP_SUFFIX = ".gz"
 
     # tlv constant struct
     CONSTANT_BYTES = "constant_bytes"
@@ -48,6 +67,11 @@ class Constant(object):
     # framework
     TENSORBOARD_TRACE_HANDLER = "tensorboard_trace_handler"
     EXPORT_CHROME_TRACE = "export_chrome_trace"
+    USE_GZIP = "use_gzip"
+    SHARD_TRACE = "shard_trace"
+    COLUMNAR_EXPORT = "columnar_export"
+    PEAK_TFLOPS = "peak_tflops"
+    PEAK_BANDWIDTH = "peak_bandwidth"
 
     ACL_OP_EXE_NAME = ("AscendCL@aclopCompileAndExecute".lower(), "AscendCL@aclopCompileAndExecuteV2".lower())
     AI_CORE = "AI_CORE"
@@ -69,6 +93,7 @@ class Constant(object):
     AI_CORE_METRICS = '_aic_metrics'
     L2_CACHE = '_l2_cache'
     DATA_SIMPLIFICATION = '_data_simplification'
+    EXPORT_TYPE = '_export_type'
     LEVEL0 = "Level0"
     LEVEL1 = "Level1"
     LEVEL2 = "Level2"
@@ -80,6 +105,8 @@ class Constant(object):
     AicResourceConflictRatio = "ACL_AICORE_RESOURCE_CONFLICT_RATIO"
     AicL2Cache = "ACL_AICORE_L2_CACHE"
     AicMetricsNone = "ACL_AICORE_NONE"
+    EXPORT_TEXT = "text"
+    EXPORT_COLUMNAR = "columnar"
 
     # profiler end info
     END_INFO = "end_info"
@@ -1,7 +1,13 @@
 class CsvHeaders(object):
     # op_summary
+    OP_NAME = "Op Name"
+    OP_TYPE = "OP Type"
     TASK_START_TIME = "Task Start Time(us)"
-    OP_SUMMARY_SHOW_HEADERS = ["Op Name", "OP Type", "Task Type", TASK_START_TIME, "Task Duration(us)",
+    TASK_DURATION = "Task Duration(us)"
+    # the main memory bandwidth columns of the aic and aiv memory metrics end with these
+    MAIN_MEM_READ_BW = "main_mem_read_bw(GB/s)"
+    MAIN_MEM_WRITE_BW = "main_mem_write_bw(GB/s)"
+    OP_SUMMARY_SHOW_HEADERS = [OP_NAME, OP_TYPE, "Task Type", TASK_START_TIME, TASK_DURATION,
                                "Task Wait Time(us)", "Block Dim"]
     OP_SUMMARY_KERNEL_BASE_HEADERS = ["Name", "Type", "Accelerator Core", "Start Time(us)", "Duration(us)",
                                       "Wait Time(us)", "Block Dim"]
@@ -1,12 +1,27 @@
 import csv
+import gzip
 import json
 import os.path
+from itertools import islice
 
 from ....utils.path_manager import PathManager
+from ..prof_common_func.columnar_file import ColumnarFile
 from ..prof_common_func.constant import Constant, print_warn_msg
+from ..prof_common_func.gzip_writer import GzipWriter
 
 
 class FileManager:
+    # csv and trace results are written as gzip files when it is set
+    _use_gzip = False
+
+    @classmethod
+    def set_use_gzip(cls, use_gzip: bool) -> None:
+        cls._use_gzip = use_gzip
+
+    @classmethod
+    def is_use_gzip(cls) -> bool:
+        return cls._use_gzip
+
     @classmethod
     def file_read_all(cls, file_path: str, mode: str = "r") -> any:
         PathManager.check_directory_path_readable(file_path)
@@ -20,7 +35,7 @@ class FileManager:
             print_warn_msg(msg)
             return ''
         try:
-            with open(file_path, mode) as file:
+            with cls._open_read_file(file_path, mode) as file:
                 return file.read()
         except Exception as err:
             raise RuntimeError(f"Can't read file: {file_path}") from err
@@ -39,7 +54,7 @@ class FileManager:
             return []
         result_data = []
         try:
-            with open(file_path, newline="") as csv_file:
+            with cls._open_read_file(file_path, "rt", newline="") as csv_file:
                 reader = csv.DictReader(csv_file)
                 for row in reader:
                     result_data.append(class_bean(row))
@@ -48,19 +63,71 @@ class FileManager:
         return result_data
 
     @classmethod
-    def create_csv_file(cls, output_path: str, data: list, file_name: str, headers: list = None) -> None:
+    def create_csv_file(cls, output_path: str, data: list, file_name: str, headers: list = None,
+                        columnar_export: bool = False) -> None:
+        if not data:
+            return
+        file_path = os.path.join(output_path, file_name + (Constant.GZIP_SUFFIX if cls._use_gzip else ""))
+        PathManager.make_dir_safety(output_path)
+        PathManager.create_file_safety(file_path)
+        PathManager.check_directory_path_writeable(file_path)
+        try:
+            with open(file_path, "wb" if cls._use_gzip else "w", newline=None if cls._use_gzip else "") as file:
+                if cls._use_gzip:
+                    with GzipWriter(file) as gzip_file:
+                        cls._write_csv_data(gzip_file, data, headers)
+                else:
+                    cls._write_csv_data(file, data, headers)
+        except Exception as err:
+            raise RuntimeError(f"Can't create file: {file_path}") from err
+        if columnar_export:
+            cls.create_columnar_file(output_path, data, file_name, headers)
+
+    @classmethod
+    def create_columnar_file(cls, output_path: str, data: list, file_name: str, headers: list = None) -> None:
         if not data:
             return
+        file_path = os.path.join(output_path, ColumnarFile.get_file_name(file_name))
+        PathManager.make_dir_safety(output_path)
+        PathManager.create_file_safety(file_path)
+        PathManager.check_directory_path_writeable(file_path)
+        try:
+            with open(file_path, "wb") as file:
+                ColumnarFile.write_table(file, data, headers)
+        except Exception as err:
+            raise RuntimeError(f"Can't create file: {file_path}") from err
+
+    @classmethod
+    def iter_with_columnar_file(cls, output_path: str, data_iter: any, file_name: str, field_types: dict) -> iter:
+        """
+        pass the dict records of data_iter through while writing their columnar copy
+        """
+        if not ColumnarFile.is_stream_supported():
+            print_warn_msg(f"pyarrow is not installed, skip the columnar export of {file_name}.")
+            yield from data_iter
+            return
+        file_path = os.path.join(output_path, ColumnarFile.get_stream_file_name(file_name))
+        PathManager.make_dir_safety(output_path)
+        PathManager.create_file_safety(file_path)
+        PathManager.check_directory_path_writeable(file_path)
+        try:
+            with open(file_path, "wb") as file:
+                yield from ColumnarFile.iter_with_record_batches(file, data_iter, field_types,
+                                                                 Constant.JSON_WRITE_CHUNK_SIZE)
+        except OSError as err:
+            raise RuntimeError(f"Can't create file: {file_path}") from err
+
+    @classmethod
+    def create_text_file(cls, output_path: str, lines: list, file_name: str) -> None:
+        if not lines:
+            return
         file_path = os.path.join(output_path, file_name)
         PathManager.make_dir_safety(output_path)
         PathManager.create_file_safety(file_path)
         PathManager.check_directory_path_writeable(file_path)
         try:
-            with open(file_path, "w", newline="") as file:
-                writer = csv.writer(file)
-                if headers:
-                    writer.writerow(headers)
-                writer.writerows(data)
+            with open(file_path, "w") as file:
+                file.writelines(f"{line}\n" for line in lines)
         except Exception as err:
             raise RuntimeError(f"Can't create file: {file_path}") from err
 
@@ -82,3 +149,56 @@ class FileManager:
                 json.dump(data, file, indent=indent)
         except Exception as err:
             raise RuntimeError(f"Can't create file: {output_path}") from err
+
+    @classmethod
+    def create_json_file_by_stream(cls, output_path: str, data_iter: any,
+                                   chunk_size: int = Constant.JSON_WRITE_CHUNK_SIZE) -> None:
+        """
+        write the items of data_iter as one json array, holding at most chunk_size items in memory.
+        an empty data_iter is written as an empty array
+        """
+        data_iter = iter(data_iter)
+        chunk = list(islice(data_iter, chunk_size))
+        if cls._use_gzip:
+            output_path += Constant.GZIP_SUFFIX
+        dir_name = os.path.dirname(output_path)
+        PathManager.make_dir_safety(dir_name)
+        PathManager.create_file_safety(output_path)
+        PathManager.check_directory_path_writeable(output_path)
+        try:
+            with open(output_path, "wb" if cls._use_gzip else "w") as file:
+                if cls._use_gzip:
+                    with GzipWriter(file) as gzip_file:
+                        cls._write_json_chunks(gzip_file, chunk, data_iter, chunk_size)
+                else:
+                    cls._write_json_chunks(file, chunk, data_iter, chunk_size)
+        except Exception as err:
+            raise RuntimeError(f"Can't create file: {output_path}") from err
+
+    @classmethod
+    def _open_read_file(cls, file_path: str, mode: str, newline: str = None) -> any:
+        """
+        open a plain or a gzip compressed file alike
+        """
+        if GzipWriter.is_gzip_file(file_path):
+            text_mode = "b" not in mode
+            return gzip.open(file_path, "rt" if text_mode else "rb", newline=newline if text_mode else None)
+        return open(file_path, mode, newline=newline)
+
+    @classmethod
+    def _write_csv_data(cls, file: any, data: list, headers: list) -> None:
+        writer = csv.writer(file)
+        if headers:
+            writer.writerow(headers)
+        writer.writerows(data)
+
+    @classmethod
+    def _write_json_chunks(cls, file: any, chunk: list, data_iter: iter, chunk_size: int) -> None:
+        file.write("[")
+        file.write(",".join(json.dumps(data) for data in chunk))
+        chunk = list(islice(data_iter, chunk_size))
+        while chunk:
+            file.write(",")
+            file.write(",".join(json.dumps(data) for data in chunk))
+            chunk = list(islice(data_iter, chunk_size))
+        file.write("]")
@@ -0,0 +1,84 @@
+from functools import reduce
+
+
+class FlopsCalculator:
+    """
+    flops of the torch ops from the extra args recorded with with_flops, following computeFlops of
+    csrc/profiler/utils.cpp. the extra args are "key:value" pairs joined by ";"
+    """
+    CONV2D_OP = "aten::conv2d"
+    GEMM_OP = "aten::mm"
+    MUL_OP = "aten::mul"
+    ADD_OP = "aten::add"
+    INPUT_SIZE = "input_size"
+    WEIGHT_SIZE = "weight_size"
+    GROUPS = "groups"
+    PADDING = "padding"
+    STRIDE = "stride"
+    DILATION = "dilation"
+    MAT_SIZE = "mat_size"
+    MAT1_SIZE = "mat1_size"
+    MAT2_SIZE = "mat2_size"
+    ARGS_SEPARATOR = ";"
+    KEY_SEPARATOR = ":"
+    CONV2D_MULTIPLY_FACTOR = 2
+    GEMM_MULTIPLY_FACTOR = 2
+
+    @classmethod
+    def compute_flops(cls, op_name: str, extra_args: str) -> int:
+        """
+        Returns: flops of the op, 0 for the ops whose flops are unknown
+        """
+        if op_name not in (cls.CONV2D_OP, cls.GEMM_OP, cls.MUL_OP, cls.ADD_OP) or not extra_args:
+            return 0
+        args = cls._parse_extra_args(extra_args)
+        try:
+            if op_name == cls.CONV2D_OP:
+                return cls._compute_conv2d_flops(args)
+            if op_name == cls.GEMM_OP:
+                return cls._compute_gemm_flops(args)
+            return cls._product(args[cls.MAT_SIZE])
+        except (KeyError, TypeError, ValueError, ZeroDivisionError):
+            return 0
+
+    @classmethod
+    def _parse_extra_args(cls, extra_args: str) -> dict:
+        args = {}
+        for item in extra_args.split(cls.ARGS_SEPARATOR):
+            key, _, value = item.partition(cls.KEY_SEPARATOR)
+            value = value.strip()
+            try:
+                if value.startswith("["):
+                    args[key.strip()] = [int(dim) for dim in value.strip("[]").split(",") if dim.strip()]
+                else:
+                    args[key.strip()] = int(value)
+            except ValueError:
+                continue
+        return args
+
+    @classmethod
+    def _compute_conv2d_flops(cls, args: dict) -> int:
+        input_size, weight_size = args[cls.INPUT_SIZE], args[cls.WEIGHT_SIZE]
+        groups, padding = args[cls.GROUPS], args[cls.PADDING]
+        stride, dilation = args[cls.STRIDE], args[cls.DILATION]
+        if len(input_size) != 4 or len(weight_size) != 4 or not groups:
+            return 0
+        if len(padding) != 2 or len(dilation) != 2 or len(stride) != 2 or stride[0] * stride[1] == 0:
+            return 0
+        minibatch, in_channels, input_h, input_w = input_size
+        out_channels, _, kernel_h, kernel_w = weight_size
+        output_h = (input_h + 2 * padding[0] - dilation[0] * (kernel_h - 1) - 1) // stride[0] + 1
+        output_w = (input_w + 2 * padding[1] - dilation[1] * (kernel_w - 1) - 1) // stride[1] + 1
+        return cls.CONV2D_MULTIPLY_FACTOR * minibatch * output_h * output_w * kernel_h * kernel_w * \
+            in_channels * out_channels // groups
+
+    @classmethod
+    def _compute_gemm_flops(cls, args: dict) -> int:
+        mat1_size, mat2_size = args[cls.MAT1_SIZE], args[cls.MAT2_SIZE]
+        if not mat1_size:
+            return 0
+        return cls._product(mat1_size) // mat1_size[-1] * cls._product(mat2_size) * cls.GEMM_MULTIPLY_FACTOR
+
+    @classmethod
+    def _product(cls, size: list) -> int:
+        return reduce(lambda left, right: left * right, size, 1)
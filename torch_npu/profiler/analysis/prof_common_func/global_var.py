@@ -1,21 +1,38 @@
-from .tree_builder import TreeBuilder
+from ..prof_common_func.step_index import StepIndex
 from ..prof_parse.fwk_cann_relation_parser import FwkCANNRelationParser
 
 
 class GlobalVar:
     torch_op_tree_node = []
     step_range = []
+    step_index = None
 
     @classmethod
     def init(cls, profiler_path: str):
-        root_node = FwkCANNRelationParser(profiler_path).build_torch_op_tree()
-        if not root_node.child_node_list:
+        cls.reset()
+        torch_op_tree = FwkCANNRelationParser(profiler_path).build_torch_op_tree()
+        if not len(torch_op_tree):
             return
-        for level1_node in root_node.child_node_list:
+        for level1_node in torch_op_tree.get_top_level_nodes():
             if level1_node.is_profiler_step():
-                step_id = level1_node.event.name.split("#")[-1]
+                step_id = level1_node.name.split("#")[-1]
                 cls.step_range.append([step_id, level1_node.device_start, level1_node.device_end])
-        cls.torch_op_tree_node = TreeBuilder.go_through_tree(root_node)
+        cls.torch_op_tree_node = torch_op_tree
+
+    @classmethod
+    def reset(cls):
+        """
+        drop the state of the last analysed profiling data, a pooled process analyses several ranks in turn
+        """
+        cls.torch_op_tree_node = []
+        cls.step_range = []
+        cls.step_index = None
+
+    @classmethod
+    def get_step_index(cls) -> StepIndex:
+        if cls.step_index is None:
+            cls.step_index = StepIndex(cls.step_range)
+        return cls.step_index
 
     @classmethod
     def get_step_id_list(cls):
@@ -0,0 +1,68 @@
+import gzip
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from ..prof_common_func.constant import Constant
+
+
+class GzipWriter:
+    """
+    file-like writer of a multi-member gzip file. the written data is cut into chunks which are compressed
+    as independent gzip members in a thread pool, zlib releases the gil so the chunks compress in parallel.
+    standard gzip readers decompress the concatenated members as one stream
+    """
+    GZIP_MAGIC = b"\x1f\x8b"
+
+    def __init__(self, file: any, chunk_size: int = Constant.GZIP_CHUNK_SIZE, max_workers: int = None):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._max_workers = max_workers or min(os.cpu_count() or 1, Constant.GZIP_MAX_WORKERS)
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        self._buffer = []
+        self._buffer_size = 0
+        self._pending = deque()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # shutdown only takes cancel_futures from python 3.9
+            while self._pending:
+                self._pending.popleft().cancel()
+            self._executor.shutdown(wait=True)
+
+    @classmethod
+    def is_gzip_file(cls, file_path: str) -> bool:
+        with open(file_path, "rb") as file:
+            return file.read(len(cls.GZIP_MAGIC)) == cls.GZIP_MAGIC
+
+    def write(self, data: any) -> None:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self._buffer.append(data)
+        self._buffer_size += len(data)
+        if self._buffer_size >= self._chunk_size:
+            self._submit_chunk()
+
+    def close(self) -> None:
+        self._submit_chunk()
+        while self._pending:
+            self._file.write(self._pending.popleft().result())
+        self._executor.shutdown(wait=True)
+
+    def _submit_chunk(self) -> None:
+        if not self._buffer:
+            return
+        data = b"".join(self._buffer)
+        self._buffer = []
+        self._buffer_size = 0
+        for offset in range(0, len(data), self._chunk_size):
+            chunk = data[offset: offset + self._chunk_size]
+            self._pending.append(self._executor.submit(gzip.compress, chunk, Constant.GZIP_COMPRESS_LEVEL))
+            # bound the memory held by the compressed chunks waiting to be written in order
+            while len(self._pending) > 2 * self._max_workers or (self._pending and self._pending[0].done()):
+                self._file.write(self._pending.popleft().result())
@@ -0,0 +1,64 @@
+import heapq
+
+import numpy as np
+
+
+class IntervalIndex:
+    """
+    static index over [start, end) intervals, or [start, end] ones when closed is set.
+    the innermost interval of a point is the enclosing one which starts last, ties go to the larger index
+    """
+    INVALID_INDEX = -1
+
+    def __init__(self, starts: any, ends: any, closed: bool = False):
+        self._starts = np.asarray(starts, dtype=np.float64)
+        self._ends = np.asarray(ends, dtype=np.float64)
+        if self._starts.shape != self._ends.shape:
+            raise RuntimeError("The start and end arrays of the interval index must have the same length.")
+        self._closed = closed
+        self._build_innermost_segments()
+
+    def __len__(self):
+        return len(self._starts)
+
+    def find_innermost(self, ts: any) -> any:
+        """
+        Returns: index of the innermost interval containing ts, INVALID_INDEX if there is none.
+        ts can be a number or an array, the result has the same shape
+        """
+        ts_array = np.asarray(ts, dtype=np.float64)
+        if not len(self._points):
+            result = np.full(ts_array.shape, self.INVALID_INDEX, dtype=np.int64)
+            return result if result.ndim else int(result)
+        point_index = np.searchsorted(self._points, ts_array, side="right") - 1
+        safe_index = np.maximum(point_index, 0)
+        result = np.where(self._points[safe_index] == ts_array, self._owner_at[safe_index],
+                          self._owner_after[safe_index])
+        result = np.where(point_index < 0, self.INVALID_INDEX, result)
+        return result if result.ndim else int(result)
+
+    def _build_innermost_segments(self):
+        """
+        sweep the sorted endpoints once, keeping the enclosing intervals in a heap ordered by the latest start.
+        owner_at is the innermost interval exactly at a point, owner_after the one up to the next point
+        """
+        self._points = np.unique(np.concatenate((self._starts, self._ends)))
+        self._owner_at = np.full(len(self._points), self.INVALID_INDEX, dtype=np.int64)
+        self._owner_after = np.full(len(self._points), self.INVALID_INDEX, dtype=np.int64)
+        start_order = np.lexsort((np.arange(len(self._starts)), self._starts)).tolist()
+        starts, ends = self._starts.tolist(), self._ends.tolist()
+        active_heap = []
+        order_index = 0
+        for point_index, point in enumerate(self._points.tolist()):
+            while order_index < len(start_order) and starts[start_order[order_index]] <= point:
+                index = start_order[order_index]
+                heapq.heappush(active_heap, (-starts[index], -index, ends[index]))
+                order_index += 1
+            while active_heap and (active_heap[0][2] < point or (not self._closed and active_heap[0][2] == point)):
+                heapq.heappop(active_heap)
+            if active_heap:
+                self._owner_at[point_index] = -active_heap[0][1]
+            while active_heap and active_heap[0][2] <= point:
+                heapq.heappop(active_heap)
+            if active_heap:
+                self._owner_after[point_index] = -active_heap[0][1]
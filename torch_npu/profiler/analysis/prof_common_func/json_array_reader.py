@@ -0,0 +1,94 @@
+import codecs
+import json
+import mmap
+import os
+import re
+from json import JSONDecodeError
+
+from ....utils.path_manager import PathManager
+from ..prof_common_func.constant import Constant, print_warn_msg
+
+
+class JsonArrayReader:
+    """
+    incremental reader of files holding one json array. the file is memory-mapped and decoded chunk by chunk,
+    the items are parsed with raw_decode, so only the current chunk and the current batch are held in memory
+    whatever the file size
+    """
+    WHITESPACE = re.compile(r"[ \t\n\r]*")
+    NUMBER_CHARS = frozenset("0123456789+-.eE")
+
+    def __init__(self, chunk_size: int = Constant.JSON_READ_CHUNK_SIZE,
+                 batch_size: int = Constant.JSON_READ_BATCH_SIZE):
+        self._chunk_size = chunk_size
+        self._batch_size = batch_size
+        self._decoder = json.JSONDecoder()
+
+    def iter_batches(self, file_path_list: any) -> iter:
+        """
+        Returns: lists of at most batch_size items of the arrays of all files, in file order
+        """
+        batch = []
+        for file_path in file_path_list:
+            for item in self.iter_items(file_path):
+                batch.append(item)
+                if len(batch) >= self._batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def iter_items(self, file_path: str) -> iter:
+        PathManager.check_directory_path_readable(file_path)
+        if not os.path.isfile(file_path) or os.path.getsize(file_path) <= 0:
+            return
+        try:
+            with open(file_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield from self._iter_mapped_items(mapped, file_path)
+        except OSError as err:
+            raise RuntimeError(f"Can't read file: {file_path}") from err
+
+    def _iter_mapped_items(self, mapped: mmap.mmap, file_path: str) -> iter:
+        text_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        file_size = len(mapped)
+        buffer, pos, offset = "", 0, 0
+        is_started, expect_item = False, True
+        while True:
+            pos = self.WHITESPACE.match(buffer, pos).end()
+            is_eof = offset >= file_size
+            if pos < len(buffer):
+                char = buffer[pos]
+                if not is_started:
+                    if char != "[":
+                        print_warn_msg(f"The file is not a json array, skip it: {file_path}")
+                        return
+                    is_started = True
+                    pos += 1
+                    continue
+                if char == "]":
+                    return
+                if not expect_item:
+                    if char != ",":
+                        raise RuntimeError(f"Invalid json data: {file_path}")
+                    expect_item = True
+                    pos += 1
+                    continue
+                try:
+                    item, end = self._decoder.raw_decode(buffer, pos)
+                except JSONDecodeError as err:
+                    if is_eof:
+                        raise RuntimeError(f"Invalid json data: {file_path}") from err
+                else:
+                    # a number reaching the end of the chunk may be cut, it is parsed again with the next chunk
+                    if is_eof or (end < len(buffer) and buffer[end] not in self.NUMBER_CHARS):
+                        yield item
+                        pos, expect_item = end, False
+                        continue
+            elif is_eof:
+                if is_started:
+                    raise RuntimeError(f"Invalid json data, the array is not closed: {file_path}")
+                return
+            chunk = mapped[offset: offset + self._chunk_size]
+            offset += len(chunk)
+            buffer = buffer[pos:] + text_decoder.decode(chunk, final=offset >= file_size)
+            pos = 0
@@ -0,0 +1,222 @@
+import numpy as np
+
+
+class MemoryBlockTable:
+    """
+    npu memory records of the pta allocator sorted by time, and the blocks they allocate kept in parallel
+    numpy arrays. a block lives from its allocation record to the next record of the same pointer, device and
+    process, which is its release, or the next allocation when the release is lost. a release without an
+    allocation before it is a block allocated before the profiling. positions are indexes into the sorted
+    records, INVALID_INDEX as the allocation of the blocks allocated before the profiling and the record
+    number as the release of the blocks never released
+    """
+    INVALID_INDEX = -1
+    DEVICE_INDEX_NUM = 256
+
+    def __init__(self, record_time: np.ndarray = None, record_ptr: np.ndarray = None,
+                 record_size: np.ndarray = None, record_allocated: np.ndarray = None,
+                 record_reserved: np.ndarray = None, record_pid: np.ndarray = None,
+                 record_device_index: np.ndarray = None):
+        self._record_time = record_time if record_time is not None else np.empty(0)
+        record_num = len(self._record_time)
+        self._record_ptr = record_ptr if record_ptr is not None else np.empty(0, dtype=np.int64)
+        self._record_size = record_size if record_size is not None else np.empty(0, dtype=np.int64)
+        self._record_allocated = record_allocated if record_allocated is not None else np.empty(0, dtype=np.int64)
+        self._record_reserved = record_reserved if record_reserved is not None else np.empty(0, dtype=np.int64)
+        record_pid = record_pid if record_pid is not None else np.empty(0, dtype=np.int64)
+        record_device_index = record_device_index if record_device_index is not None else np.empty(0, dtype=np.int64)
+        # a device is a device index of a process, the allocator counters are kept per device.
+        # the device indexes are 8 bits, so the pair is packed into one key rather than sorting 2-d rows
+        pid_list, pid_inverse = np.unique(record_pid, return_inverse=True)
+        device_keys, record_device = np.unique(pid_inverse.reshape(-1).astype(np.int64) * self.DEVICE_INDEX_NUM +
+                                               record_device_index.astype(np.int64), return_inverse=True)
+        self._device_list = [(int(pid_list[device_key // self.DEVICE_INDEX_NUM]), device_key % self.DEVICE_INDEX_NUM)
+                             for device_key in device_keys.tolist()]
+        self._record_device = record_device.reshape(-1)
+        self._record_step = np.full(record_num, self.INVALID_INDEX, dtype=np.int64)
+        self._step_range = []
+        self._init_blocks()
+        self._block_op = np.full(len(self._block_size), self.INVALID_INDEX, dtype=np.int64)
+
+    def __len__(self):
+        return len(self._record_time)
+
+    @classmethod
+    def from_cache_data(cls, arrays: dict, meta: dict) -> any:
+        memory_block_table = cls()
+        for name, value in arrays.items():
+            if isinstance(getattr(memory_block_table, name, None), np.ndarray):
+                setattr(memory_block_table, name, value)
+        memory_block_table._device_list = [tuple(device) for device in meta.get("device_list")]
+        memory_block_table._step_range = meta.get("step_range")
+        return memory_block_table
+
+    @property
+    def record_time(self) -> np.ndarray:
+        return self._record_time
+
+    @property
+    def record_allocated(self) -> np.ndarray:
+        return self._record_allocated
+
+    @property
+    def record_reserved(self) -> np.ndarray:
+        return self._record_reserved
+
+    @property
+    def record_device(self) -> np.ndarray:
+        return self._record_device
+
+    @property
+    def record_step(self) -> np.ndarray:
+        return self._record_step
+
+    @property
+    def device_list(self) -> list:
+        return self._device_list
+
+    @property
+    def step_range(self) -> list:
+        return self._step_range
+
+    @property
+    def step_ids(self) -> list:
+        return [step[0] for step in self._step_range]
+
+    @property
+    def block_size(self) -> np.ndarray:
+        return self._block_size
+
+    @property
+    def block_device(self) -> np.ndarray:
+        return self._block_device
+
+    @property
+    def alloc_pos(self) -> np.ndarray:
+        return self._alloc_pos
+
+    @property
+    def free_pos(self) -> np.ndarray:
+        return self._free_pos
+
+    @property
+    def block_op(self) -> np.ndarray:
+        return self._block_op
+
+    @property
+    def block_step(self) -> np.ndarray:
+        """
+        Returns: step index of the allocation of every block, INVALID_INDEX outside the steps
+        """
+        block_step = np.full(len(self._block_size), self.INVALID_INDEX, dtype=np.int64)
+        has_alloc = self._alloc_pos != self.INVALID_INDEX
+        block_step[has_alloc] = self._record_step[self._alloc_pos[has_alloc]]
+        return block_step
+
+    def get_device_tag(self, device: int) -> str:
+        return f"NPU:{self._device_list[device][1]}"
+
+    def get_device_pid(self, device: int) -> int:
+        return self._device_list[device][0]
+
+    def get_alloc_time(self) -> np.ndarray:
+        """
+        Returns: allocation time of every block, -inf for the blocks allocated before the profiling
+        """
+        alloc_time = np.full(len(self._block_size), -np.inf)
+        has_alloc = self._alloc_pos != self.INVALID_INDEX
+        alloc_time[has_alloc] = self._record_time[self._alloc_pos[has_alloc]]
+        return alloc_time
+
+    def get_free_time(self) -> np.ndarray:
+        """
+        Returns: release time of every block, inf for the blocks never released
+        """
+        free_time = np.full(len(self._block_size), np.inf)
+        has_free = self._free_pos < len(self._record_time)
+        free_time[has_free] = self._record_time[self._free_pos[has_free]]
+        return free_time
+
+    def get_live_bytes(self) -> np.ndarray:
+        """
+        Returns: bytes of the blocks of its device live at every record, one sweep over the allocations and
+        releases shifted by one position, so that the blocks allocated before the profiling start at 0
+        """
+        live_bytes = np.zeros(len(self._record_time))
+        if not len(self._record_time):
+            return live_bytes
+        bin_num = len(self._record_time) + 2
+        for device in range(len(self._device_list)):
+            is_device = self._block_device == device
+            delta = np.bincount(self._alloc_pos[is_device] + 1, weights=self._block_size[is_device],
+                                minlength=bin_num) - \
+                np.bincount(self._free_pos[is_device] + 1, weights=self._block_size[is_device], minlength=bin_num)
+            device_pos = np.flatnonzero(self._record_device == device)
+            live_bytes[device_pos] = np.cumsum(delta)[device_pos + 1]
+        return live_bytes
+
+    def get_live_block_index(self, record_pos_list: list) -> list:
+        """
+        Returns: for every record, index of the blocks of its device live at it, the record itself included.
+        the records are sorted once by a key of device and position, the records at which a block is live are
+        then a contiguous run of them found with two binary searches, and the runs of all blocks are expanded
+        and grouped by record
+        """
+        record_pos_array = np.asarray(record_pos_list, dtype=np.int64)
+        if not len(record_pos_array):
+            return []
+        stride = len(self._record_time) + 2
+        unique_pos, inverse = np.unique(record_pos_array, return_inverse=True)
+        # positions shifted by one, so that the allocation of the blocks allocated before the profiling is 0
+        record_key = self._record_device[unique_pos] * stride + unique_pos + 1
+        key_order = np.argsort(record_key, kind="stable")
+        sorted_key = record_key[key_order]
+        block_key_base = self._block_device[self._alloc_order] * stride + 1
+        first = np.searchsorted(sorted_key, block_key_base + self._alloc_pos[self._alloc_order], side="left")
+        last = np.searchsorted(sorted_key, block_key_base + self._free_pos[self._alloc_order], side="left")
+        run_len = np.maximum(last - first, 0)
+        block_index = np.repeat(self._alloc_order, run_len)
+        run_start = np.repeat(np.cumsum(run_len) - run_len, run_len)
+        record_index = key_order[np.repeat(first, run_len) + np.arange(len(block_index)) - run_start]
+        # the blocks of a record stay in allocation order
+        group_order = np.argsort(record_index, kind="stable")
+        split_pos = np.cumsum(np.bincount(record_index, minlength=len(unique_pos)))[:-1]
+        unique_block_index = np.split(block_index[group_order], split_pos)
+        return [unique_block_index[index] for index in inverse.reshape(-1).tolist()]
+
+    def to_cache_data(self) -> tuple:
+        """
+        Returns: the record and block arrays, and the devices and step ranges as metadata
+        """
+        arrays = {name: value for name, value in vars(self).items() if isinstance(value, np.ndarray)}
+        return arrays, {"device_list": self._device_list, "step_range": self._step_range}
+
+    def update_attribution(self, block_op: np.ndarray, record_step: np.ndarray, step_range: list):
+        """
+        set the torch op allocating every block, and the index of the step of every record into the
+        [id, start, end] host ranges of step_range
+        """
+        self._block_op = block_op
+        self._record_step = record_step
+        self._step_range = step_range
+
+    def _init_blocks(self):
+        record_num = len(self._record_time)
+        # the sort is stable, so the records of a pointer are contiguous and in time order
+        order = np.lexsort((self._record_ptr, self._record_device))
+        ordered_size = self._record_size[order]
+        same_pointer = (self._record_device[order][1:] == self._record_device[order][:-1]) & \
+                       (self._record_ptr[order][1:] == self._record_ptr[order][:-1])
+        next_pos = np.full(record_num, record_num, dtype=np.int64)
+        next_pos[:-1] = np.where(same_pointer, order[1:], record_num)
+        is_first = np.ones(record_num, dtype=bool)
+        is_first[1:] = ~same_pointer
+        is_alloc = ordered_size > 0
+        is_early_free = (ordered_size < 0) & is_first
+        self._alloc_pos = np.concatenate((order[is_alloc],
+                                          np.full(np.count_nonzero(is_early_free), self.INVALID_INDEX,
+                                                  dtype=np.int64)))
+        self._free_pos = np.concatenate((next_pos[is_alloc], order[is_early_free]))
+        self._block_size = np.abs(np.concatenate((ordered_size[is_alloc], ordered_size[is_early_free])))
+        self._block_device = self._record_device[np.concatenate((order[is_alloc], order[is_early_free]))]
+        self._alloc_order = np.argsort(self._alloc_pos, kind="stable")
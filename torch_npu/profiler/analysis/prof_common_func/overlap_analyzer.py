@@ -0,0 +1,185 @@
+from array import array
+
+import numpy as np
+
+from ..prof_common_func.constant import Constant
+
+
+class OverlapAnalyzer:
+    """
+    exact compute and communication overlap of the device task intervals of the timeline.
+    the intervals of every category are merged into sorted disjoint unions once, after that the time a union
+    covers inside any range is two binary searches on its cumulative length
+    """
+    COMPUTE_PROCESS_NAMES = ("Ascend Hardware",)
+    COMM_PROCESS_NAMES = ("HCCL", "Communication")
+    COMM_TASK_TYPE = "HCCL"
+    COMM_NAME_PREFIX = "hcom_"
+    TOTAL = "Total"
+
+    def __init__(self):
+        self._process_names = {}
+        # pids whose process name is known and is not a device task process, their events are not kept
+        self._ignored_pids = set()
+        # (pid, tid) -> start array, end array and is comm array
+        self._interval_dict = {}
+
+    def add_event(self, data: dict) -> None:
+        """
+        the events are buffered per stream in compact arrays until the process name of their pid is known,
+        the buffers of a pid are dropped as soon as it is known not to be a device task process
+        """
+        pid = data.get("pid")
+        if data.get("ph") == "M" and data.get("name") == Constant.PROCESS_NAME:
+            process_name = data.get("args", {}).get("name", "")
+            self._process_names[pid] = process_name
+            if not self._is_device_process(process_name):
+                self._ignored_pids.add(pid)
+                for stream in [stream for stream in self._interval_dict if stream[0] == pid]:
+                    del self._interval_dict[stream]
+            return
+        if data.get("ph") != "X" or pid in self._ignored_pids:
+            return
+        try:
+            start = float(data.get("ts", 0))
+            end = start + float(data.get("dur", 0))
+        except (TypeError, ValueError):
+            return
+        name = str(data.get("name", ""))
+        args = data.get("args", {})
+        is_comm = name.lower().startswith(self.COMM_NAME_PREFIX) or \
+            (isinstance(args, dict) and args.get("Task Type") == self.COMM_TASK_TYPE)
+        intervals = self._interval_dict.get((pid, data.get("tid")))
+        if intervals is None:
+            intervals = (array("d"), array("d"), array("b"))
+            self._interval_dict[(pid, data.get("tid"))] = intervals
+        intervals[0].append(start)
+        intervals[1].append(end)
+        intervals[2].append(is_comm)
+
+    def has_data(self) -> bool:
+        return bool(self._get_stream_intervals())
+
+    def get_step_overlap(self, step_range: list) -> list:
+        """
+        Returns: rows of step id, process id, process name, stream, computing, communication, overlapped,
+        communication not overlapped and free time, the stream rows of every step follow its total row
+        """
+        stream_intervals = self._get_stream_intervals()
+        if not stream_intervals:
+            return []
+        compute_unions, comm_unions = {}, {}
+        for stream, (starts, ends, is_comm) in stream_intervals.items():
+            compute_unions[stream] = self._merge_intervals(starts[~is_comm], ends[~is_comm])
+            comm_unions[stream] = self._merge_intervals(starts[is_comm], ends[is_comm])
+        all_starts = np.concatenate([intervals[0] for intervals in stream_intervals.values()])
+        all_ends = np.concatenate([intervals[1] for intervals in stream_intervals.values()])
+        all_is_comm = np.concatenate([intervals[2] for intervals in stream_intervals.values()])
+        compute_union = self._merge_intervals(all_starts[~all_is_comm], all_ends[~all_is_comm])
+        comm_union = self._merge_intervals(all_starts[all_is_comm], all_ends[all_is_comm])
+        if not step_range:
+            step_range = [[None, float(np.min(all_starts)), float(np.max(all_ends))]]
+        range_starts = np.array([step[1] for step in step_range], dtype=np.float64)
+        range_ends = np.array([step[2] for step in step_range], dtype=np.float64)
+        # steps without device tasks have an empty range
+        is_valid_range = range_starts < range_ends
+        range_starts = np.where(is_valid_range, range_starts, 0)
+        range_ends = np.where(is_valid_range, range_ends, 0)
+        step_dur = range_ends - range_starts
+
+        total_rows = self._get_overlap_rows(compute_union, comm_union, compute_union, comm_union, range_starts,
+                                            range_ends, step_dur)
+        stream_rows_list = [self._get_overlap_rows(compute_unions[stream], comm_unions[stream], compute_union,
+                                                   comm_union, range_starts, range_ends, step_dur)
+                            for stream in stream_intervals]
+        overlap_rows = []
+        for index, step in enumerate(step_range):
+            overlap_rows.append([step[0], "", self.TOTAL, ""] + total_rows[index])
+            for (pid, tid), stream_rows in zip(stream_intervals, stream_rows_list):
+                overlap_rows.append([step[0], pid, self._process_names.get(pid, ""), tid] + stream_rows[index])
+        return overlap_rows
+
+    def _get_overlap_rows(self, compute: tuple, comm: tuple, all_compute: tuple, all_comm: tuple,
+                          range_starts: np.ndarray, range_ends: np.ndarray, step_dur: np.ndarray) -> list:
+        compute_time = self._get_range_time(compute, range_starts, range_ends)
+        comm_time = self._get_range_time(comm, range_starts, range_ends)
+        overlapped_time = self._get_range_intersection_time(compute, all_comm, range_starts, range_ends)
+        exposed_comm_time = comm_time - self._get_range_intersection_time(comm, all_compute, range_starts, range_ends)
+        busy_time = compute_time + comm_time - self._get_range_intersection_time(compute, comm, range_starts,
+                                                                                 range_ends)
+        free_time = np.maximum(step_dur - busy_time, 0)
+        return np.stack((compute_time, comm_time, overlapped_time, exposed_comm_time, free_time), axis=1).tolist()
+
+    def _get_stream_intervals(self) -> dict:
+        """
+        Returns: (pid, tid) -> start, end and is comm arrays of the device task streams
+        """
+        stream_intervals = {}
+        for (pid, tid), intervals in self._interval_dict.items():
+            process_name = self._process_names.get(pid, "")
+            if not self._is_device_process(process_name):
+                continue
+            is_comm = np.frombuffer(intervals[2], dtype=np.int8).astype(bool)
+            if process_name in self.COMM_PROCESS_NAMES:
+                is_comm[:] = True
+            stream_intervals[(pid, tid)] = (np.frombuffer(intervals[0], dtype=np.float64),
+                                            np.frombuffer(intervals[1], dtype=np.float64), is_comm)
+        return stream_intervals
+
+    @classmethod
+    def _is_device_process(cls, process_name: str) -> bool:
+        return process_name in cls.COMPUTE_PROCESS_NAMES or process_name in cls.COMM_PROCESS_NAMES
+
+    @classmethod
+    def _merge_intervals(cls, starts: np.ndarray, ends: np.ndarray) -> tuple:
+        """
+        Returns: starts, ends and cumulative lengths of the sorted disjoint union of the intervals
+        """
+        if not len(starts):
+            return np.empty(0), np.empty(0), np.zeros(1)
+        order = np.argsort(starts, kind="stable")
+        starts, ends = starts[order], ends[order]
+        max_ends = np.maximum.accumulate(ends)
+        is_new = np.ones(len(starts), dtype=bool)
+        is_new[1:] = starts[1:] > max_ends[:-1]
+        group_index = np.flatnonzero(is_new)
+        union_starts = starts[group_index]
+        union_ends = np.maximum.reduceat(ends, group_index)
+        return union_starts, union_ends, np.concatenate(([0], np.cumsum(union_ends - union_starts)))
+
+    @classmethod
+    def _get_covered_time(cls, union: tuple, ts: np.ndarray) -> np.ndarray:
+        """
+        Returns: time covered by the union before every ts
+        """
+        union_starts, union_ends, cum_lengths = union
+        if not len(union_starts):
+            return np.zeros(len(ts))
+        count = np.searchsorted(union_starts, ts, side="right")
+        last = np.maximum(count - 1, 0)
+        partial = np.clip(ts - union_starts[last], 0, union_ends[last] - union_starts[last])
+        return np.where(count > 0, cum_lengths[last] + partial, 0)
+
+    @classmethod
+    def _get_range_time(cls, union: tuple, range_starts: np.ndarray, range_ends: np.ndarray) -> np.ndarray:
+        return np.maximum(cls._get_covered_time(union, range_ends) - cls._get_covered_time(union, range_starts), 0)
+
+    @classmethod
+    def _get_range_intersection_time(cls, union_a: tuple, union_b: tuple, range_starts: np.ndarray,
+                                     range_ends: np.ndarray) -> np.ndarray:
+        """
+        Returns: time covered by both unions inside every range
+        """
+        a_starts, a_ends, _ = union_a
+        result = np.zeros(len(range_starts))
+        for index, (range_start, range_end) in enumerate(zip(range_starts.tolist(), range_ends.tolist())):
+            if not range_start < range_end:
+                continue
+            first = np.searchsorted(a_ends, range_start, side="right")
+            last = np.searchsorted(a_starts, range_end, side="left")
+            if first >= last:
+                continue
+            clip_starts = np.maximum(a_starts[first:last], range_start)
+            clip_ends = np.minimum(a_ends[first:last], range_end)
+            result[index] = np.sum(cls._get_range_time(union_b, clip_starts, clip_ends))
+        return result
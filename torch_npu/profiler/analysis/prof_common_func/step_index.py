@@ -0,0 +1,47 @@
+import numpy as np
+
+
+class StepIndex:
+    """
+    step lookup over the [start, end] ranges of GlobalVar.step_range. a timestamp belongs to the
+    earliest-starting step which contains it, whole timestamp columns are assigned with one searchsorted
+    """
+    INVALID_INDEX = -1
+
+    def __init__(self, step_range: list):
+        self._step_ids = [step[0] for step in step_range]
+        starts = np.array([step[1] for step in step_range], dtype=np.float64)
+        ends = np.array([step[2] for step in step_range], dtype=np.float64)
+        self._order = np.argsort(starts, kind="stable")
+        self._sorted_starts = starts[self._order]
+        # the running max of the ends is non-decreasing, so the first step reaching a timestamp is a binary search
+        self._max_ends = np.maximum.accumulate(ends[self._order]) if len(ends) else ends
+
+    def __len__(self):
+        return len(self._step_ids)
+
+    @property
+    def step_ids(self) -> list:
+        return self._step_ids
+
+    def find_step_index(self, ts: any, closed: bool = True) -> np.ndarray:
+        """
+        Returns: index into the step range of the step containing every ts, INVALID_INDEX if there is none.
+        the step ranges are open intervals when closed is not set
+        """
+        ts_array = np.asarray(ts, dtype=np.float64).reshape(-1)
+        if not len(self._step_ids):
+            return np.full(len(ts_array), self.INVALID_INDEX, dtype=np.int64)
+        candidate = np.searchsorted(self._max_ends, ts_array, side="left" if closed else "right")
+        safe_candidate = np.minimum(candidate, len(self._step_ids) - 1)
+        candidate_starts = self._sorted_starts[safe_candidate]
+        is_contained = candidate_starts <= ts_array if closed else candidate_starts < ts_array
+        is_contained &= candidate < len(self._step_ids)
+        return np.where(is_contained, self._order[safe_candidate], self.INVALID_INDEX)
+
+    def find_step_id(self, ts: any, closed: bool = True) -> list:
+        """
+        Returns: id of the step containing every ts, None if there is none
+        """
+        return [self._step_ids[index] if index != self.INVALID_INDEX else None
+                for index in self.find_step_index(ts, closed).tolist()]
@@ -0,0 +1,180 @@
+import numpy as np
+
+from ..prof_bean.event_bean import EventBean
+from ..prof_bean.torch_op_bean import TorchOpBean
+from ..prof_bean.torch_op_node import TorchOpNode
+from ..prof_common_func.column_table import ColumnTable
+from ..prof_common_func.constant import Constant
+
+
+class TorchOpTree:
+    """
+    torch op call tree kept in parallel numpy arrays, node i is row i of the torch op table and
+    the nodes are stored in breadth-first order, so the children of a node are contiguous
+    """
+    INVALID_INDEX = -1
+    TABLE_PREFIX = "table_"
+    DEVICE_SELF = 0
+    DEVICE_SELF_WITH_AI_CORE = 1
+    DEVICE_TOTAL = 2
+    DEVICE_TOTAL_WITH_AI_CORE = 3
+
+    def __init__(self, torch_op_table: ColumnTable = None, start: np.ndarray = None, dur: np.ndarray = None,
+                 parent: np.ndarray = None):
+        node_num = len(torch_op_table) if torch_op_table is not None else 0
+        self._torch_op_table = torch_op_table
+        self._start = start if start is not None else np.empty(0)
+        self._host_total_dur = dur if dur is not None else np.empty(0)
+        self._end = self._start + self._host_total_dur
+        self._parent = parent if parent is not None else np.empty(0, dtype=np.int64)
+        self._device_dur = np.zeros((4, node_num))
+        self._device_start = np.full(node_num, np.inf)
+        self._device_end = np.full(node_num, -np.inf)
+        self._kernel_dict = {}
+        self._init_links()
+
+    def __len__(self):
+        return len(self._parent)
+
+    @classmethod
+    def from_cache_data(cls, arrays: dict, meta: dict) -> any:
+        table_arrays = {name[len(cls.TABLE_PREFIX):]: value for name, value in arrays.items()
+                        if name.startswith(cls.TABLE_PREFIX)}
+        if not table_arrays:
+            return cls()
+        torch_op_table = ColumnTable.from_cache_data(TorchOpBean, table_arrays, meta.get("table"))
+        torch_op_tree = cls(torch_op_table, arrays["start"], arrays["host_total_dur"], arrays["parent"])
+        torch_op_tree._device_dur = arrays["device_dur"]
+        torch_op_tree._device_start = arrays["device_start"]
+        torch_op_tree._device_end = arrays["device_end"]
+        torch_op_tree._kernel_dict = {node_index: [EventBean(data) for data in kernel_data_list]
+                                      for node_index, kernel_data_list in meta.get("kernel_list")}
+        return torch_op_tree
+
+    def __iter__(self):
+        for index in range(len(self._parent)):
+            yield TorchOpNode(self, index)
+
+    def __getitem__(self, index: int) -> TorchOpNode:
+        return TorchOpNode(self, index)
+
+    @property
+    def start(self) -> np.ndarray:
+        return self._start
+
+    @property
+    def end(self) -> np.ndarray:
+        return self._end
+
+    @property
+    def parent(self) -> np.ndarray:
+        return self._parent
+
+    @property
+    def first_child(self) -> np.ndarray:
+        return self._first_child
+
+    @property
+    def next_sibling(self) -> np.ndarray:
+        return self._next_sibling
+
+    @property
+    def host_self_dur(self) -> np.ndarray:
+        return self._host_self_dur
+
+    @property
+    def host_total_dur(self) -> np.ndarray:
+        return self._host_total_dur
+
+    @property
+    def device_dur(self) -> np.ndarray:
+        return self._device_dur
+
+    @property
+    def device_start(self) -> np.ndarray:
+        return self._device_start
+
+    @property
+    def device_end(self) -> np.ndarray:
+        return self._device_end
+
+    @property
+    def torch_op_table(self) -> ColumnTable:
+        return self._torch_op_table
+
+    def get_event(self, index: int) -> any:
+        return self._torch_op_table[index]
+
+    def get_name(self, index: int) -> str:
+        return self._torch_op_table.get_string(int(self._name_ids[index]))
+
+    def get_kernel_list(self, index: int) -> list:
+        return self._kernel_dict.get(index, [])
+
+    def get_child_index_list(self, index: int) -> range:
+        first_child = int(self._first_child[index])
+        if first_child == self.INVALID_INDEX:
+            return range(0)
+        return range(first_child, first_child + int(self._child_num[index]))
+
+    def get_top_level_nodes(self) -> list:
+        return [TorchOpNode(self, index) for index in range(self._top_level_num)]
+
+    def to_cache_data(self) -> tuple:
+        """
+        Returns: arrays of the nodes and of the torch op table, and the strings and kernels as metadata
+        """
+        if self._torch_op_table is None:
+            return {}, {}
+        arrays = {"start": self._start, "host_total_dur": self._host_total_dur, "parent": self._parent,
+                  "device_dur": self._device_dur, "device_start": self._device_start, "device_end": self._device_end}
+        table_arrays, table_meta = self._torch_op_table.to_cache_data()
+        arrays.update({f"{self.TABLE_PREFIX}{name}": value for name, value in table_arrays.items()})
+        kernel_list = [[int(node_index), [kernel.origin_data for kernel in kernels]]
+                       for node_index, kernels in self._kernel_dict.items()]
+        return arrays, {"table": table_meta, "kernel_list": kernel_list}
+
+    def update_device_info(self, node_info_list: list, total_node_list: list, total_info_index_list: list,
+                           self_node_list: list, self_info_index_list: list):
+        """
+        accumulate the kernels of node_info_list[total_info_index_list[i]] into the totals of
+        total_node_list[i], and likewise the self durations and kernel lists of self_node_list
+        """
+        device_dur = np.array([node_info.device_dur for node_info in node_info_list], dtype=np.float64)
+        device_dur_with_ai_core = np.array([node_info.device_dur_with_ai_core for node_info in node_info_list],
+                                           dtype=np.float64)
+        min_start = np.array([node_info.min_start for node_info in node_info_list], dtype=np.float64)
+        max_end = np.array([node_info.max_end for node_info in node_info_list], dtype=np.float64)
+        total_node_array = np.array(total_node_list, dtype=np.int64)
+        total_info_index_array = np.array(total_info_index_list, dtype=np.int64)
+        self_node_array = np.array(self_node_list, dtype=np.int64)
+        self_info_index_array = np.array(self_info_index_list, dtype=np.int64)
+        np.add.at(self._device_dur[self.DEVICE_TOTAL], total_node_array, device_dur[total_info_index_array])
+        np.add.at(self._device_dur[self.DEVICE_TOTAL_WITH_AI_CORE], total_node_array,
+                  device_dur_with_ai_core[total_info_index_array])
+        np.minimum.at(self._device_start, total_node_array, min_start[total_info_index_array])
+        np.maximum.at(self._device_end, total_node_array, max_end[total_info_index_array])
+        np.add.at(self._device_dur[self.DEVICE_SELF], self_node_array, device_dur[self_info_index_array])
+        np.add.at(self._device_dur[self.DEVICE_SELF_WITH_AI_CORE], self_node_array,
+                  device_dur_with_ai_core[self_info_index_array])
+        for node_index, info_index in zip(self_node_list, self_info_index_list):
+            self._kernel_dict[node_index] = node_info_list[info_index].kernel_list
+
+    def _init_links(self):
+        node_num = len(self._parent)
+        has_parent = self._parent != self.INVALID_INDEX
+        self._top_level_num = int(np.count_nonzero(~has_parent))
+        self._child_num = np.bincount(self._parent[has_parent], minlength=node_num)
+        self._first_child = np.full(node_num, self.INVALID_INDEX, dtype=np.int64)
+        parent_list, first_index = np.unique(self._parent[has_parent], return_index=True)
+        self._first_child[parent_list] = first_index + self._top_level_num
+        self._next_sibling = np.full(node_num, self.INVALID_INDEX, dtype=np.int64)
+        if node_num > 1:
+            same_parent = self._parent[1:] == self._parent[:-1]
+            self._next_sibling[:-1][same_parent] = np.arange(1, node_num)[same_parent]
+        self._host_self_dur = self._host_total_dur - np.bincount(
+            self._parent[has_parent], weights=self._host_total_dur[has_parent], minlength=node_num)
+        if self._torch_op_table is not None:
+            self._name_ids = self._torch_op_table.tlv_column(Constant.OP_NAME)
+        else:
+            self._name_ids = np.empty(0, dtype=np.int32)
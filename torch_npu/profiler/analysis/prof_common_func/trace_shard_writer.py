@@ -0,0 +1,148 @@
+import gzip
+import json
+import os
+from collections import Counter
+from itertools import islice
+
+import numpy as np
+
+from ....utils.path_manager import PathManager
+from ..prof_common_func.constant import Constant
+
+
+class TraceShard:
+    """
+    buffered events and summary of one shard of the trace
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.buffer = []
+        self.is_created = False
+        self.event_count = 0
+        self.start_time = np.inf
+        self.end_time = -np.inf
+        self.phase_count = Counter()
+        # name -> [count, total duration] of the complete events
+        self.op_stats = {}
+
+
+class TraceShardWriter:
+    """
+    stream trace events into one json array file per shard in a single pass. the shard of an event is given by
+    its ts, the events without ts such as the metadata are written to every shard so that each file opens on its
+    own. the events of a shard are buffered and appended to its file chunk by chunk, and all the buffers are
+    flushed once they hold buffer_size events, so the memory stays bounded whatever the shard number.
+    with gzip every appended chunk is an independent gzip member
+    """
+    TOP_OP_NUM = 10
+
+    def __init__(self, output_dir: str, use_gzip: bool = False, chunk_size: int = Constant.JSON_WRITE_CHUNK_SIZE,
+                 buffer_size: int = Constant.TRACE_SHARD_BUFFER_SIZE):
+        self._output_dir = output_dir
+        self._use_gzip = use_gzip
+        self._chunk_size = chunk_size
+        self._buffer_size = buffer_size
+        self._buffer_num = 0
+        self._shards = {}
+        self._common_data = []
+
+    def write(self, data_iter: any, get_shard_keys: any, get_file_name: any) -> None:
+        """
+        get_shard_keys maps a ts array to an int64 shard key array, get_file_name maps a shard key to its file name
+        """
+        data_iter = iter(data_iter)
+        chunk = list(islice(data_iter, self._chunk_size))
+        while chunk:
+            self._write_chunk(chunk, get_shard_keys, get_file_name)
+            if self._buffer_num >= self._buffer_size:
+                for shard in self._shards.values():
+                    self._flush(shard)
+                self._buffer_num = 0
+            chunk = list(islice(data_iter, self._chunk_size))
+
+    def close(self) -> dict:
+        """
+        Returns: summary of every shard by shard key, with its time range, event counts and longest ops
+        """
+        summary = {}
+        common_phase_count = Counter(data.get("ph") for data in self._common_data)
+        for key, shard in self._shards.items():
+            shard.buffer.extend(self._common_data)
+            self._flush(shard)
+            self._append(shard, "]")
+            top_ops = sorted(shard.op_stats.items(), key=lambda item: -item[1][1])[:self.TOP_OP_NUM]
+            summary[key] = {"file": os.path.basename(shard.file_path),
+                            "start_time(us)": float(shard.start_time),
+                            "end_time(us)": float(shard.end_time),
+                            "event_count": shard.event_count + len(self._common_data),
+                            "phase_count": dict(shard.phase_count + common_phase_count),
+                            "top_ops": [{"name": name, "count": count, "total_duration(us)": dur}
+                                        for name, (count, dur) in top_ops]}
+        self._shards = {}
+        self._buffer_num = 0
+        return summary
+
+    def _write_chunk(self, chunk: list, get_shard_keys: any, get_file_name: any) -> None:
+        timed_data, ts_list = [], []
+        for data in chunk:
+            ts = data.get("ts") if data.get("ph") != "M" else None
+            if ts is None:
+                self._common_data.append(data)
+                continue
+            timed_data.append(data)
+            ts_list.append(ts)
+        if not timed_data:
+            return
+        ts_array = np.asarray(ts_list, dtype=np.float64)
+        dur_array = np.asarray([data.get("dur", 0) for data in timed_data], dtype=np.float64)
+        keys = np.asarray(get_shard_keys(ts_array), dtype=np.int64)
+        # group the events of the chunk by shard, keeping their order within every shard
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        group_start = np.flatnonzero(np.diff(sorted_keys, prepend=sorted_keys[0] - 1))
+        group_end = np.append(group_start[1:], len(order))
+        for start, end in zip(group_start.tolist(), group_end.tolist()):
+            key = int(sorted_keys[start])
+            shard = self._shards.get(key)
+            if shard is None:
+                shard = TraceShard(os.path.join(self._output_dir, get_file_name(key) +
+                                                (Constant.GZIP_SUFFIX if self._use_gzip else "")))
+                self._shards[key] = shard
+            index = order[start:end]
+            shard.start_time = min(shard.start_time, float(np.min(ts_array[index])))
+            shard.end_time = max(shard.end_time, float(np.max(ts_array[index] + dur_array[index])))
+            for position in index.tolist():
+                data = timed_data[position]
+                shard.buffer.append(data)
+                shard.phase_count[data.get("ph")] += 1
+                if data.get("ph") == "X":
+                    op_stat = shard.op_stats.setdefault(data.get("name", ""), [0, 0.0])
+                    op_stat[0] += 1
+                    op_stat[1] += float(dur_array[position])
+            shard.event_count += end - start
+            self._buffer_num += end - start
+            if len(shard.buffer) >= self._chunk_size:
+                self._buffer_num -= len(shard.buffer)
+                self._flush(shard)
+
+    def _flush(self, shard: TraceShard) -> None:
+        if not shard.buffer:
+            return
+        text = ("," if shard.is_created else "[") + ",".join(json.dumps(data) for data in shard.buffer)
+        shard.buffer = []
+        self._append(shard, text)
+
+    def _append(self, shard: TraceShard, text: str) -> None:
+        if not shard.is_created:
+            PathManager.make_dir_safety(self._output_dir)
+            PathManager.create_file_safety(shard.file_path)
+            PathManager.check_directory_path_writeable(shard.file_path)
+        mode = ("a" if shard.is_created else "w") + ("b" if self._use_gzip else "")
+        try:
+            with open(shard.file_path, mode) as file:
+                file.write(gzip.compress(text.encode("utf-8"), Constant.GZIP_COMPRESS_LEVEL)
+                           if self._use_gzip else text)
+        except Exception as err:
+            raise RuntimeError(f"Can't create file: {shard.file_path}") from err
+        shard.is_created = True
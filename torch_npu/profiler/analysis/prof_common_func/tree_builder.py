@@ -1,52 +1,70 @@
-from queue import Queue
+import numpy as np
 
-from ..prof_bean.node_info_bean import NodeInfoBean
-from ..prof_bean.torch_op_node import TorchOpNode
+from ..profiler_config import ProfilerConfig
+from ..prof_common_func.column_table import ColumnTable
+from ..prof_common_func.constant import Constant
+from ..prof_common_func.interval_index import IntervalIndex
+from ..prof_common_func.torch_op_tree import TorchOpTree
 
 
 class TreeBuilder:
     @classmethod
-    def build_tree(cls, event_list: list) -> TorchOpNode:
-        root_node = TorchOpNode(all_node_num=len(event_list))
-        event_list.sort(key=lambda x: x.ts)
-        last_node = root_node
-        for event in event_list:
-            while last_node:
-                if last_node == root_node or event.ts < last_node.end_time:
-                    tree_node = TorchOpNode(event, last_node)
-                    last_node.add_child_node(tree_node)
-                    last_node = tree_node
-                    break
-                last_node = last_node.parent_node
-        return root_node
+    def build_tree(cls, torch_op_table: ColumnTable) -> TorchOpTree:
+        start_ns = torch_op_table.column("start_ns")
+        start = ProfilerConfig().get_local_time(start_ns / Constant.NS_TO_US)
+        dur = (torch_op_table.column("end_ns") - start_ns) / Constant.NS_TO_US
+        sorted_index = np.argsort(start, kind="stable")
+        start_list = start[sorted_index].tolist()
+        end_list = (start[sorted_index] + dur[sorted_index]).tolist()
+        parent_list = [TorchOpTree.INVALID_INDEX] * len(start_list)
+        depth_list = [0] * len(start_list)
+        node_stack = []
+        for index, start_time in enumerate(start_list):
+            while node_stack and start_time >= end_list[node_stack[-1]]:
+                node_stack.pop()
+            if node_stack:
+                parent_list[index] = node_stack[-1]
+            depth_list[index] = len(node_stack)
+            node_stack.append(index)
 
-    @classmethod
-    def find_call_node(cls, enqueue_ts: float, node_info_bean: NodeInfoBean, root_node: TorchOpNode):
-        matched_child_node = root_node.match_child_node(enqueue_ts)
-        if not matched_child_node:
-            return
-        node_queue = Queue()
-        node_queue.put(matched_child_node)
-        while not node_queue.empty():
-            tree_node = node_queue.get()
-            tree_node.update_device_total(node_info_bean)
-            tree_node.update_device_range(node_info_bean)
-            matched_child_node = tree_node.match_child_node(enqueue_ts)
-            if matched_child_node:
-                node_queue.put(matched_child_node)
-            else:
-                tree_node.update_device_self(node_info_bean)
+        # a stable sort by depth turns the start order into the breadth-first order
+        bfs_order = np.argsort(np.array(depth_list, dtype=np.int64), kind="stable")
+        bfs_position = np.empty(len(bfs_order), dtype=np.int64)
+        bfs_position[bfs_order] = np.arange(len(bfs_order))
+        parent = np.array(parent_list, dtype=np.int64)[bfs_order]
+        parent = np.where(parent == TorchOpTree.INVALID_INDEX, TorchOpTree.INVALID_INDEX,
+                          bfs_position[np.maximum(parent, 0)])
+        event_index = sorted_index[bfs_order]
+        return TorchOpTree(torch_op_table.take(event_index), start[event_index], dur[event_index], parent)
 
     @classmethod
-    def go_through_tree(cls, root_node: TorchOpNode) -> list:
-        result_list = [None] * root_node.all_node_num
-        node_queue = Queue()
-        for child_node in root_node.child_node_list:
-            node_queue.put(child_node)
-        index = 0
-        while not node_queue.empty():
-            result_list[index] = node_queue.get()
-            for child_node in result_list[index].child_node_list:
-                node_queue.put(child_node)
-            index += 1
-        return result_list
+    def find_call_nodes(cls, enqueue_ts_list: list, node_info_list: list, torch_op_tree: TorchOpTree):
+        """
+        attach each node info to the deepest node on the path of nodes enclosing its enqueue ts
+        """
+        if not len(torch_op_tree) or not enqueue_ts_list:
+            return
+        interval_index = IntervalIndex(torch_op_tree.start, torch_op_tree.end)
+        innermost_list = interval_index.find_innermost(np.array(enqueue_ts_list, dtype=np.float64)).tolist()
+        start_list, end_list = torch_op_tree.start.tolist(), torch_op_tree.end.tolist()
+        parent_list = torch_op_tree.parent.tolist()
+        total_node_list, total_info_index_list, self_node_list, self_info_index_list = [], [], [], []
+        for info_index, (enqueue_ts, node_index) in enumerate(zip(enqueue_ts_list, innermost_list)):
+            call_path = []
+            while node_index != TorchOpTree.INVALID_INDEX:
+                call_path.append(node_index)
+                node_index = parent_list[node_index]
+            # children may outlive their parent, so the descent from the root stops at the first node
+            # which does not enclose the enqueue ts
+            matched_node = TorchOpTree.INVALID_INDEX
+            for node_index in reversed(call_path):
+                if not start_list[node_index] <= enqueue_ts < end_list[node_index]:
+                    break
+                total_node_list.append(node_index)
+                total_info_index_list.append(info_index)
+                matched_node = node_index
+            if matched_node != TorchOpTree.INVALID_INDEX:
+                self_node_list.append(matched_node)
+                self_info_index_list.append(info_index)
+        torch_op_tree.update_device_info(node_info_list, total_node_list, total_info_index_list,
+                                         self_node_list, self_info_index_list)
@@ -1,15 +1,23 @@
 from ..prof_common_func.constant import Constant
 from ..prof_view.kernel_view_parser import KernelViewParser
 from ..prof_view.operator_view_parser import OperatorViewParser
+from ..prof_view.operator_statistic_parser import OperatorStatisticParser
 from ..prof_view.trace_view_parser import TraceViewParser
 from ..prof_view.memory_view_parser import MemoryViewParser
+from ..prof_view.memory_peak_view_parser import MemoryPeakViewParser
+from ..prof_view.memory_leak_view_parser import MemoryLeakViewParser
 from ..prof_view.integrate_parser import IntegrateParser
 from ..prof_view.communication_parser import CommunicationParser
+from ..prof_view.flame_graph_view_parser import FlameGraphViewParser
+from ..prof_view.flops_view_parser import FlopsViewParser
+from ..prof_view.module_view_parser import ModuleViewParser
 
 
 class ViewParserConfig(object):
     CONFIG_DICT = {
         Constant.TENSORBOARD_TRACE_HANDLER: [OperatorViewParser, TraceViewParser, KernelViewParser,
-                                             MemoryViewParser, IntegrateParser, CommunicationParser],
+                                             MemoryViewParser, IntegrateParser, CommunicationParser,
+                                             FlameGraphViewParser, ModuleViewParser, FlopsViewParser,
+                                             OperatorStatisticParser, MemoryPeakViewParser, MemoryLeakViewParser],
         Constant.EXPORT_CHROME_TRACE: [TraceViewParser]
     }
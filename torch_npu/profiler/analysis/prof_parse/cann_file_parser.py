@@ -4,13 +4,16 @@ import os
 import re
 import subprocess
 import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from enum import Enum
 from json import JSONDecodeError
 
 from ....utils.path_manager import PathManager
 from ..prof_bean.event_bean import EventBean
-from ..prof_common_func.constant import Constant, print_warn_msg
+from ..prof_common_func.cache_manager import CacheManager
+from ..prof_common_func.constant import Constant, print_info_msg, print_warn_msg
 from ..prof_common_func.file_manager import FileManager
+from ..prof_common_func.json_array_reader import JsonArrayReader
 from ..prof_common_func.path_manager import ProfilerPathManager
 from ..prof_bean.step_trace_bean import StepTraceBean
 
@@ -36,6 +39,7 @@ class CANNFileParser:
     SUMMARY = "summary"
     TIMELINE = "timeline"
     ANALYZE = "analyze"
+    CANN_EXPORT = "cann_export"
     CANN_DATA_MATCH = {
         CANNDataEnum.OP_SUMMARY: [r"^op_summary_\d+_\d+\.csv", r"^op_summary_\d+_\d+_\d+\.csv",
                                   r"^op_summary_\d+_\d+_\d+_\d+\.csv"],
@@ -61,27 +65,17 @@ class CANNFileParser:
         CANNDataEnum.COMMUNICATION: [r"^communication\.json"],
         CANNDataEnum.MATRIX: [r"^communication_matrix\.json"]
     }
+    # flow joins shared by the whole analysis, keyed by cann path, forked view parser processes
+    # inherit them from the parent. the timeline itself is streamed from disk on every pass
+    _acl_to_npu_cache = {}
 
     def __init__(self, profiler_path: str):
+        self._profiler_path = profiler_path
         self._cann_path = ProfilerPathManager.get_cann_path(profiler_path)
         self._file_dict = {}
         self._file_dispatch()
         self.msprof_path = shutil.which("msprof")
 
-    @classmethod
-    def _json_load(cls, data: str) -> list:
-        if not data:
-            return []
-        try:
-            data = json.loads(data)
-        except JSONDecodeError as e:
-            raise RuntimeError("Invalid CANN trace data.") from e
-        if not isinstance(data, list):
-            return []
-        if data and not isinstance(data[0], dict):
-            return []
-        return data
-
     @classmethod
     def _json_dict_load(cls, data: str) -> dict:
         if not data:
@@ -102,7 +96,14 @@ class CANNFileParser:
     def export_cann_profiling(self, data_simplification: bool):
         if not os.path.isdir(self._cann_path):
             return
+        cache_manager = CacheManager(self._profiler_path)
+        cache_key = cache_manager.get_key(self.CANN_EXPORT, self.get_prof_data_file_list(), data_simplification)
+        if cache_manager.load(self.CANN_EXPORT, cache_key)[0] and \
+                self._file_dict.get(CANNDataEnum.MSPROF_TIMELINE):
+            print_info_msg("CANN profiling data has not changed since the last export, skip exporting.")
+            return
         self._del_summary_and_timeline_data()
+        self.clear_cache()
         completed_process = subprocess.run([self.msprof_path, "--export=on", f"--output={self._cann_path}"],
                                            capture_output=True, shell=False)
         if completed_process.returncode != self.COMMAND_SUCCESS:
@@ -112,20 +113,7 @@ class CANNFileParser:
                 f"msprof --export=on --output={self._cann_path}")
 
         self._file_dispatch()
-        step_trace_file_set = self.get_file_list_by_type(CANNDataEnum.STEP_TRACE)
-        if step_trace_file_set:
-            step_file = step_trace_file_set.pop()
-            step_trace_data = FileManager.read_csv_file(step_file, StepTraceBean)
-            parsed_step = os.path.basename(step_file).split(".")[0].split("_")[-1]
-            for data in step_trace_data:
-                step_id = data.step_id
-                if step_id != Constant.INVALID_VALUE and step_id != parsed_step:
-                    completed_process = subprocess.run(
-                        [self.msprof_path, "--export=on", f"--output={self._cann_path}", f"--iteration-id={step_id}"],
-                        capture_output=True, shell=False)
-                    if completed_process.returncode != self.COMMAND_SUCCESS:
-                        raise RuntimeError("Export CANN Profiling data failed, please verify that the "
-                                           "ascend-toolkit is installed and set-env.sh is sourced.")
+        self._export_iterations(self._get_unexported_step_ids())
 
         simplification_cmd = self._get_data_simplification_cmd(data_simplification)
         completed_analysis = subprocess.run(
@@ -133,14 +121,32 @@ class CANNFileParser:
             capture_output=True, shell=False)
         if completed_analysis.returncode != self.COMMAND_SUCCESS:
             print_warn_msg("Analyze CANN Profiling data failed.")
+        cache_manager.save(self.CANN_EXPORT, cache_key, {}, True)
+
+    @classmethod
+    def clear_cache(cls):
+        cls._acl_to_npu_cache.clear()
+
+    @classmethod
+    def _get_ts_key(cls, ts: any) -> any:
+        """
+        Returns: integer ns of a timeline ts in us, so that 10, 10.0 and "10.000" are the same key
+        """
+        try:
+            return round(float(ts) * Constant.NS_TO_US)
+        except (TypeError, ValueError):
+            return None
 
     def get_timeline_all_data(self) -> list:
-        timeline_data = []
+        return list(self.iter_timeline_data())
+
+    def iter_timeline_data(self) -> iter:
+        """
+        stream the timeline batch by batch on every call, so the memory depends on the batch size only
+        """
         msprof_file_list = self._file_dict.get(CANNDataEnum.MSPROF_TIMELINE, set())
-        for msprof_file in msprof_file_list:
-            data = self._json_load(FileManager.file_read_all(msprof_file, "rt"))
-            timeline_data.extend(data)
-        return timeline_data
+        for batch in JsonArrayReader().iter_batches(msprof_file_list):
+            yield from (data for data in batch if isinstance(data, dict))
 
     def get_analyze_communication_data(self, file_type: Enum) -> dict:
         communication_data = {}
@@ -152,37 +158,79 @@ class CANNFileParser:
         return communication_data
 
     def get_acl_to_npu_data(self) -> dict:
+        acl_to_npu_dict = self._acl_to_npu_cache.get(self._cann_path)
+        if acl_to_npu_dict is None:
+            cache_manager = CacheManager(self._profiler_path)
+            cache_key = cache_manager.get_key(self.ACL_TO_NPU,
+                                              self.get_file_list_by_type(CANNDataEnum.MSPROF_TIMELINE))
+            # the float acl ts keys are not valid json keys, so the pairs are cached as a list
+            is_hit, _, acl_to_npu_list = cache_manager.load(self.ACL_TO_NPU, cache_key)
+            if is_hit:
+                acl_to_npu_dict = {acl_ts: [EventBean(data) for data in data_list]
+                                   for acl_ts, data_list in acl_to_npu_list}
+            else:
+                acl_to_npu_dict = self._get_acl_to_npu_data()
+                cache_manager.save(self.ACL_TO_NPU, cache_key, {},
+                                   [[acl_ts, [kernel.origin_data for kernel in kernel_list]]
+                                    for acl_ts, kernel_list in acl_to_npu_dict.items()])
+            self._acl_to_npu_cache[self._cann_path] = acl_to_npu_dict
+        return acl_to_npu_dict
+
+    def _get_acl_to_npu_data(self) -> dict:
+        """
+        join flow start -> flow end -> x event in two streaming passes over the timeline, the first one
+        collects the flows and the second one keeps only the x events at a flow end
+        """
         flow_start_dict, flow_end_dict = {}, {}
-        all_data = self.get_timeline_all_data()
-        for data in all_data:
-            event_bean = EventBean(data)
-            if event_bean.is_flow_start_event():
-                flow_start_dict[event_bean.id] = event_bean.ts
-            elif event_bean.is_flow_end_event():
-                flow_end_dict[event_bean.unique_id] = event_bean.id
+        for data in self.iter_timeline_data():
+            if data.get("cat") != EventBean.HOST_TO_DEVICE:
+                continue
+            ph = data.get("ph")
+            if ph == self.START_FLOW:
+                flow_start_dict[data.get("id")] = self._get_ts_key(data.get("ts", 0))
+            elif ph == self.END_FLOW:
+                flow_end_dict[(data.get("pid", ""), data.get("tid", 0), self._get_ts_key(data.get("ts", 0)))] = \
+                    data.get("id")
+        # (pid, tid, ts ns) of a flow end -> ts ns of the acl api at its flow start
+        end_to_acl_ts = {event_key: flow_start_dict.get(corr_id) for event_key, corr_id in flow_end_dict.items()
+                         if corr_id is not None and flow_start_dict.get(corr_id) is not None}
+        flow_start_dict.clear()
+        flow_end_dict.clear()
         acl_to_npu_dict = {}
-        for data in all_data:
-            event_bean = EventBean(data)
-            if event_bean.is_x_event():
-                corr_id = flow_end_dict.get(event_bean.unique_id)
-                acl_ts = flow_start_dict.get(corr_id)
-                if corr_id is not None and acl_ts is not None:
-                    acl_to_npu_dict.setdefault(acl_ts, []).append(event_bean)
-        return acl_to_npu_dict
+        if not end_to_acl_ts:
+            return acl_to_npu_dict
+        # the kernels launched by the same acl api keep their timeline order
+        for data in self.iter_timeline_data():
+            if data.get("ph") != "X":
+                continue
+            acl_ts = end_to_acl_ts.get((data.get("pid", ""), data.get("tid", 0),
+                                        self._get_ts_key(data.get("ts", 0))))
+            if acl_ts is not None:
+                acl_to_npu_dict.setdefault(acl_ts, []).append(EventBean(data))
+        # the acl ts are compared with the dequeue ts in us
+        return {acl_ts / Constant.NS_TO_US: kernel_list for acl_ts, kernel_list in acl_to_npu_dict.items()}
 
     def get_file_list_by_type(self, file_type: CANNDataEnum) -> set:
         return self._file_dict.get(file_type, set())
 
-    def check_prof_data_size(self):
+    def get_prof_data_file_list(self) -> list:
         if not self._cann_path:
-            return
+            return []
         device_data_path = os.path.join(ProfilerPathManager.get_device_path(self._cann_path), "data")
         host_data_path = os.path.join(self._cann_path, "host", "data")
-        prof_data_size = 0
-        for root, dirs, files in os.walk(device_data_path):
-            prof_data_size += sum([os.path.getsize(os.path.join(root, name)) for name in files])
-        for root, dirs, files in os.walk(host_data_path):
-            prof_data_size += sum([os.path.getsize(os.path.join(root, name)) for name in files])
+        prof_data_file_list = []
+        for data_path in (device_data_path, host_data_path):
+            for root, dirs, files in os.walk(data_path):
+                prof_data_file_list.extend([os.path.join(root, name) for name in files])
+        return prof_data_file_list
+
+    def get_prof_data_size(self) -> int:
+        return sum([os.path.getsize(file_path) for file_path in self.get_prof_data_file_list()])
+
+    def check_prof_data_size(self):
+        if not self._cann_path:
+            return
+        prof_data_size = self.get_prof_data_size()
         if prof_data_size >= Constant.PROF_WARN_SIZE:
             print_warn_msg("The parsing time is expected to exceed 30 minutes, "
                            "and you can choose to stop the process and use offline parsing.")
@@ -222,3 +270,54 @@ class CANNFileParser:
         timeline_path = os.path.join(device_path, "timeline")
         PathManager.remove_path_safety(summary_path)
         PathManager.remove_path_safety(timeline_path)
+
+    def _get_unexported_step_ids(self) -> list:
+        """
+        Returns: distinct step ids of the step trace except the one the first export is named after
+        """
+        step_trace_file_set = self.get_file_list_by_type(CANNDataEnum.STEP_TRACE)
+        if not step_trace_file_set:
+            return []
+        step_file = next(iter(step_trace_file_set))
+        parsed_step = os.path.basename(step_file).split(".")[0].split("_")[-1]
+        step_id_list = []
+        for data in FileManager.read_csv_file(step_file, StepTraceBean):
+            step_id = data.step_id
+            if step_id != Constant.INVALID_VALUE and str(step_id) != parsed_step and step_id not in step_id_list:
+                step_id_list.append(step_id)
+        return step_id_list
+
+    def _export_iterations(self, step_id_list: list):
+        """
+        export the steps concurrently, the failed exports are reported together once all of them are done
+        """
+        if not step_id_list:
+            return
+        failed_list = []
+        max_workers = min(len(step_id_list), Constant.MSPROF_EXPORT_MAX_WORKERS)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_dict = {executor.submit(self._export_iteration, step_id): step_id for step_id in step_id_list}
+            for future in as_completed(future_dict):
+                err = future.result()
+                if err:
+                    failed_list.append(f"iteration {future_dict[future]}: {err}")
+        if failed_list:
+            raise RuntimeError(f"Export CANN Profiling data failed for {len(failed_list)} of {len(step_id_list)} "
+                               f"iterations, please verify that the ascend-toolkit is installed and set-env.sh is "
+                               f"sourced. " + "; ".join(sorted(failed_list)))
+
+    def _export_iteration(self, step_id: int) -> str:
+        """
+        Returns: error of the export of the step, empty if it succeeds
+        """
+        try:
+            completed_process = subprocess.run(
+                [self.msprof_path, "--export=on", f"--output={self._cann_path}", f"--iteration-id={step_id}"],
+                capture_output=True, shell=False, timeout=Constant.MSPROF_EXPORT_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            return f"timeout after {Constant.MSPROF_EXPORT_TIMEOUT}s"
+        except OSError as err:
+            return str(err)
+        if completed_process.returncode != self.COMMAND_SUCCESS:
+            return f"exit code {completed_process.returncode}"
+        return ""
@@ -1,33 +1,49 @@
+from ..profiler_config import ProfilerConfig
 from ..prof_bean.node_info_bean import NodeInfoBean
+from ..prof_common_func.cache_manager import CacheManager
 from ..prof_common_func.file_tag import FileTag
-from ..prof_common_func.tree_builder import TreeBuilder, TorchOpNode
-from ..prof_parse.cann_file_parser import CANNFileParser
+from ..prof_common_func.torch_op_tree import TorchOpTree
+from ..prof_common_func.tree_builder import TreeBuilder
+from ..prof_parse.cann_file_parser import CANNDataEnum, CANNFileParser
 from ..prof_parse.fwk_file_parser import FwkFileParser
 
 
 class FwkCANNRelationParser:
+    TORCH_OP_TREE = "torch_op_tree"
+
     def __init__(self, profiler_path: str):
         self._profiler_path = profiler_path
 
-    def build_torch_op_tree(self) -> TorchOpNode:
+    def build_torch_op_tree(self) -> TorchOpTree:
+        input_file_list = FwkFileParser(self._profiler_path).get_file_list()
+        input_file_list.extend(CANNFileParser(self._profiler_path).get_file_list_by_type(CANNDataEnum.MSPROF_TIMELINE))
+        return CacheManager(self._profiler_path).get_or_compute(self.TORCH_OP_TREE, input_file_list,
+                                                                self._build_torch_op_tree,
+                                                                TorchOpTree.from_cache_data,
+                                                                ProfilerConfig().get_local_time(0))
+
+    def _build_torch_op_tree(self) -> TorchOpTree:
         fwk_parser = FwkFileParser(self._profiler_path)
-        torch_op_list = fwk_parser.get_file_data_by_tag(FileTag.TORCH_OP)
-        if not torch_op_list:
-            return TorchOpNode()
-        root_node = TreeBuilder.build_tree(torch_op_list)
+        torch_op_table = fwk_parser.get_file_columns_by_tag(FileTag.TORCH_OP)
+        if not len(torch_op_table):
+            return TorchOpTree()
+        torch_op_tree = TreeBuilder.build_tree(torch_op_table)
 
         acl_to_npu_dict = CANNFileParser(self._profiler_path).get_acl_to_npu_data()
         enqueue_data_list, dequeue_data_list = fwk_parser.get_task_queue_data()
         if not acl_to_npu_dict:
-            return root_node
+            return torch_op_tree
         acl_start_time_list = sorted(list(acl_to_npu_dict.keys()))
+        enqueue_ts_list, node_info_list = [], []
         if not enqueue_data_list and not dequeue_data_list:
             for acl_start_time in acl_start_time_list:
                 kernel_list = acl_to_npu_dict.get(acl_start_time, [])
                 if not kernel_list:
                     continue
-                TreeBuilder.find_call_node(acl_start_time, NodeInfoBean(kernel_list), root_node)
-            return root_node
+                enqueue_ts_list.append(acl_start_time)
+                node_info_list.append(NodeInfoBean(kernel_list))
+            TreeBuilder.find_call_nodes(enqueue_ts_list, node_info_list, torch_op_tree)
+            return torch_op_tree
 
         corr_id_dict = {}
         index = 0
@@ -47,5 +63,7 @@ class FwkCANNRelationParser:
                 kernel_list.extend(acl_to_npu_dict.get(acl_start_time, []))
             if not kernel_list:
                 continue
-            TreeBuilder.find_call_node(enqueue_data.ts, NodeInfoBean(kernel_list), root_node)
-        return root_node
+            enqueue_ts_list.append(enqueue_data.ts)
+            node_info_list.append(NodeInfoBean(kernel_list))
+        TreeBuilder.find_call_nodes(enqueue_ts_list, node_info_list, torch_op_tree)
+        return torch_op_tree
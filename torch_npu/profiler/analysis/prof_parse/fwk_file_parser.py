@@ -1,7 +1,15 @@
 import os
 import re
 
+import numpy as np
+
+from ..profiler_config import ProfilerConfig
+from ..prof_bean.op_mark_bean import OpMarkBean
 from ..prof_common_func.binary_decoder import BinaryDecoder
+from ..prof_common_func.cache_manager import CacheManager
+from ..prof_common_func.column_decoder import ColumnDecoder
+from ..prof_common_func.column_table import ColumnTable
+from ..prof_common_func.constant import Constant
 from ..prof_common_func.file_manager import FileManager
 from ..prof_common_func.file_tag import FileTag
 from ..prof_common_func.path_manager import ProfilerPathManager
@@ -11,6 +19,7 @@ from ..prof_config.fwk_file_parser_config import FwkFileParserConfig
 
 class FwkFileParser:
     def __init__(self, profiler_path: str):
+        self._profiler_path = profiler_path
         self._fwk_path = ProfilerPathManager.get_fwk_path(profiler_path)
         self._file_list = {}
         self._file_dispatch()
@@ -28,30 +37,59 @@ class FwkFileParser:
         else:
             return BinaryDecoder.decode(all_bytes, file_bean, struct_size)
 
+    def get_file_columns_by_tag(self, file_tag: int) -> ColumnTable:
+        file_path = self._file_list.get(file_tag)
+        if not file_path:
+            return self._decode_file_columns(file_tag)
+        return CacheManager(self._profiler_path).get_or_compute(
+            f"fwk_columns_{file_tag.name.lower()}", [file_path],
+            lambda: self._decode_file_columns(file_tag),
+            lambda arrays, meta: ColumnTable.from_cache_data(
+                FwkFileParserConfig.FILE_BEAN_MAP.get(file_tag, {}).get("bean"), arrays, meta))
+
+    def get_file_list(self) -> list:
+        return list(self._file_list.values())
+
+    def _decode_file_columns(self, file_tag: int) -> ColumnTable:
+        file_bean = FwkFileParserConfig.FILE_BEAN_MAP.get(file_tag, {}).get("bean")
+        is_tlv = FwkFileParserConfig.FILE_BEAN_MAP.get(file_tag, {}).get("is_tlv")
+        struct_size = FwkFileParserConfig.FILE_BEAN_MAP.get(file_tag, {}).get("struct_size")
+        file_path = self._file_list.get(file_tag)
+        all_bytes = FileManager.file_read_all(file_path, "rb") if file_path else b""
+        return ColumnDecoder.decode(all_bytes, file_bean, struct_size, is_tlv)
+
     def get_task_queue_data(self) -> tuple:
         enqueue_data_list, dequeue_data_list = [], []
-        op_mark_data = self.get_file_data_by_tag(FileTag.OP_MARK)
-        if not op_mark_data:
+        op_mark_table = self.get_file_columns_by_tag(FileTag.OP_MARK)
+        if not len(op_mark_table):
             return enqueue_data_list, dequeue_data_list
-        op_mark_data.sort(key=lambda x: x.time_us)
+        time_us = ProfilerConfig().get_local_time(op_mark_table.column("time_ns") / Constant.NS_TO_US)
+        sorted_index = np.argsort(time_us, kind="stable")
+        time_list = time_us[sorted_index].tolist()
+        category_list = op_mark_table.column("category")[sorted_index].tolist()
+        corr_id_list = op_mark_table.column("corr_id")[sorted_index].tolist()
+        tid_list = op_mark_table.column("tid")[sorted_index].tolist()
+        name_id_list = op_mark_table.tlv_column(Constant.NAME)[sorted_index].tolist()
         enqueue_start, dequeue_start = None, None
-        for op_mark in op_mark_data:
-            if op_mark.is_enqueue_start:
-                enqueue_start = op_mark
-            elif op_mark.is_enqueue_end:
-                if enqueue_start and enqueue_start.tid == op_mark.tid and \
-                        enqueue_start.origin_name == op_mark.origin_name:
-                    op_mark.ts = enqueue_start.time_us
-                    op_mark.dur = op_mark.time_us - enqueue_start.time_us
+        for index, category in enumerate(category_list):
+            if category == OpMarkBean.ENQUEUE_START:
+                enqueue_start = index
+            elif category == OpMarkBean.ENQUEUE_END:
+                if enqueue_start is not None and tid_list[enqueue_start] == tid_list[index] and \
+                        name_id_list[enqueue_start] == name_id_list[index]:
+                    op_mark = op_mark_table[sorted_index[index]]
+                    op_mark.ts = time_list[enqueue_start]
+                    op_mark.dur = time_list[index] - time_list[enqueue_start]
                     enqueue_data_list.append(op_mark)
                     enqueue_start = None
-            elif op_mark.is_dequeue_start:
-                dequeue_start = op_mark
-            elif op_mark.is_dequeue_end:
-                if dequeue_start and dequeue_start.corr_id == op_mark.corr_id:
-                    dequeue_start.ts = dequeue_start.time_us
-                    dequeue_start.dur = op_mark.time_us - dequeue_start.time_us
-                    dequeue_data_list.append(dequeue_start)
+            elif category == OpMarkBean.DEQUEUE_START:
+                dequeue_start = index
+            elif category == OpMarkBean.DEQUEUE_END:
+                if dequeue_start is not None and corr_id_list[dequeue_start] == corr_id_list[index]:
+                    op_mark = op_mark_table[sorted_index[dequeue_start]]
+                    op_mark.ts = time_list[dequeue_start]
+                    op_mark.dur = time_list[index] - time_list[dequeue_start]
+                    dequeue_data_list.append(op_mark)
                     dequeue_start = None
         return enqueue_data_list, dequeue_data_list
 
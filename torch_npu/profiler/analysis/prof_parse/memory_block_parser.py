@@ -0,0 +1,73 @@
+import numpy as np
+
+from ..prof_bean.memory_use_bean import MemoryUseBean
+from ..prof_common_func.cache_manager import CacheManager
+from ..prof_common_func.constant import Constant
+from ..prof_common_func.file_tag import FileTag
+from ..prof_common_func.interval_index import IntervalIndex
+from ..prof_common_func.memory_block_table import MemoryBlockTable
+from ..prof_common_func.step_index import StepIndex
+from ..prof_common_func.torch_op_tree import TorchOpTree
+from ..prof_parse.fwk_file_parser import FwkFileParser
+from ..profiler_config import ProfilerConfig
+
+
+class MemoryBlockParser:
+    MEMORY_BLOCK_TABLE = "memory_block_table"
+
+    def __init__(self, profiler_path: str):
+        self._profiler_path = profiler_path
+
+    @classmethod
+    def _get_host_step_range(cls, torch_op_tree: TorchOpTree) -> list:
+        """
+        the memory records are host events, so they are assigned to the host range of the step ops
+        """
+        return [[node.name.split("#")[-1], node.start_time, node.end_time]
+                for node in torch_op_tree.get_top_level_nodes() if node.is_profiler_step()]
+
+    def build_memory_block_table(self, torch_op_tree: any) -> MemoryBlockTable:
+        """
+        Returns: blocks of the npu records of the pta memory data, attributed to the innermost torch op of the same
+        process enclosing their allocation and to the step of their allocation
+        """
+        return CacheManager(self._profiler_path).get_or_compute(
+            self.MEMORY_BLOCK_TABLE, FwkFileParser(self._profiler_path).get_file_list(),
+            lambda: self._build_memory_block_table(torch_op_tree), MemoryBlockTable.from_cache_data,
+            ProfilerConfig().get_local_time(0))
+
+    def _build_memory_block_table(self, torch_op_tree: any) -> MemoryBlockTable:
+        memory_table = FwkFileParser(self._profiler_path).get_file_columns_by_tag(FileTag.MEMORY)
+        if not len(memory_table):
+            return MemoryBlockTable()
+        npu_index = np.flatnonzero(memory_table.column("device_type") == MemoryUseBean.NPU_ID)
+        npu_index = npu_index[np.argsort(memory_table.column("time_ns")[npu_index], kind="stable")]
+        record_time = ProfilerConfig().get_local_time(
+            memory_table.column("time_ns")[npu_index] / Constant.NS_TO_US)
+        record_pid = memory_table.column("pid")[npu_index].astype(np.int64)
+        memory_block_table = MemoryBlockTable(record_time, memory_table.column("ptr")[npu_index],
+                                              memory_table.column("size")[npu_index],
+                                              memory_table.column("total_allocated")[npu_index],
+                                              memory_table.column("total_reserved")[npu_index], record_pid,
+                                              memory_table.column("device_index")[npu_index])
+        if not len(torch_op_tree):
+            return memory_block_table
+        step_range = self._get_host_step_range(torch_op_tree)
+        record_step = StepIndex(step_range).find_step_index(record_time)
+        alloc_pos = memory_block_table.alloc_pos
+        has_alloc = np.flatnonzero(alloc_pos != MemoryBlockTable.INVALID_INDEX)
+        block_op = np.full(len(alloc_pos), MemoryBlockTable.INVALID_INDEX, dtype=np.int64)
+        block_pid = record_pid[alloc_pos[has_alloc]]
+        block_time = record_time[alloc_pos[has_alloc]]
+        op_pid = torch_op_tree.torch_op_table.column("pid")
+        for pid in np.unique(block_pid).tolist():
+            op_index = np.flatnonzero(op_pid == pid)
+            if not len(op_index):
+                continue
+            pid_mask = block_pid == pid
+            matched = IntervalIndex(torch_op_tree.start[op_index], torch_op_tree.end[op_index],
+                                    closed=True).find_innermost(block_time[pid_mask])
+            found = matched != IntervalIndex.INVALID_INDEX
+            block_op[has_alloc[pid_mask][found]] = op_index[matched[found]]
+        memory_block_table.update_attribution(block_op, record_step, step_range)
+        return memory_block_table
@@ -5,6 +5,9 @@ class BaseViewParser(metaclass=ABCMeta):
     """
     prof_interface for viewer
     """
+    # view parsers which must finish before this one runs, because it reads their output files or the
+    # intermediate products they leave in the analysis cache
+    DEPENDENCIES = []
 
     def __init__(self, profiler_path: str):
         self._profiler_path = profiler_path
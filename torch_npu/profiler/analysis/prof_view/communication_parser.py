@@ -14,11 +14,15 @@
 # limitations under the License.
 
 from collections import defaultdict
+
+import numpy as np
+
 from ..prof_common_func.file_manager import FileManager
 from ..prof_view.base_view_parser import BaseViewParser
 from ..prof_parse.cann_file_parser import CANNFileParser
 from ..prof_parse.cann_file_parser import CANNDataEnum
 from ..prof_common_func.global_var import GlobalVar
+from ..prof_common_func.step_index import StepIndex
 
 
 class CommunicationParser(BaseViewParser):
@@ -91,12 +95,14 @@ class CommunicationParser(BaseViewParser):
     def split_comm_op_by_step(self, communication_data: dict):
         if len(self.step_list) == 1:
             self.step_list[0]["comm_ops"] = communication_data
-        for communication_op, communication_op_info in communication_data.items():
-            start_time = communication_op_info.get(self.COMMUNICATION_TIME_INFO, {}).get(self.START_TIMESTAMP)
-            for step_info in self.step_list:
-                if step_info.get("start_ts", -1) <= start_time <= step_info.get("end_ts", -1):
-                    step_info.get("comm_ops", {})[communication_op] = communication_op_info
-                    break
+            return
+        start_time_list = [communication_op_info.get(self.COMMUNICATION_TIME_INFO, {}).get(self.START_TIMESTAMP)
+                           for communication_op_info in communication_data.values()]
+        step_index_list = GlobalVar.get_step_index().find_step_index(
+            np.array(start_time_list, dtype=np.float64)).tolist()
+        for (communication_op, communication_op_info), step_index in zip(communication_data.items(), step_index_list):
+            if step_index != StepIndex.INVALID_INDEX:
+                self.step_list[step_index].get("comm_ops", {})[communication_op] = communication_op_info
 
     def split_communication_p2p_ops(self, op_data: dict):
         comm_op_dict = {self.P2P: {}, self.COLLECTIVE: {}}
@@ -0,0 +1,114 @@
+import os
+
+import numpy as np
+
+from ..prof_common_func.column_table import StringTable
+from ..prof_common_func.constant import Constant
+from ..prof_common_func.file_manager import FileManager
+from ..prof_common_func.global_var import GlobalVar
+from ..prof_common_func.torch_op_tree import TorchOpTree
+from ..prof_view.base_view_parser import BaseViewParser
+
+
+class FlameGraphViewParser(BaseViewParser):
+    """
+    host self time and device self time of the torch ops aggregated per python call stack, with the op name
+    as the leaf frame. the call stacks are interned string ids, so every distinct stack is split only once
+    """
+    # the collapsed stack values are integer counts, so the folded files are in nanoseconds
+    HOST_FOLDED = "flame_graph_host_self_ns.folded"
+    DEVICE_FOLDED = "flame_graph_device_self_ns.folded"
+    SPEEDSCOPE = "flame_graph.speedscope.json"
+    SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+    STACK_SEPARATOR = ";"
+    # the collapsed stack format separates the frames by ";" and the value by a space
+    TRANSLATE_TABLE = str.maketrans(" ;\t\r\n", "_____")
+
+    def __init__(self, profiler_path: str):
+        super().__init__(profiler_path)
+        self._frame_list = []
+        self._frame_dict = {}
+
+    def generate_view(self, output_path: str, **kwargs) -> None:
+        torch_op_tree = GlobalVar.torch_op_tree_node
+        if not len(torch_op_tree):
+            return
+        torch_op_table = torch_op_tree.torch_op_table
+        stack_ids = torch_op_table.tlv_column(Constant.CALL_STACK)
+        has_stack = stack_ids != StringTable.INVALID_ID
+        if not np.any(has_stack):
+            return
+        name_ids = torch_op_table.tlv_column(Constant.OP_NAME)[has_stack].astype(np.int64)
+        name_num = len(torch_op_table.string_table) + 1
+        # one key per distinct (call stack, op name), the invalid name id -1 is shifted to 0
+        keys = stack_ids[has_stack].astype(np.int64) * name_num + name_ids + 1
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        host_dur = np.bincount(inverse, weights=torch_op_tree.host_self_dur[has_stack],
+                               minlength=len(unique_keys))
+        device_dur = np.bincount(inverse, weights=torch_op_tree.device_dur[TorchOpTree.DEVICE_SELF][has_stack],
+                                 minlength=len(unique_keys))
+
+        sample_list = []
+        stack_frame_dict = {}
+        for key in unique_keys.tolist():
+            stack_id, name_id = divmod(key, name_num)
+            name = torch_op_table.get_string(name_id - 1)
+            if name.find("ProfilerStep#") != -1:
+                sample_list.append(None)
+                continue
+            stack_frames = stack_frame_dict.get(stack_id)
+            if stack_frames is None:
+                stack_frames = self._get_stack_frames(torch_op_table.get_string(stack_id))
+                stack_frame_dict[stack_id] = stack_frames
+            sample_list.append(stack_frames + [self._intern_frame(name)])
+
+        FileManager.create_text_file(output_path, self._get_folded_lines(sample_list, host_dur), self.HOST_FOLDED)
+        FileManager.create_text_file(output_path, self._get_folded_lines(sample_list, device_dur),
+                                     self.DEVICE_FOLDED)
+        profiles = [self._get_speedscope_profile("Host Self Duration", sample_list, host_dur),
+                    self._get_speedscope_profile("Device Self Duration", sample_list, device_dur)]
+        speedscope = {
+            "$schema": self.SPEEDSCOPE_SCHEMA,
+            "name": os.path.basename(self._profiler_path.rstrip(os.sep)),
+            "exporter": "torch_npu.profiler",
+            "activeProfileIndex": 1 if profiles[1].get("samples") else 0,
+            "shared": {"frames": [{"name": frame} for frame in self._frame_list]},
+            "profiles": profiles
+        }
+        FileManager.create_json_file(output_path, speedscope, self.SPEEDSCOPE)
+
+    def _get_stack_frames(self, call_stack: str) -> list:
+        """
+        Returns: frame indexes from the outermost to the innermost frame
+        """
+        frames = [frame.strip() for frame in call_stack.split(self.STACK_SEPARATOR)]
+        return [self._intern_frame(frame) for frame in reversed(frames) if frame]
+
+    def _intern_frame(self, frame: str) -> int:
+        frame_index = self._frame_dict.get(frame)
+        if frame_index is None:
+            frame_index = len(self._frame_list)
+            self._frame_dict[frame] = frame_index
+            self._frame_list.append(frame)
+        return frame_index
+
+    def _get_folded_lines(self, sample_list: list, dur: np.ndarray) -> list:
+        folded_frames = [frame.translate(self.TRANSLATE_TABLE) for frame in self._frame_list]
+        folded_lines = []
+        for sample, value in zip(sample_list, np.rint(dur * Constant.NS_TO_US).astype(np.int64).tolist()):
+            if sample is None or value <= 0:
+                continue
+            folded_stack = self.STACK_SEPARATOR.join(folded_frames[frame] for frame in sample)
+            folded_lines.append(f"{folded_stack} {value}")
+        folded_lines.sort()
+        return folded_lines
+
+    def _get_speedscope_profile(self, name: str, sample_list: list, dur: np.ndarray) -> dict:
+        samples, weights = [], []
+        for sample, value in zip(sample_list, dur.tolist()):
+            if sample is None or value <= 0:
+                continue
+            samples.append(sample)
+            weights.append(value)
+        return {"type": "sampled", "name": name, "unit": "microseconds", "startValue": 0,
+                "endValue": sum(weights), "samples": samples, "weights": weights}
@@ -0,0 +1,210 @@
+import os
+
+import numpy as np
+
+from ..prof_bean.op_summary_bean import OpSummaryBean
+from ..prof_common_func.column_table import StringTable
+from ..prof_common_func.constant import Constant, print_warn_msg
+from ..prof_common_func.file_manager import FileManager
+from ..prof_common_func.flops_calculator import FlopsCalculator
+from ..prof_common_func.global_var import GlobalVar
+from ..prof_common_func.torch_op_tree import TorchOpTree
+from ..prof_parse.cann_file_parser import CANNFileParser, CANNDataEnum
+from ..prof_view.base_view_parser import BaseViewParser
+
+
+class FlopsViewParser(BaseViewParser):
+    """
+    achieved tflops and model flops utilization of the ops recorded with with_flops, from their flops and the
+    device time of their kernels. with the memory metrics of the kernels, every op is also placed on the
+    roofline: it is memory bound when its arithmetic intensity is below the peak flops over the peak bandwidth
+    """
+    FLOPS_VIEW = "flops_statistic.csv"
+    FLOPS_SUMMARY = "flops_summary.json"
+    HEADERS = ["Name", "Input Shapes", "Count", "GFLOPs", "Device Duration(us)", "TFLOPS", "MFU(%)",
+               "Arithmetic Intensity(FLOP/Byte)", "Bound"]
+    COMPUTE_BOUND = "compute"
+    MEMORY_BOUND = "memory"
+    # ts of the kernels are matched to the op summary by rounding to ns
+    TS_DECIMALS = 3
+
+    def __init__(self, profiler_path: str):
+        super().__init__(profiler_path)
+        self._kernel_bytes_dict = None
+
+    @classmethod
+    def _get_peak(cls, value: any, env_name: str, param_name: str) -> any:
+        if value is None:
+            value = os.getenv(env_name)
+        if value is None:
+            return None
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            value = 0.0
+        if value <= 0:
+            print_warn_msg(f"Invalid parameter {param_name}, which must be a positive number, ignore it.")
+            return None
+        return value
+
+    @classmethod
+    def _get_tflops(cls, flops: np.ndarray, dur: np.ndarray) -> np.ndarray:
+        # flops over us is mflop/s, so the tflops are flops over 1e6 us
+        return np.divide(flops, dur * 1e6, out=np.zeros(len(flops)), where=dur > 0)
+
+    def generate_view(self, output_path: str, **kwargs) -> None:
+        torch_op_tree = GlobalVar.torch_op_tree_node
+        if not len(torch_op_tree):
+            return
+        op_flops = self._get_op_flops(torch_op_tree)
+        op_index = np.flatnonzero(op_flops > 0)
+        if not len(op_index):
+            return
+        peak_tflops = self._get_peak(kwargs.get(Constant.PEAK_TFLOPS), Constant.PEAK_TFLOPS_ENV,
+                                     Constant.PEAK_TFLOPS)
+        peak_bandwidth = self._get_peak(kwargs.get(Constant.PEAK_BANDWIDTH), Constant.PEAK_BANDWIDTH_ENV,
+                                        Constant.PEAK_BANDWIDTH)
+        torch_op_table = torch_op_tree.torch_op_table
+        flops = op_flops[op_index]
+        dur = torch_op_tree.device_dur[TorchOpTree.DEVICE_TOTAL][op_index]
+        op_bytes = self._get_op_bytes(torch_op_tree, op_index)
+
+        name_ids = torch_op_table.tlv_column(Constant.OP_NAME)[op_index]
+        shape_ids = torch_op_table.tlv_column(Constant.INPUT_SHAPES)[op_index]
+        unique_keys, inverse = np.unique(np.stack((name_ids, shape_ids), axis=1), axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        key_num = len(unique_keys)
+        key_count = np.bincount(inverse, minlength=key_num)
+        key_flops = np.bincount(inverse, weights=flops, minlength=key_num)
+        key_dur = np.bincount(inverse, weights=dur, minlength=key_num)
+        key_bytes = np.bincount(inverse, weights=np.nan_to_num(op_bytes), minlength=key_num)
+        key_has_bytes = np.bincount(inverse, weights=~np.isnan(op_bytes), minlength=key_num) > 0
+        key_tflops = self._get_tflops(key_flops, key_dur)
+        flops_rows = []
+        for index in np.argsort(-key_dur, kind="stable").tolist():
+            intensity = float(key_flops[index] / key_bytes[index]) \
+                if key_has_bytes[index] and key_bytes[index] > 0 else None
+            flops_rows.append([torch_op_table.get_string(int(unique_keys[index][0])),
+                               torch_op_table.get_string(int(unique_keys[index][1])), int(key_count[index]),
+                               float(key_flops[index]) / 1e9, float(key_dur[index]), float(key_tflops[index]),
+                               self._get_mfu(key_tflops[index], peak_tflops), intensity,
+                               self._get_bound(intensity, peak_tflops, peak_bandwidth)])
+        FileManager.create_csv_file(output_path, flops_rows, self.FLOPS_VIEW, self.HEADERS,
+                                    columnar_export=kwargs.get(Constant.COLUMNAR_EXPORT, False))
+
+        summary = {
+            "peak_tflops": peak_tflops,
+            "peak_bandwidth": peak_bandwidth,
+            "total": self._get_summary_item(float(np.sum(flops)), float(np.sum(dur)), peak_tflops),
+            "op_types": self._get_op_type_summary(torch_op_table, name_ids, flops, dur, peak_tflops),
+            "steps": self._get_step_summary(torch_op_tree.device_start[op_index], flops, dur, peak_tflops)
+        }
+        FileManager.create_json_file_by_path(os.path.join(output_path, self.FLOPS_SUMMARY), summary, indent=4)
+
+    def _get_op_flops(self, torch_op_tree: TorchOpTree) -> np.ndarray:
+        """
+        Returns: flops of every op, computed once per distinct op name and extra args
+        """
+        torch_op_table = torch_op_tree.torch_op_table
+        extra_args_ids = torch_op_table.tlv_column(Constant.FLOPS)
+        op_flops = np.zeros(len(extra_args_ids))
+        has_args = np.flatnonzero(extra_args_ids != StringTable.INVALID_ID)
+        if not len(has_args):
+            return op_flops
+        keys = np.stack((torch_op_table.tlv_column(Constant.OP_NAME)[has_args], extra_args_ids[has_args]), axis=1)
+        unique_keys, inverse = np.unique(keys, axis=0, return_inverse=True)
+        key_flops = np.array([FlopsCalculator.compute_flops(torch_op_table.get_string(name_id),
+                                                            torch_op_table.get_string(extra_args_id))
+                              for name_id, extra_args_id in unique_keys.tolist()], dtype=np.float64)
+        op_flops[has_args] = key_flops[inverse.reshape(-1)]
+        return op_flops
+
+    def _get_op_bytes(self, torch_op_tree: TorchOpTree, op_index: np.ndarray) -> np.ndarray:
+        """
+        Returns: main memory bytes of the kernels under every op, nan without the memory metrics
+        """
+        op_bytes = np.full(len(op_index), np.nan)
+        kernel_bytes_dict = self._get_kernel_bytes_dict()
+        if not kernel_bytes_dict:
+            return op_bytes
+        for position, index in enumerate(op_index.tolist()):
+            node_stack = [index]
+            while node_stack:
+                node_index = node_stack.pop()
+                node_stack.extend(torch_op_tree.get_child_index_list(node_index))
+                for kernel in torch_op_tree.get_kernel_list(node_index):
+                    try:
+                        kernel_bytes = kernel_bytes_dict.get(round(float(kernel.ts), self.TS_DECIMALS))
+                    except (TypeError, ValueError):
+                        continue
+                    if kernel_bytes is not None:
+                        op_bytes[position] = np.nan_to_num(op_bytes[position]) + kernel_bytes
+        return op_bytes
+
+    def _get_kernel_bytes_dict(self) -> dict:
+        if self._kernel_bytes_dict is not None:
+            return self._kernel_bytes_dict
+        self._kernel_bytes_dict = {}
+        for file_path in CANNFileParser(self._profiler_path).get_file_list_by_type(CANNDataEnum.OP_SUMMARY):
+            data_list = FileManager.read_csv_file(file_path, OpSummaryBean)
+            # skip the op summary without the memory metric columns
+            if not data_list or not any(map(OpSummaryBean.is_main_mem_header, data_list[0].all_headers)):
+                continue
+            for data in data_list:
+                # the ai cpu and hccl tasks carry N/A in the memory metric columns
+                main_mem_bytes = data.main_mem_bytes
+                if main_mem_bytes is None:
+                    continue
+                self._kernel_bytes_dict[round(data.ts, self.TS_DECIMALS)] = main_mem_bytes
+        return self._kernel_bytes_dict
+
+    def _get_op_type_summary(self, torch_op_table: any, name_ids: np.ndarray, flops: np.ndarray, dur: np.ndarray,
+                             peak_tflops: any) -> list:
+        unique_ids, inverse = np.unique(name_ids, return_inverse=True)
+        type_count = np.bincount(inverse, minlength=len(unique_ids))
+        type_flops = np.bincount(inverse, weights=flops, minlength=len(unique_ids))
+        type_dur = np.bincount(inverse, weights=dur, minlength=len(unique_ids))
+        op_type_list = []
+        for index in np.argsort(-type_dur, kind="stable").tolist():
+            op_type = {"name": torch_op_table.get_string(int(unique_ids[index])), "count": int(type_count[index])}
+            op_type.update(self._get_summary_item(float(type_flops[index]), float(type_dur[index]), peak_tflops))
+            op_type_list.append(op_type)
+        return op_type_list
+
+    def _get_step_summary(self, device_start: np.ndarray, flops: np.ndarray, dur: np.ndarray,
+                          peak_tflops: any) -> list:
+        """
+        the step tflops is the step flops over the step time, while the op tflops only counts their kernel time
+        """
+        if not GlobalVar.step_range:
+            return []
+        step_index = GlobalVar.get_step_index().find_step_index(device_start)
+        valid = step_index != TorchOpTree.INVALID_INDEX
+        step_num = len(GlobalVar.step_range)
+        step_flops = np.bincount(step_index[valid], weights=flops[valid], minlength=step_num)
+        step_op_dur = np.bincount(step_index[valid], weights=dur[valid], minlength=step_num)
+        step_summary = []
+        for index, (step_id, step_start, step_end) in enumerate(GlobalVar.step_range):
+            step_dur = step_end - step_start if step_start < step_end else 0.0
+            step_tflops = float(step_flops[index]) / (step_dur * 1e6) if step_dur > 0 else 0.0
+            step_item = {"step": step_id, "step_duration(us)": step_dur, "step_tflops": step_tflops,
+                         "step_mfu(%)": self._get_mfu(step_tflops, peak_tflops)}
+            step_item.update(self._get_summary_item(float(step_flops[index]), float(step_op_dur[index]),
+                                                    peak_tflops))
+            step_summary.append(step_item)
+        return step_summary
+
+    def _get_summary_item(self, flops: float, dur: float, peak_tflops: any) -> dict:
+        tflops = flops / (dur * 1e6) if dur > 0 else 0.0
+        return {"gflops": flops / 1e9, "device_duration(us)": dur, "tflops": tflops,
+                "mfu(%)": self._get_mfu(tflops, peak_tflops)}
+
+    def _get_mfu(self, tflops: float, peak_tflops: any) -> any:
+        return float(tflops) / peak_tflops * 100 if peak_tflops else None
+
+    def _get_bound(self, intensity: any, peak_tflops: any, peak_bandwidth: any) -> str:
+        if intensity is None or not peak_tflops or not peak_bandwidth:
+            return ""
+        # tflops over GB/s is 1e3 flop per byte
+        ridge_point = peak_tflops / peak_bandwidth * 1e3
+        return self.MEMORY_BOUND if intensity < ridge_point else self.COMPUTE_BOUND
@@ -1,3 +1,4 @@
+from ..prof_common_func.constant import Constant
 from ..prof_common_func.file_manager import FileManager
 from ..prof_view.base_view_parser import BaseViewParser
 from ..prof_parse.cann_file_parser import CANNFileParser, CANNDataEnum
@@ -18,9 +19,10 @@ class IntegrateParser(BaseViewParser):
 
     def generate_view(self, output_path: str, **kwargs) -> None:
         for cann_data_enum, parser_bean in ProfilerConfig().get_parser_bean():
-            self.generate_csv(cann_data_enum, parser_bean, output_path)
+            self.generate_csv(cann_data_enum, parser_bean, output_path, kwargs.get(Constant.COLUMNAR_EXPORT, False))
 
-    def generate_csv(self, cann_data_enum: int, parser_bean: any, output_path: str) -> None:
+    def generate_csv(self, cann_data_enum: int, parser_bean: any, output_path: str,
+                     columnar_export: bool = False) -> None:
         """
         summarize data to generate csv files
         Returns: None
@@ -35,4 +37,5 @@ class IntegrateParser(BaseViewParser):
             if all_data and not output_headers:
                 output_headers = all_data[0].headers
         FileManager.create_csv_file(output_path, summary_data,
-                                    self.CSV_FILENAME_MAP.get(cann_data_enum, "none"), output_headers)
+                                    self.CSV_FILENAME_MAP.get(cann_data_enum, "none"), output_headers,
+                                    columnar_export=columnar_export)
@@ -1,4 +1,5 @@
 from ..prof_common_func.csv_headers import CsvHeaders
+from ..prof_common_func.constant import Constant
 from ..prof_common_func.file_manager import FileManager
 from ..prof_bean.op_summary_bean import OpSummaryBean
 from ..prof_common_func.global_var import GlobalVar
@@ -39,13 +40,9 @@ class KernelViewParser(BaseViewParser):
             if not GlobalVar.step_range:
                 summary_data.extend([data.row for data in all_data])
                 continue
-            for data in all_data:
-                step_id = None
-                for step_data in GlobalVar.step_range:
-                    if step_data[1] <= data.ts <= step_data[2]:
-                        step_id = step_data[0]
-                        break
-                summary_data.append([step_id] + data.row)
+            step_id_list = GlobalVar.get_step_index().find_step_id([data.ts for data in all_data])
+            summary_data.extend([[step_id] + data.row for step_id, data in zip(step_id_list, all_data)])
 
         headers = ["Step Id"] + output_headers if GlobalVar.step_range else output_headers
-        FileManager.create_csv_file(output_path, summary_data, self.KERNEL_VIEW, headers)
+        FileManager.create_csv_file(output_path, summary_data, self.KERNEL_VIEW, headers,
+                                    columnar_export=kwargs.get(Constant.COLUMNAR_EXPORT, False))
@@ -0,0 +1,168 @@
+import os
+
+import numpy as np
+
+from ..prof_common_func.constant import Constant
+from ..prof_common_func.file_manager import FileManager
+from ..prof_common_func.global_var import GlobalVar
+from ..prof_common_func.memory_block_table import MemoryBlockTable
+from ..prof_parse.memory_block_parser import MemoryBlockParser
+from ..prof_view.base_view_parser import BaseViewParser
+from ..prof_view.memory_peak_view_parser import MemoryPeakViewParser
+
+
+class MemoryLeakViewParser(BaseViewParser):
+    """
+    allocation sites of the pta memory whose live bytes grow across the steps. a site is the name and call stack
+    of the allocating torch op on a device, its live bytes at the end of every step form a site x step matrix
+    built with one difference array over the blocks, and a least squares line over the steps gives its growth
+    rate. the blocks allocated in a step and still live at its end are retained by that step
+    """
+    # the memory block table is built and cached once by the memory peak view, and loaded from the cache here
+    DEPENDENCIES = [MemoryPeakViewParser]
+    MEMORY_LEAK = "memory_leak.csv"
+    MEMORY_LEAK_DETAIL = "memory_leak.json"
+    HEADERS = ["Device Type", "Process Id", "Name", "Call Stack", "Growth Rate(KB/step)", "R Squared",
+               "First Step Live(KB)", "Last Step Live(KB)", "Retained Count", "Retained(KB)", "Never Freed Count",
+               "Never Freed(KB)"]
+    # a trend needs enough steps to tell growth from noise
+    MIN_STEP_NUM = 3
+    # the site x step matrix is built for this many sites at a time
+    SITE_CHUNK_SIZE = 4096
+
+    def __init__(self, profiler_path: str):
+        super().__init__(profiler_path)
+
+    @classmethod
+    def _fit_trend(cls, live_bytes: np.ndarray) -> tuple:
+        """
+        Returns: slope and coefficient of determination of the least squares line of every row over the steps
+        """
+        step_x = np.arange(live_bytes.shape[1], dtype=np.float64)
+        centered_x = step_x - step_x.mean()
+        centered_y = live_bytes - live_bytes.mean(axis=1, keepdims=True)
+        sxx = float(np.sum(centered_x ** 2))
+        sxy = centered_y @ centered_x
+        syy = np.sum(centered_y ** 2, axis=1)
+        slope = sxy / sxx
+        r_squared = np.divide(sxy ** 2, sxx * syy, out=np.ones(len(syy)), where=syy > 0)
+        return slope, r_squared
+
+    @classmethod
+    def _get_live_bytes(cls, block_row: np.ndarray, row_num: int, block_size: np.ndarray, first_step: np.ndarray,
+                        last_step: np.ndarray, step_num: int) -> np.ndarray:
+        """
+        Returns: live bytes of every row at the end of every step, one difference array over the blocks
+        """
+        delta = np.bincount(block_row * (step_num + 1) + first_step, weights=block_size,
+                            minlength=row_num * (step_num + 1)) - \
+            np.bincount(block_row * (step_num + 1) + last_step, weights=block_size, minlength=row_num * (step_num + 1))
+        return np.cumsum(delta.reshape(row_num, step_num + 1), axis=1)[:, :step_num]
+
+    def generate_view(self, output_path: str, **kwargs) -> None:
+        torch_op_tree = GlobalVar.torch_op_tree_node
+        memory_block_table = MemoryBlockParser(self._profiler_path).build_memory_block_table(torch_op_tree)
+        step_range = memory_block_table.step_range
+        if not len(memory_block_table) or len(step_range) < self.MIN_STEP_NUM:
+            return
+        step_order = np.argsort([step[2] for step in step_range], kind="stable")
+        # the last record up to the end of every step, in the order of the step ends
+        step_end_pos = np.searchsorted(memory_block_table.record_time,
+                                       np.array([step_range[index][2] for index in step_order.tolist()]),
+                                       side="right") - 1
+        site, site_keys = self._get_block_site(memory_block_table, torch_op_tree)
+        site_num, step_num = len(site_keys), len(step_order)
+        block_size = memory_block_table.block_size.astype(np.float64)
+        alloc_pos, free_pos = memory_block_table.alloc_pos, memory_block_table.free_pos
+        # a block is live at the ends of the steps in [first_step, last_step)
+        first_step = np.searchsorted(step_end_pos, alloc_pos, side="left")
+        last_step = np.searchsorted(step_end_pos, free_pos, side="left")
+        # a growing site has live bytes at the end of the last step, the other sites never get a row
+        live_site = np.unique(site[(first_step < step_num) & (last_step == step_num)])
+        block_order = np.argsort(site, kind="stable")
+        sorted_site = site[block_order]
+        leak_site_list, leak_live_list = [], []
+        for chunk_start in range(0, len(live_site), self.SITE_CHUNK_SIZE):
+            chunk_site = live_site[chunk_start: chunk_start + self.SITE_CHUNK_SIZE]
+            chunk_block = block_order[np.searchsorted(sorted_site, chunk_site[0], side="left"):
+                                      np.searchsorted(sorted_site, chunk_site[-1], side="right")]
+            chunk_row = np.searchsorted(chunk_site, site[chunk_block])
+            is_chunk_site = chunk_site[chunk_row] == site[chunk_block]
+            chunk_block, chunk_row = chunk_block[is_chunk_site], chunk_row[is_chunk_site]
+            live_bytes = self._get_live_bytes(chunk_row, len(chunk_site), block_size[chunk_block],
+                                              first_step[chunk_block], last_step[chunk_block], step_num)
+            is_growing = np.all(np.diff(live_bytes, axis=1) >= 0, axis=1) & (live_bytes[:, -1] > live_bytes[:, 0])
+            leak_site_list.append(chunk_site[is_growing])
+            leak_live_list.append(live_bytes[is_growing])
+        leak_site = np.concatenate(leak_site_list) if leak_site_list else np.empty(0, dtype=np.int64)
+        live_bytes = np.concatenate(leak_live_list) if leak_live_list else np.empty((0, step_num))
+        slope, r_squared = self._fit_trend(live_bytes)
+
+        step_rank = np.empty(step_num, dtype=np.int64)
+        step_rank[step_order] = np.arange(step_num)
+        block_step = memory_block_table.block_step
+        has_step = block_step != MemoryBlockTable.INVALID_INDEX
+        block_rank = np.where(has_step, step_rank[np.maximum(block_step, 0)], 0)
+        is_retained = has_step & (free_pos > step_end_pos[block_rank])
+        is_never_freed = free_pos >= len(memory_block_table)
+        retained_count = np.bincount(site[is_retained], minlength=site_num)
+        retained_bytes = np.bincount(site[is_retained], weights=block_size[is_retained], minlength=site_num)
+        never_freed_count = np.bincount(site[is_never_freed], minlength=site_num)
+        never_freed_bytes = np.bincount(site[is_never_freed], weights=block_size[is_never_freed], minlength=site_num)
+        # the retained bytes of every step only for the leak sites
+        leak_row = np.full(site_num, MemoryBlockTable.INVALID_INDEX, dtype=np.int64)
+        leak_row[leak_site] = np.arange(len(leak_site))
+        is_leak_retained = is_retained & (leak_row[site] != MemoryBlockTable.INVALID_INDEX)
+        step_retained = np.bincount(leak_row[site[is_leak_retained]] * step_num + block_rank[is_leak_retained],
+                                    weights=block_size[is_leak_retained], minlength=len(leak_site) * step_num)
+        step_retained = step_retained.reshape(len(leak_site), step_num)
+
+        leak_rows, leak_detail = [], []
+        step_ids = [step_range[index][0] for index in step_order.tolist()]
+        for index in np.argsort(-slope, kind="stable").tolist():
+            site_index = int(leak_site[index])
+            device_tag, device_pid, name, call_stack = site_keys[site_index]
+            leak_rows.append([device_tag, device_pid, name, call_stack, float(slope[index]) / Constant.B_TO_KB,
+                              float(r_squared[index]), float(live_bytes[index, 0]) / Constant.B_TO_KB,
+                              float(live_bytes[index, -1]) / Constant.B_TO_KB, int(retained_count[site_index]),
+                              float(retained_bytes[site_index]) / Constant.B_TO_KB,
+                              int(never_freed_count[site_index]),
+                              float(never_freed_bytes[site_index]) / Constant.B_TO_KB])
+            leak_detail.append({"device_type": device_tag, "process_id": device_pid, "name": name,
+                                "call_stack": call_stack,
+                                "growth_rate(KB/step)": float(slope[index]) / Constant.B_TO_KB,
+                                "r_squared": float(r_squared[index]),
+                                "steps": [{"step": step_id, "live(KB)": float(live) / Constant.B_TO_KB,
+                                           "retained(KB)": float(retained) / Constant.B_TO_KB}
+                                          for step_id, live, retained in zip(step_ids, live_bytes[index].tolist(),
+                                                                             step_retained[index].tolist())]})
+        FileManager.create_csv_file(output_path, leak_rows, self.MEMORY_LEAK, self.HEADERS,
+                                    columnar_export=kwargs.get(Constant.COLUMNAR_EXPORT, False))
+        FileManager.create_json_file_by_path(os.path.join(output_path, self.MEMORY_LEAK_DETAIL), leak_detail,
+                                             indent=4)
+
+    def _get_block_site(self, memory_block_table: MemoryBlockTable, torch_op_tree: any) -> tuple:
+        """
+        Returns: site id of every block and the device tag, process id, name and call stack of every site.
+        the blocks allocated outside the ops or before the profiling have an empty name
+        """
+        block_op = memory_block_table.block_op
+        has_op = block_op != MemoryBlockTable.INVALID_INDEX
+        name_ids = np.full(len(block_op), MemoryBlockTable.INVALID_INDEX, dtype=np.int64)
+        stack_ids = np.full(len(block_op), MemoryBlockTable.INVALID_INDEX, dtype=np.int64)
+        if np.any(has_op):
+            torch_op_table = torch_op_tree.torch_op_table
+            name_ids[has_op] = torch_op_table.tlv_column(Constant.OP_NAME)[block_op[has_op]]
+            stack_ids[has_op] = torch_op_table.tlv_column(Constant.CALL_STACK)[block_op[has_op]]
+        # the string ids start from -1, so the triple is packed into one key shifted by one
+        name_num, stack_num = int(np.max(name_ids, initial=-1)) + 2, int(np.max(stack_ids, initial=-1)) + 2
+        block_key = (memory_block_table.block_device * name_num + name_ids + 1) * stack_num + stack_ids + 1
+        unique_keys, site = np.unique(block_key, return_inverse=True)
+        site_keys = []
+        for site_key in unique_keys.tolist():
+            device_name, stack_id = divmod(site_key, stack_num)
+            device, name_id = divmod(device_name, name_num)
+            site_keys.append((memory_block_table.get_device_tag(device), memory_block_table.get_device_pid(device),
+                              torch_op_tree.torch_op_table.get_string(name_id - 1) if name_id > 0 else "",
+                              torch_op_tree.torch_op_table.get_string(stack_id - 1) if stack_id > 0 else ""))
+        return site.reshape(-1), site_keys
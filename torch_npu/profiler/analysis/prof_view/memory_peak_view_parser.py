@@ -0,0 +1,144 @@
+import os
+
+import numpy as np
+
+from ..prof_common_func.constant import Constant
+from ..prof_common_func.file_manager import FileManager
+from ..prof_common_func.global_var import GlobalVar
+from ..prof_common_func.memory_block_table import MemoryBlockTable
+from ..prof_parse.memory_block_parser import MemoryBlockParser
+from ..prof_view.base_view_parser import BaseViewParser
+
+
+class MemoryPeakViewParser(BaseViewParser):
+    """
+    peaks of the pta allocated memory of every device, over the whole profiling and in every step, with the
+    blocks live at each peak attributed to the torch ops and call stacks allocating them. the timeline reports
+    the allocated, reserved and reconstructed live memory with the reserved minus allocated fragmentation gap,
+    reduced to the max of every time bucket
+    """
+    MEMORY_PEAK = "memory_peak.json"
+    MEMORY_TIMELINE = "memory_timeline.csv"
+    HEADERS_TIMELINE = ["Device Type", "Process Id", "Start Time(us)", "End Time(us)", "Record Count",
+                        "Max Allocated(MB)", "Max Reserved(MB)", "Max Live Blocks(MB)", "Max Fragmentation(MB)"]
+    TIMELINE_BUCKET_NUM = 1000
+    # the live blocks of a peak are reported for the largest allocation sites only
+    PEAK_SITE_NUM = 50
+
+    def __init__(self, profiler_path: str):
+        super().__init__(profiler_path)
+
+    def generate_view(self, output_path: str, **kwargs) -> None:
+        torch_op_tree = GlobalVar.torch_op_tree_node
+        memory_block_table = MemoryBlockParser(self._profiler_path).build_memory_block_table(torch_op_tree)
+        if not len(memory_block_table):
+            return
+        live_bytes = memory_block_table.get_live_bytes()
+        timeline_rows, peak_pos_list = [], []
+        for device in range(len(memory_block_table.device_list)):
+            device_pos = np.flatnonzero(memory_block_table.record_device == device)
+            timeline_rows.extend(self._get_timeline_rows(memory_block_table, device, device_pos, live_bytes))
+            peak_pos_list.extend(self._get_peak_pos_list(memory_block_table, device_pos))
+        # the live blocks of all peaks are found in one sweep
+        block_index_list = memory_block_table.get_live_block_index([record_pos for _, record_pos in peak_pos_list])
+        peak_list = [self._get_peak(memory_block_table, torch_op_tree, step_id, record_pos, block_index, live_bytes)
+                     for (step_id, record_pos), block_index in zip(peak_pos_list, block_index_list)]
+        FileManager.create_csv_file(output_path, timeline_rows, self.MEMORY_TIMELINE, self.HEADERS_TIMELINE,
+                                    columnar_export=kwargs.get(Constant.COLUMNAR_EXPORT, False))
+        FileManager.create_json_file_by_path(os.path.join(output_path, self.MEMORY_PEAK), peak_list, indent=4)
+
+    def _get_timeline_rows(self, memory_block_table: MemoryBlockTable, device: int, device_pos: np.ndarray,
+                           live_bytes: np.ndarray) -> list:
+        """
+        the records of the device are cut into time buckets of the same width, and every column is reduced to
+        its max over the bucket with one reduceat
+        """
+        record_time = memory_block_table.record_time[device_pos]
+        allocated = memory_block_table.record_allocated[device_pos].astype(np.float64)
+        reserved = memory_block_table.record_reserved[device_pos].astype(np.float64)
+        bucket_width = (record_time[-1] - record_time[0]) / self.TIMELINE_BUCKET_NUM
+        if bucket_width > 0:
+            bucket = np.minimum(((record_time - record_time[0]) / bucket_width).astype(np.int64),
+                                self.TIMELINE_BUCKET_NUM - 1)
+        else:
+            bucket = np.zeros(len(record_time), dtype=np.int64)
+        _, bucket_start = np.unique(bucket, return_index=True)
+        bucket_end = np.append(bucket_start[1:], len(record_time)) - 1
+        columns = [np.maximum.reduceat(value, bucket_start) / Constant.B_TO_MB
+                   for value in (allocated, reserved, live_bytes[device_pos], reserved - allocated)]
+        device_tag = memory_block_table.get_device_tag(device)
+        device_pid = memory_block_table.get_device_pid(device)
+        return [[device_tag, device_pid, float(record_time[start]), float(record_time[end]), int(end - start + 1)] +
+                [float(column[index]) for column in columns]
+                for index, (start, end) in enumerate(zip(bucket_start.tolist(), bucket_end.tolist()))]
+
+    @classmethod
+    def _get_peak_pos_list(cls, memory_block_table: MemoryBlockTable, device_pos: np.ndarray) -> list:
+        """
+        Returns: step id and record position of the peaks of the device. the peak of the device is the record of
+        the max total allocated, the first one on a tie, and so is the peak of every step over the records of
+        the step
+        """
+        allocated = memory_block_table.record_allocated[device_pos]
+        peak_pos_list = [(None, int(device_pos[np.argmax(allocated)]))]
+        record_step = memory_block_table.record_step[device_pos]
+        in_step = np.flatnonzero(record_step != MemoryBlockTable.INVALID_INDEX)
+        if len(in_step):
+            step_ids = memory_block_table.step_ids
+            order = in_step[np.lexsort((in_step, -allocated[in_step], record_step[in_step]))]
+            first = np.ones(len(order), dtype=bool)
+            first[1:] = record_step[order][1:] != record_step[order][:-1]
+            peak_pos_list.extend((step_ids[int(record_step[index])], int(device_pos[index]))
+                                 for index in order[first].tolist())
+        return peak_pos_list
+
+    def _get_peak(self, memory_block_table: MemoryBlockTable, torch_op_tree: any, step_id: any, record_pos: int,
+                  block_index: np.ndarray, live_bytes: np.ndarray) -> dict:
+        device = int(memory_block_table.record_device[record_pos])
+        allocated = int(memory_block_table.record_allocated[record_pos])
+        reserved = int(memory_block_table.record_reserved[record_pos])
+        return {"device_type": memory_block_table.get_device_tag(device),
+                "process_id": memory_block_table.get_device_pid(device),
+                "step": step_id,
+                "time(us)": float(memory_block_table.record_time[record_pos]),
+                "allocated(MB)": allocated / Constant.B_TO_MB,
+                "reserved(MB)": reserved / Constant.B_TO_MB,
+                "fragmentation(MB)": (reserved - allocated) / Constant.B_TO_MB,
+                "fragmentation_ratio": (reserved - allocated) / reserved if reserved > 0 else 0.0,
+                "live_blocks(MB)": float(live_bytes[record_pos]) / Constant.B_TO_MB,
+                "live_block_count": len(block_index),
+                "allocation_sites": self._get_allocation_sites(memory_block_table, torch_op_tree, block_index)}
+
+    def _get_allocation_sites(self, memory_block_table: MemoryBlockTable, torch_op_tree: any,
+                              block_index: np.ndarray) -> list:
+        """
+        Returns: live blocks grouped by the name and call stack of their op, the largest first. the blocks
+        allocated outside the ops or before the profiling have an empty name
+        """
+        if not len(block_index):
+            return []
+        block_op = memory_block_table.block_op[block_index]
+        block_size = memory_block_table.block_size[block_index]
+        has_op = block_op != MemoryBlockTable.INVALID_INDEX
+        name_ids = np.full(len(block_index), MemoryBlockTable.INVALID_INDEX, dtype=np.int64)
+        stack_ids = np.full(len(block_index), MemoryBlockTable.INVALID_INDEX, dtype=np.int64)
+        if np.any(has_op):
+            torch_op_table = torch_op_tree.torch_op_table
+            name_ids[has_op] = torch_op_table.tlv_column(Constant.OP_NAME)[block_op[has_op]]
+            stack_ids[has_op] = torch_op_table.tlv_column(Constant.CALL_STACK)[block_op[has_op]]
+        # the string ids start from -1, so the pair is packed into one key shifted by one
+        stack_num = int(np.max(stack_ids)) + 2
+        unique_keys, inverse = np.unique((name_ids + 1) * stack_num + stack_ids + 1, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        site_count = np.bincount(inverse, minlength=len(unique_keys))
+        site_size = np.bincount(inverse, weights=block_size, minlength=len(unique_keys))
+        site_list = []
+        for index in np.argsort(-site_size, kind="stable")[:self.PEAK_SITE_NUM].tolist():
+            name_id, stack_id = divmod(int(unique_keys[index]), stack_num)
+            name_id, stack_id = name_id - 1, stack_id - 1
+            site_list.append({
+                "name": torch_op_tree.torch_op_table.get_string(name_id) if name_id >= 0 else "",
+                "call_stack": torch_op_tree.torch_op_table.get_string(stack_id) if stack_id >= 0 else "",
+                "block_count": int(site_count[index]),
+                "size(MB)": float(site_size[index]) / Constant.B_TO_MB})
+        return site_list
@@ -1,13 +1,15 @@
 from warnings import warn
-from math import ceil
 import os
 
+import numpy as np
+
 from ..prof_view.base_view_parser import BaseViewParser
 from ..prof_common_func.file_tag import FileTag
 from ..prof_parse.fwk_file_parser import FwkFileParser
 from ..prof_common_func.file_manager import FileManager
 from ..prof_bean.memory_use_bean import MemoryUseBean
 from ..prof_common_func.constant import Constant
+from ..prof_common_func.interval_index import IntervalIndex
 from ..prof_bean.npu_mem_bean import NpuMemoryBean
 from ..prof_bean.ge_op_memory_bean import GeOpMemoryBean
 from ..prof_bean.ge_memory_record_bean import GeMemoryRecordBean
@@ -21,7 +23,6 @@ class MemoryViewParser(BaseViewParser):
     HEADERS_RECORD = ["Component", "Timestamp(us)", "Total Allocated(MB)", "Total Reserved(MB)", "Device Type"]
     OPERATOR_MEMORY = "operator_memory.csv"
     MEMORY_RECORD = "memory_record.csv"
-    MAX_FIND_LAYERS = 100
 
     def __init__(self, profiler_path: str):
         super().__init__(profiler_path)
@@ -41,18 +42,6 @@ class MemoryViewParser(BaseViewParser):
             return True
         return False
 
-    @staticmethod
-    def _find_torch_ops_by_binary_search(ts: float, torch_ops: list):
-        right = len(torch_ops) - 1
-        left = 0
-        while right > left:
-            mid = left + ceil((right - left) / 2)
-            if ts >= torch_ops[mid].ts:
-                left = mid
-            else:
-                right = mid - 1
-        return left
-
     @staticmethod
     def _get_data_from_file(file_set: set, file_type_bean: any, bean_list: bool = False) -> list:
         data_list = []
@@ -84,9 +73,10 @@ class MemoryViewParser(BaseViewParser):
         self._add_memory_from_cann()
         self._add_pta_memory_data()
         self._add_pta_ge_record_data()
-        FileManager.create_csv_file(output_path, self.memory_data, self.OPERATOR_MEMORY, self.HEADERS_OPERATOR)
+        FileManager.create_csv_file(output_path, self.memory_data, self.OPERATOR_MEMORY, self.HEADERS_OPERATOR,
+                                    columnar_export=kwargs.get(Constant.COLUMNAR_EXPORT, False))
         FileManager.create_csv_file(output_path, self.size_record_list + self.component_list, self.MEMORY_RECORD,
-                                    self.HEADERS_RECORD)
+                                    self.HEADERS_RECORD, columnar_export=kwargs.get(Constant.COLUMNAR_EXPORT, False))
 
     def _add_pta_ge_record_data(self):
         """
@@ -153,24 +143,21 @@ class MemoryViewParser(BaseViewParser):
         ge_op_memory_file = CANNFileParser(self._profiler_path).get_file_list_by_type(CANNDataEnum.GE_OPERATOR_MEMORY)
         self.memory_data.extend(self._get_data_from_file(ge_op_memory_file, GeOpMemoryBean))
 
-    def _find_matched_torch_op_name(self, mem_start_ts: int, torch_ops: list) -> str:
-        matched_torch_op_idx = self._find_torch_ops_by_binary_search(mem_start_ts, torch_ops)
-        cnt = 0
-        while matched_torch_op_idx >= 0 and \
-                torch_ops[matched_torch_op_idx].ts + torch_ops[matched_torch_op_idx].dur < mem_start_ts:
-            matched_torch_op_idx -= 1
-            cnt += 1
-            if cnt >= self.MAX_FIND_LAYERS or matched_torch_op_idx < 0:
-                warn(f"Can't find matched torch ops for a memory record!")
-                return ""
-        return torch_ops[matched_torch_op_idx].name
+    @staticmethod
+    def _find_matched_torch_op_names(memory_records: list, torch_ops: list, torch_op_index: IntervalIndex) -> list:
+        """
+        Returns: name of the innermost torch op enclosing every memory record, None if there is none.
+        all records of a process are looked up in one call
+        """
+        memory_ts = np.array([memory_record.time_us for memory_record in memory_records], dtype=np.float64)
+        return [torch_ops[op_index].name if op_index != IntervalIndex.INVALID_INDEX else None
+                for op_index in torch_op_index.find_innermost(memory_ts).tolist()]
 
     def _combine_memory_record(self: any, allocate_record: MemoryUseBean,
-                               release_record: MemoryUseBean, torch_ops: list) -> list:
+                               release_record: MemoryUseBean, torch_name: str) -> list:
         if not allocate_record:
             return ["", release_record.alloc_size, None, release_record.time_us, None, None, None,
                     release_record.total_allocated, release_record.total_reserved, release_record.device_tag]
-        torch_name = self._find_matched_torch_op_name(allocate_record.time_us, torch_ops)
         if release_record:
             return [torch_name, allocate_record.alloc_size, allocate_record.time_us, release_record.time_us,
                     release_record.time_us - allocate_record.time_us, allocate_record.total_allocated,
@@ -201,18 +188,28 @@ class MemoryViewParser(BaseViewParser):
                 warn(f"Lack of torch ops to connect memory record, whose process id is {pid_key}")
                 continue
             torch_ops = sorted(torch_ops, key=lambda x: x.ts)
+            torch_op_index = IntervalIndex([torch_op.ts for torch_op in torch_ops],
+                                           [torch_op.ts + torch_op.dur for torch_op in torch_ops], closed=True)
+            torch_names = self._find_matched_torch_op_names(memory_records, torch_ops, torch_op_index)
+            # ptr -> allocate record and the name of its torch op
             memory_dict = {}
-            for memory_record in memory_records:
+            unmatched_count = 0
+            for memory_record, torch_name in zip(memory_records, torch_names):
                 if memory_record.ptr not in memory_dict or \
-                        self._check_whether_invalid_match(memory_dict.get(memory_record.ptr), memory_record):
-                    memory_dict[memory_record.ptr] = memory_record
+                        self._check_whether_invalid_match(memory_dict.get(memory_record.ptr)[0], memory_record):
+                    memory_dict[memory_record.ptr] = (memory_record, torch_name)
                 else:
-                    pta_memory_record.append(
-                        self._combine_memory_record(memory_dict.get(memory_record.ptr), memory_record, torch_ops))
-                    del memory_dict[memory_record.ptr]
-            for memory_record in memory_dict.values():
+                    allocate_record, allocate_name = memory_dict.pop(memory_record.ptr)
+                    unmatched_count += allocate_name is None
+                    pta_memory_record.append(self._combine_memory_record(allocate_record, memory_record,
+                                                                         allocate_name or ""))
+            for memory_record, torch_name in memory_dict.values():
                 if memory_record.alloc_size > 0:
-                    pta_memory_record.append(self._combine_memory_record(memory_record, None, torch_ops))
+                    unmatched_count += torch_name is None
+                    pta_memory_record.append(self._combine_memory_record(memory_record, None, torch_name or ""))
                 else:
-                    pta_memory_record.append(self._combine_memory_record(None, memory_record, torch_ops))
+                    pta_memory_record.append(self._combine_memory_record(None, memory_record, ""))
+            if unmatched_count:
+                warn(f"Can't find matched torch ops for {unmatched_count} memory records "
+                     f"whose process id is {pid_key}!")
         self.memory_data.extend(pta_memory_record)
@@ -0,0 +1,202 @@
+import os
+
+import numpy as np
+
+from ..prof_common_func.column_table import StringTable
+from ..prof_common_func.constant import Constant
+from ..prof_common_func.file_manager import FileManager
+from ..prof_common_func.global_var import GlobalVar
+from ..prof_common_func.torch_op_tree import TorchOpTree
+from ..prof_parse.memory_block_parser import MemoryBlockParser
+from ..prof_view.base_view_parser import BaseViewParser
+from ..prof_view.memory_peak_view_parser import MemoryPeakViewParser
+
+
+class ModuleViewParser(BaseViewParser):
+    """
+    torch op time and pta memory allocations rolled up the module hierarchy recorded with with_modules.
+    an op belongs to the innermost module of its own hierarchy or of its nearest ancestor op, exclusive numbers
+    cover the ops of a module itself and inclusive numbers add those of its sub modules
+    """
+    # the memory block table is built and cached once by the memory peak view, and loaded from the cache here
+    DEPENDENCIES = [MemoryPeakViewParser]
+    MODULE_VIEW = "module_statistic.csv"
+    MODULE_TYPE_VIEW = "module_type_statistic.csv"
+    MODULE_TREE = "module_hierarchy.json"
+    METRIC_NAMES = ["Op Count", "Host Duration(us)", "Device Duration(us)", "Device Duration With AICore(us)",
+                    "Allocation Count", "Allocated Memory(KB)"]
+    HEADERS_MODULE = ["Module", "Module Type", "Depth"] + \
+                     [f"{scope} {name}" for name in METRIC_NAMES for scope in ("Exclusive", "Inclusive")]
+    HEADERS_MODULE_TYPE = ["Module Type", "Instance Count"] + \
+                          [f"{scope} {name}" for name in METRIC_NAMES for scope in ("Exclusive", "Inclusive")]
+    COUNT_METRIC_INDEXES = (0, 4)
+    HIERARCHY_SEPARATOR = ";"
+    PATH_SEPARATOR = "/"
+
+    def __init__(self, profiler_path: str):
+        super().__init__(profiler_path)
+        # module path tuple -> module id, a module instance is identified by its path from the top module
+        self._module_dict = {}
+        self._module_path_list = []
+        self._module_parent_list = []
+
+    @classmethod
+    def _get_module_type(cls, module_entry: str) -> str:
+        """
+        the entries are "Type::method" or "name(Type)::method"
+        """
+        left, right = module_entry.find("("), module_entry.find(")")
+        if -1 < left < right:
+            return module_entry[left + 1: right]
+        return module_entry.split("::")[0]
+
+    def generate_view(self, output_path: str, **kwargs) -> None:
+        torch_op_tree = GlobalVar.torch_op_tree_node
+        if not len(torch_op_tree):
+            return
+        op_module = self._get_op_module(torch_op_tree)
+        if not np.any(op_module != TorchOpTree.INVALID_INDEX):
+            return
+        module_num = len(self._module_path_list)
+        has_module = op_module != TorchOpTree.INVALID_INDEX
+        owner = op_module[has_module]
+        alloc_count, alloc_size = self._get_op_allocations(torch_op_tree)
+        op_metrics = [np.ones(len(op_module)), torch_op_tree.host_self_dur,
+                      torch_op_tree.device_dur[TorchOpTree.DEVICE_SELF],
+                      torch_op_tree.device_dur[TorchOpTree.DEVICE_SELF_WITH_AI_CORE], alloc_count,
+                      alloc_size / Constant.B_TO_KB]
+        exclusive = np.stack([np.bincount(owner, weights=metric[has_module], minlength=module_num)
+                              for metric in op_metrics], axis=1)
+        inclusive = exclusive.copy()
+        module_depth = np.array([len(path) for path in self._module_path_list], dtype=np.int64)
+        # the children are folded into their parents from the deepest modules up
+        for module_id in np.argsort(-module_depth, kind="stable").tolist():
+            parent_id = self._module_parent_list[module_id]
+            if parent_id != TorchOpTree.INVALID_INDEX:
+                inclusive[parent_id] += inclusive[module_id]
+
+        module_type_list = [self._get_module_type(path[-1]) for path in self._module_path_list]
+        module_order = sorted(range(module_num), key=lambda module_id: self._module_path_list[module_id])
+        module_rows = [[self.PATH_SEPARATOR.join(self._module_path_list[module_id]), module_type_list[module_id],
+                        int(module_depth[module_id]) - 1] +
+                       self._get_metric_row(exclusive[module_id], inclusive[module_id])
+                       for module_id in module_order]
+        FileManager.create_csv_file(output_path, module_rows, self.MODULE_VIEW, self.HEADERS_MODULE,
+                                    columnar_export=kwargs.get(Constant.COLUMNAR_EXPORT, False))
+        FileManager.create_csv_file(output_path, self._get_module_type_rows(module_type_list, exclusive, inclusive),
+                                    self.MODULE_TYPE_VIEW, self.HEADERS_MODULE_TYPE,
+                                    columnar_export=kwargs.get(Constant.COLUMNAR_EXPORT, False))
+        FileManager.create_json_file_by_path(os.path.join(output_path, self.MODULE_TREE),
+                                             self._get_module_tree(module_order, module_type_list, exclusive,
+                                                                   inclusive))
+
+    def _get_op_module(self, torch_op_tree: TorchOpTree) -> np.ndarray:
+        """
+        Returns: module id of every op, INVALID_INDEX for the ops outside any module
+        """
+        torch_op_table = torch_op_tree.torch_op_table
+        hierarchy_ids = torch_op_table.tlv_column(Constant.MODULE_HIERARCHY)
+        op_module = np.full(len(hierarchy_ids), TorchOpTree.INVALID_INDEX, dtype=np.int64)
+        has_hierarchy = hierarchy_ids != StringTable.INVALID_ID
+        if not np.any(has_hierarchy):
+            return op_module
+        unique_ids, inverse = np.unique(hierarchy_ids[has_hierarchy], return_inverse=True)
+        hierarchy_module = np.array([self._intern_module_path(torch_op_table.get_string(hierarchy_id))
+                                     for hierarchy_id in unique_ids.tolist()], dtype=np.int64)
+        op_module[has_hierarchy] = hierarchy_module[inverse]
+        # the ops without a hierarchy of their own inherit the one of their nearest ancestor, a level per pass
+        parent = torch_op_tree.parent
+        while True:
+            missing = np.flatnonzero((op_module == TorchOpTree.INVALID_INDEX) & (parent != TorchOpTree.INVALID_INDEX))
+            inherited = op_module[parent[missing]]
+            found = inherited != TorchOpTree.INVALID_INDEX
+            if not np.any(found):
+                return op_module
+            op_module[missing[found]] = inherited[found]
+
+    def _intern_module_path(self, module_hierarchy: str) -> int:
+        """
+        Returns: id of the innermost module of the hierarchy, its ancestors are interned along the way
+        """
+        module_id = TorchOpTree.INVALID_INDEX
+        module_path = ()
+        for module_entry in module_hierarchy.split(self.HIERARCHY_SEPARATOR):
+            module_entry = module_entry.strip()
+            if not module_entry:
+                continue
+            module_path += (module_entry,)
+            parent_id = module_id
+            module_id = self._module_dict.get(module_path)
+            if module_id is None:
+                module_id = len(self._module_path_list)
+                self._module_dict[module_path] = module_id
+                self._module_path_list.append(module_path)
+                self._module_parent_list.append(parent_id)
+        return module_id
+
+    def _get_op_allocations(self, torch_op_tree: TorchOpTree) -> tuple:
+        """
+        Returns: count and size in bytes of the npu allocations of every op, an allocation belongs to the
+        innermost op of the same process enclosing its time
+        """
+        memory_block_table = MemoryBlockParser(self._profiler_path).build_memory_block_table(torch_op_tree)
+        block_op = memory_block_table.block_op
+        found = block_op != TorchOpTree.INVALID_INDEX
+        alloc_count = np.bincount(block_op[found], minlength=len(torch_op_tree)).astype(np.float64)
+        alloc_size = np.bincount(block_op[found], weights=memory_block_table.block_size[found],
+                                 minlength=len(torch_op_tree))
+        return alloc_count, alloc_size
+
+    def _get_module_type_rows(self, module_type_list: list, exclusive: np.ndarray, inclusive: np.ndarray) -> list:
+        """
+        the inclusive numbers of a type skip the instances nested in another instance of the same type
+        """
+        type_dict = {}
+        for module_id, module_type in enumerate(module_type_list):
+            type_metrics = type_dict.setdefault(module_type, [0, np.zeros(exclusive.shape[1]),
+                                                              np.zeros(inclusive.shape[1])])
+            type_metrics[0] += 1
+            type_metrics[1] += exclusive[module_id]
+            if not self._has_same_type_ancestor(module_id, module_type, module_type_list):
+                type_metrics[2] += inclusive[module_id]
+        type_rows = [[module_type, instance_num] + self._get_metric_row(type_exclusive, type_inclusive)
+                     for module_type, (instance_num, type_exclusive, type_inclusive) in type_dict.items()]
+        # the types costing the most device time come first
+        type_rows.sort(key=lambda row: row[7], reverse=True)
+        return type_rows
+
+    def _has_same_type_ancestor(self, module_id: int, module_type: str, module_type_list: list) -> bool:
+        parent_id = self._module_parent_list[module_id]
+        while parent_id != TorchOpTree.INVALID_INDEX:
+            if module_type_list[parent_id] == module_type:
+                return True
+            parent_id = self._module_parent_list[parent_id]
+        return False
+
+    def _get_module_tree(self, module_order: list, module_type_list: list, exclusive: np.ndarray,
+                         inclusive: np.ndarray) -> list:
+        module_node_dict = {}
+        top_module_list = []
+        # the path order puts every parent before its children
+        for module_id in module_order:
+            metric_row = self._get_metric_row(exclusive[module_id], inclusive[module_id])
+            module_node = {"name": self._module_path_list[module_id][-1], "type": module_type_list[module_id],
+                           "exclusive": dict(zip(self.METRIC_NAMES, metric_row[0::2])),
+                           "inclusive": dict(zip(self.METRIC_NAMES, metric_row[1::2])),
+                           "children": []}
+            module_node_dict[module_id] = module_node
+            parent_id = self._module_parent_list[module_id]
+            if parent_id == TorchOpTree.INVALID_INDEX:
+                top_module_list.append(module_node)
+            else:
+                module_node_dict[parent_id]["children"].append(module_node)
+        return top_module_list
+
+    @classmethod
+    def _get_metric_row(cls, exclusive: np.ndarray, inclusive: np.ndarray) -> list:
+        metric_row = []
+        for index, (exclusive_value, inclusive_value) in enumerate(zip(exclusive.tolist(), inclusive.tolist())):
+            if index in cls.COUNT_METRIC_INDEXES:
+                exclusive_value, inclusive_value = int(exclusive_value), int(inclusive_value)
+            metric_row.extend([exclusive_value, inclusive_value])
+        return metric_row
@@ -0,0 +1,141 @@
+import numpy as np
+
+from ..prof_common_func.column_table import StringTable
+from ..prof_common_func.constant import Constant
+from ..prof_common_func.file_manager import FileManager
+from ..prof_common_func.global_var import GlobalVar
+from ..prof_common_func.path_manager import ProfilerPathManager
+from ..prof_common_func.torch_op_tree import TorchOpTree
+from ..prof_parse.cann_file_parser import CANNFileParser
+from ..prof_parse.fwk_cann_relation_parser import FwkCANNRelationParser
+from ..prof_view.base_view_parser import BaseViewParser
+from ..profiler_config import ProfilerConfig
+
+
+class OperatorStatisticParser(BaseViewParser):
+    """
+    operator_details.csv aggregated per op name, and optionally per input shapes or per innermost call stack
+    frames. the groups come from one np.unique over the interned string id columns of the op tree, and every
+    statistic is a reduction over the metric values sorted by group
+    """
+    OPERATOR_STATISTIC = "operator_statistic.csv"
+    METRIC_NAMES = ["Host Self Duration(us)", "Host Total Duration(us)", "Device Self Duration(us)",
+                    "Device Total Duration(us)"]
+    STAT_NAMES = ["Total", "Avg", "Min", "Max", "P50", "P99"]
+    QUANTILES = (0.5, 0.99)
+    STACK_SEPARATOR = ";"
+
+    def __init__(self, profiler_path: str):
+        super().__init__(profiler_path)
+
+    @classmethod
+    def get_profiler_statistic(cls, profiler_path: str, group_by_input_shape: bool = False,
+                               group_by_stack_n: int = 0) -> list:
+        """
+        Returns: statistic rows of a profiling result as dicts keyed by the csv headers
+        """
+        profiler_path = ProfilerPathManager.get_realpath(profiler_path)
+        try:
+            ProfilerConfig().load_info(profiler_path)
+            if ProfilerPathManager.get_cann_path(profiler_path):
+                CANNFileParser(profiler_path).export_cann_profiling(ProfilerConfig().data_simplification)
+            torch_op_tree = FwkCANNRelationParser(profiler_path).build_torch_op_tree()
+            headers, rows = cls.get_statistic(torch_op_tree, group_by_input_shape, group_by_stack_n)
+        finally:
+            # it runs in the training process, which must not keep the parsed timeline of the profiling data
+            CANNFileParser.clear_cache()
+        return [dict(zip(headers, row)) for row in rows]
+
+    @classmethod
+    def get_statistic(cls, torch_op_tree: TorchOpTree, group_by_input_shape: bool = False,
+                      group_by_stack_n: int = 0) -> tuple:
+        """
+        Returns: headers and rows ordered by the total device self time, then by the total host self time
+        """
+        headers = ["Name"] + (["Input Shapes"] if group_by_input_shape else []) + \
+                  (["Call Stack"] if group_by_stack_n > 0 else []) + ["Count"] + \
+                  [f"{stat} {name}" for name in cls.METRIC_NAMES for stat in cls.STAT_NAMES]
+        if not len(torch_op_tree):
+            return headers, []
+        torch_op_table = torch_op_tree.torch_op_table
+        name_ids = torch_op_table.tlv_column(Constant.OP_NAME)
+        op_index = np.flatnonzero(~np.isin(name_ids, cls._get_step_name_ids(torch_op_table, name_ids)))
+        if not len(op_index):
+            return headers, []
+        key_columns = [name_ids[op_index]]
+        if group_by_input_shape:
+            key_columns.append(torch_op_table.tlv_column(Constant.INPUT_SHAPES)[op_index])
+        stack_strings = []
+        if group_by_stack_n > 0:
+            stack_key, stack_strings = cls._get_stack_key(torch_op_table.tlv_column(Constant.CALL_STACK)[op_index],
+                                                          torch_op_table, group_by_stack_n)
+            key_columns.append(stack_key)
+        unique_keys, group = np.unique(np.stack(key_columns, axis=1), axis=0, return_inverse=True)
+        group = group.reshape(-1)
+        group_num = len(unique_keys)
+        count = np.bincount(group, minlength=group_num)
+        metric_values = [torch_op_tree.host_self_dur, torch_op_tree.host_total_dur,
+                         torch_op_tree.device_dur[TorchOpTree.DEVICE_SELF],
+                         torch_op_tree.device_dur[TorchOpTree.DEVICE_TOTAL]]
+        group_stats = [cls._get_group_stats(values[op_index], group, count) for values in metric_values]
+
+        rows = []
+        # device self total first, then host self total
+        for index in np.lexsort((-group_stats[0][0], -group_stats[2][0])).tolist():
+            row = [torch_op_table.get_string(int(unique_keys[index][0]))]
+            if group_by_input_shape:
+                row.append(torch_op_table.get_string(int(unique_keys[index][1])))
+            if group_by_stack_n > 0:
+                row.append(stack_strings[int(unique_keys[index][-1])])
+            row.append(int(count[index]))
+            for stats in group_stats:
+                row.extend(stats[:, index].tolist())
+            rows.append(row)
+        return headers, rows
+
+    def generate_view(self, output_path: str, **kwargs) -> None:
+        headers, rows = self.get_statistic(GlobalVar.torch_op_tree_node)
+        FileManager.create_csv_file(output_path, rows, self.OPERATOR_STATISTIC, headers,
+                                    columnar_export=kwargs.get(Constant.COLUMNAR_EXPORT, False))
+
+    @classmethod
+    def _get_step_name_ids(cls, torch_op_table: any, name_ids: np.ndarray) -> list:
+        return [name_id for name_id in np.unique(name_ids).tolist()
+                if torch_op_table.get_string(name_id).find("ProfilerStep#") != -1]
+
+    @classmethod
+    def _get_stack_key(cls, stack_ids: np.ndarray, torch_op_table: any, stack_n: int) -> tuple:
+        """
+        Returns: id of the innermost stack_n frames of every op and the strings of those ids,
+        every distinct call stack is cut only once
+        """
+        unique_ids, inverse = np.unique(stack_ids, return_inverse=True)
+        stack_table = StringTable()
+        unique_keys = []
+        for stack_id in unique_ids.tolist():
+            if stack_id == StringTable.INVALID_ID:
+                unique_keys.append(stack_table.intern(""))
+                continue
+            frames = torch_op_table.get_string(stack_id).split(cls.STACK_SEPARATOR)[:stack_n]
+            unique_keys.append(stack_table.intern(cls.STACK_SEPARATOR.join(frames)))
+        return np.array(unique_keys, dtype=np.int64)[inverse.reshape(-1)], stack_table.string_list
+
+    @classmethod
+    def _get_group_stats(cls, values: np.ndarray, group: np.ndarray, count: np.ndarray) -> np.ndarray:
+        """
+        Returns: array of total, avg, min, max and the quantiles of every group, one row per statistic.
+        the quantiles interpolate linearly between the sorted values, as np.quantile does
+        """
+        order = np.lexsort((values, group))
+        sorted_values = values[order]
+        group_start = np.concatenate(([0], np.cumsum(count)[:-1]))
+        total = np.bincount(group, weights=values, minlength=len(count))
+        stats = [total, total / count, sorted_values[group_start], sorted_values[group_start + count - 1]]
+        for quantile in cls.QUANTILES:
+            position = quantile * (count - 1)
+            lower = np.floor(position).astype(np.int64)
+            upper = np.minimum(lower + 1, count - 1)
+            lower_values = sorted_values[group_start + lower]
+            upper_values = sorted_values[group_start + upper]
+            stats.append(lower_values + (upper_values - lower_values) * (position - lower))
+        return np.stack(stats)
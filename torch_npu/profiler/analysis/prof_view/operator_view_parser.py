@@ -1,3 +1,4 @@
+from ..prof_common_func.constant import Constant
 from ..prof_common_func.file_manager import FileManager
 from ..prof_common_func.global_var import GlobalVar
 from ..prof_view.base_view_parser import BaseViewParser
@@ -27,4 +28,5 @@ class OperatorViewParser(BaseViewParser):
                                     torch_op_node.device_total_dur_with_ai_core]
             index += 1
         del operator_list[index:]
-        FileManager.create_csv_file(output_path, operator_list, self.OPERATOR_VIEW, self.OPERATOR_HEADERS)
+        FileManager.create_csv_file(output_path, operator_list, self.OPERATOR_VIEW, self.OPERATOR_HEADERS,
+                                    columnar_export=kwargs.get(Constant.COLUMNAR_EXPORT, False))
@@ -13,7 +13,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numpy as np
+
 from ..prof_common_func.global_var import GlobalVar
+from ..prof_common_func.overlap_analyzer import OverlapAnalyzer
+from ..prof_common_func.step_index import StepIndex
 from ..prof_view.base_view_parser import BaseViewParser
 from ..prof_common_func.file_manager import FileManager
 
@@ -23,85 +27,96 @@ class TraceStepTimeParser(BaseViewParser):
                 'Communication(Not Overlapped)': 'comunNotOverlp', 'hcom_receive': 'bubble'}
     title = ['Step', 'Computing', 'Communication(Not Overlapped)', 'Overlapped', 'Communication', 'Free', 'Stage',
              'Bubble', 'Communication(Not Overlapped and Exclude Receive)']
+    stream_overlap_title = ['Step', 'Process Id', 'Process', 'Stream', 'Computing', 'Communication', 'Overlapped',
+                            'Communication(Not Overlapped)', 'Free']
 
     @classmethod
     def is_float_num(cls, num):
         try:
             float(num)
             return True
-        except VauleError:
+        except (TypeError, ValueError):
             return False
 
     @classmethod
-    def count_time(cls, addtype, addtime, durtime, step_list, save_time):
-        cur_step = None
-        if not cls.is_float_num(addtime) or not cls.is_float_num(durtime):
-            print('Ts or dur format error!')
-            return
-        addtime = float(addtime)
-        durtime = float(durtime)
-        for step in step_list:
-            if step[1] < addtime and step[2] > addtime:
-                cur_step = step[0]
-                break
-        for step in step_list:
-            if cur_step == step[0]:
-                if addtime < step[3] or step[3] == -1:
-                    step[3] = addtime
-                if addtime + durtime > step[4] or step[4] == -1:
-                    step[4] = addtime + durtime
-                break
-        for cur_save in save_time:
-            if cur_save.get('step') == cur_step:
-                cur_save[cls.timeflag.get(addtype)] += durtime
-                break
+    def is_step_time_event(cls, data: dict) -> bool:
+        return data.get('name') in cls.timeflag or str(data.get('name')).startswith('hcom_receive')
 
     @classmethod
-    def getE2ETime(cls, step, step_list):
-        for curStep in step_list:
-            if curStep[0] == step:
-                return curStep[4] - curStep[3]
-        return None
+    def create_step_file(cls, output_path: str, json_str: list, file_name: str,
+                         overlap_analyzer: OverlapAnalyzer = None, columnar_export: bool = False) -> None:
+        # step time events without steps all go to a single None step
+        step_range = GlobalVar.step_range if GlobalVar.step_range else [[None, -1, -1]]
+        has_analysis_data_flag, step_time, e2e_time = cls._count_step_time(json_str, step_range)
+        if not has_analysis_data_flag:
+            if overlap_analyzer is None or not overlap_analyzer.has_data():
+                return
+            # the overlap analysis events are missing, so measure the same times on the device task intervals
+            overlap_rows = [row for row in overlap_analyzer.get_step_overlap(GlobalVar.step_range)
+                            if row[2] == OverlapAnalyzer.TOTAL]
+            for index, row in enumerate(overlap_rows):
+                compute, comun, _, comun_not_overlp, free = row[4:]
+                step_time['compute'][index], step_time['comun'][index] = compute, comun
+                step_time['comunNotOverlp'][index], step_time['free'][index] = comun_not_overlp, free
+                e2e_time[index] = compute + comun_not_overlp + free
+        print_time = []
+        for index, step in enumerate(step_range):
+            compute, comun, free = step_time['compute'][index], step_time['comun'][index], step_time['free'][index]
+            comun_not_overlp, bubble = step_time['comunNotOverlp'][index], step_time['bubble'][index]
+            print_time.append([step[0], compute, comun_not_overlp, comun - comun_not_overlp, comun, free,
+                               e2e_time[index] - bubble, bubble, comun_not_overlp - bubble])
+        FileManager.create_csv_file(output_path, print_time, file_name, cls.title, columnar_export=columnar_export)
 
     @classmethod
-    def create_step_file(cls, output_path: str, json_str: list, file_name: str) -> None:
-        step_list = []
-        save_time = []
-        if not json_str:
-            return
-        loc = 0
-        # get step time
-        hasStepFlag = False
-        for curStep in GlobalVar.step_range:
-            step_list.append([curStep[0], curStep[1], curStep[2], -1, -1])
-            save_time.append(
-                {'step': curStep[0], 'compute': 0, 'comunNotOverlp': 0, 'Overlp': 0, 'comun': 0, 'free': 0, 'stage': 0,
-                 'bubble': 0, 'comunNotOverlpRec': 0})
-            hasStepFlag = True
-        if not hasStepFlag:
-            save_time.append(
-                {'step': None, 'compute': 0, 'comunNotOverlp': 0, 'Overlp': 0, 'comun': 0, 'free': 0, 'stage': 0,
-                 'bubble': 0, 'comunNotOverlpRec': 0})
-            step_list.append([None, -1, -1, -1, -1])
+    def create_stream_overlap_file(cls, output_path: str, overlap_analyzer: OverlapAnalyzer, file_name: str,
+                                   columnar_export: bool = False) -> None:
+        overlap_rows = overlap_analyzer.get_step_overlap(GlobalVar.step_range)
+        FileManager.create_csv_file(output_path, overlap_rows, file_name, cls.stream_overlap_title,
+                                    columnar_export=columnar_export)
 
+    @classmethod
+    def _count_step_time(cls, json_str: list, step_range: list) -> tuple:
+        """
+        Returns: whether there are overlap analysis events, the times of every step by time flag
+        and the time from the first to the last event of every step
+        """
+        time_key_list = list(dict.fromkeys(cls.timeflag.values()))
+        ts_list, dur_list, key_index_list = [], [], []
         has_analysis_data_flag = False
         for data in json_str:
-            time_start = -1
-            time_end = -1
             if data.get('name') in {'Communication', 'Computing', 'Free', 'Communication(Not Overlapped)'}:
-                cls.count_time(data.get('name'), data.get('ts', 0), data.get('dur', 0), step_list, save_time)
+                addtype = data.get('name')
                 has_analysis_data_flag = True
             elif str(data.get('name')).startswith('hcom_receive'):
-                cls.count_time('hcom_receive', data.get('ts', 0), data.get('dur', 0), step_list, save_time)
-        if not has_analysis_data_flag:
-            return
-        for calc_time in save_time:
-            calc_time['comunNotOverlpRec'] = calc_time['comunNotOverlp'] - calc_time['bubble']
-            calc_time['Overlp'] = calc_time['comun'] - calc_time['comunNotOverlp']
-            calc_time['stage'] = cls.getE2ETime(calc_time['step'], step_list) - calc_time['bubble']
-        print_time = []
-        for step in save_time:
-            print_time.append(
-                [step['step'], step['compute'], step['comunNotOverlp'], step['Overlp'], step['comun'], step['free'],
-                 step['stage'], step['bubble'], step['comunNotOverlpRec']])
-        FileManager.create_csv_file(output_path, print_time, file_name, cls.title)
+                addtype = 'hcom_receive'
+            else:
+                continue
+            addtime, durtime = data.get('ts', 0), data.get('dur', 0)
+            if not cls.is_float_num(addtime) or not cls.is_float_num(durtime):
+                print('Ts or dur format error!')
+                continue
+            ts_list.append(float(addtime))
+            dur_list.append(float(durtime))
+            key_index_list.append(time_key_list.index(cls.timeflag.get(addtype)))
+        ts_array = np.array(ts_list, dtype=np.float64)
+        dur_array = np.array(dur_list, dtype=np.float64)
+        key_index_array = np.array(key_index_list, dtype=np.int64)
+        if GlobalVar.step_range:
+            step_index_array = GlobalVar.get_step_index().find_step_index(ts_array, closed=False)
+        else:
+            step_index_array = np.zeros(len(ts_array), dtype=np.int64)
+        is_valid = step_index_array != StepIndex.INVALID_INDEX
+        step_index_array, ts_array = step_index_array[is_valid], ts_array[is_valid]
+        dur_array, key_index_array = dur_array[is_valid], key_index_array[is_valid]
+
+        step_num = len(step_range)
+        first_start = np.full(step_num, np.inf)
+        last_end = np.full(step_num, -np.inf)
+        np.minimum.at(first_start, step_index_array, ts_array)
+        np.maximum.at(last_end, step_index_array, ts_array + dur_array)
+        e2e_time = np.where(first_start <= last_end, last_end - first_start, 0).tolist()
+        step_time = {time_key: np.bincount(step_index_array[key_index_array == key_index],
+                                           weights=dur_array[key_index_array == key_index],
+                                           minlength=step_num).tolist()
+                     for key_index, time_key in enumerate(time_key_list)}
+        return has_analysis_data_flag, step_time, e2e_time
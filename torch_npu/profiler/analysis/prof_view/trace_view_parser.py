@@ -1,8 +1,17 @@
 import os
+from itertools import chain
+
+import numpy as np
+
+from ....utils.path_manager import PathManager
+from ..prof_common_func.columnar_file import ColumnarFile
 from ..prof_common_func.constant import Constant
 from ..prof_common_func.file_manager import FileManager
 from ..prof_common_func.global_var import GlobalVar
+from ..prof_common_func.overlap_analyzer import OverlapAnalyzer
+from ..prof_common_func.step_index import StepIndex
 from ..prof_common_func.trace_event_manager import TraceEventManager
+from ..prof_common_func.trace_shard_writer import TraceShardWriter
 from ..profiler_config import ProfilerConfig
 from ..prof_parse.cann_file_parser import CANNFileParser
 from ..prof_parse.fwk_file_parser import FwkFileParser
@@ -12,67 +21,142 @@ from ..prof_view.trace_step_time import TraceStepTimeParser
 
 class TraceViewParser(BaseViewParser):
     TRACE_VIEW = "trace_view.json"
+    TRACE_VIEW_INDEX = "trace_view_index.json"
+    TRACE_VIEW_SHARD_DIR = "trace_view_shards"
     STEP_TRACE = "step_trace_time.csv"
+    STREAM_OVERLAP = "stream_overlap_time.csv"
+    TRACE_FIELD_TYPES = {
+        "ph": ColumnarFile.STRING_TYPE, "name": ColumnarFile.STRING_TYPE, "cat": ColumnarFile.STRING_TYPE,
+        "pid": ColumnarFile.STRING_TYPE, "tid": ColumnarFile.STRING_TYPE, "ts": ColumnarFile.FLOAT_TYPE,
+        "dur": ColumnarFile.FLOAT_TYPE, "id": ColumnarFile.STRING_TYPE, "bp": ColumnarFile.STRING_TYPE,
+        "args": ColumnarFile.JSON_TYPE
+    }
 
     def __init__(self, profiler_path: str):
         super().__init__(profiler_path)
+        self._step_data = []
+        self._overlap_analyzer = OverlapAnalyzer()
 
     @staticmethod
-    def _prune_trace_by_level(json_data: list) -> list:
+    def _prune_trace_by_level(json_data: iter) -> iter:
         prune_config = ProfilerConfig().get_prune_config()
-        if not prune_config or not json_data:
-            return json_data
-        result = []
+        if not prune_config:
+            yield from json_data
+            return
         for data in json_data:
             prune_flag = False
             for prune_key in prune_config:
                 if data.get("name", "").startswith(prune_key) or data.get("args", {}).get("name", "") == prune_key:
                     prune_flag = True
-                    continue
+                    break
             if not prune_flag:
-                result.append(data)
-        return result
+                yield data
 
     def generate_view(self, output_path: str, **kwargs) -> None:
-        trace_data = self._prune_trace_by_level(CANNFileParser(self._profiler_path).get_timeline_all_data())
-        self._add_fwk_trace_data(trace_data)
-        GlobalVar.torch_op_tree_node = []
+        cann_trace_data = self._prune_trace_by_level(CANNFileParser(self._profiler_path).iter_timeline_data())
         if os.path.isdir(output_path):
-            FileManager.create_json_file(output_path, trace_data, self.TRACE_VIEW)
-            TraceStepTimeParser.create_step_file(output_path, trace_data, self.STEP_TRACE)
+            columnar_export = kwargs.get(Constant.COLUMNAR_EXPORT, False)
+            trace_data = chain(self._collect_overlap_data(cann_trace_data), self._iter_fwk_trace_data())
+            trace_data = self._collect_step_data(trace_data)
+            if columnar_export:
+                trace_data = FileManager.iter_with_columnar_file(output_path, trace_data, self.TRACE_VIEW,
+                                                                 self.TRACE_FIELD_TYPES)
+            if kwargs.get(Constant.SHARD_TRACE, False):
+                self._create_shard_files(output_path, trace_data)
+            else:
+                FileManager.create_json_file_by_stream(os.path.join(output_path, self.TRACE_VIEW), trace_data)
+            TraceStepTimeParser.create_step_file(output_path, self._step_data, self.STEP_TRACE,
+                                                 self._overlap_analyzer, columnar_export)
+            if self._overlap_analyzer.has_data():
+                TraceStepTimeParser.create_stream_overlap_file(output_path, self._overlap_analyzer,
+                                                               self.STREAM_OVERLAP, columnar_export)
+        else:
+            FileManager.create_json_file_by_stream(output_path, chain(cann_trace_data, self._iter_fwk_trace_data()))
+
+    @classmethod
+    def _get_shard_step_range(cls) -> list:
+        """
+        a step shard covers both the host range of the step op and the device range of its tasks
+        """
+        if not GlobalVar.step_range:
+            return []
+        step_nodes = [node for node in GlobalVar.torch_op_tree_node.get_top_level_nodes() if node.is_profiler_step()]
+        if len(step_nodes) != len(GlobalVar.step_range):
+            raise RuntimeError("The step range does not match the step ops of the torch op tree.")
+        return [[node.name.split("#")[-1], min(node.start_time, node.device_start), max(node.end_time, node.device_end)]
+                for node in step_nodes]
+
+    def _create_shard_files(self, output_path: str, trace_data: iter) -> None:
+        """
+        split the trace into one file per step, or per time window when there is no step, with an index of the
+        time range, event counts and longest ops of every file. the events out of the steps share one file
+        """
+        shard_path = os.path.join(output_path, self.TRACE_VIEW_SHARD_DIR)
+        PathManager.remove_path_safety(shard_path)
+        writer = TraceShardWriter(shard_path, FileManager.is_use_gzip())
+        step_range = self._get_shard_step_range()
+        window = Constant.TRACE_SHARD_WINDOW
+        if step_range:
+            writer.write(trace_data, StepIndex(step_range).find_step_index,
+                         lambda key: f"trace_view_step_{step_range[key][0]}.json" if key != StepIndex.INVALID_INDEX
+                         else "trace_view_no_step.json")
         else:
-            FileManager.create_json_file_by_path(output_path, trace_data)
+            writer.write(trace_data, lambda ts: np.floor(ts / window),
+                         lambda key: f"trace_view_window_{key * window}.json")
+        summary = writer.close()
+        if not summary:
+            return
+        shard_list = []
+        for key, shard in summary.items():
+            shard["file"] = os.path.join(self.TRACE_VIEW_SHARD_DIR, shard["file"])
+            if step_range:
+                shard_info = {"step": step_range[key][0] if key != StepIndex.INVALID_INDEX else None}
+            else:
+                shard_info = {"window_start(us)": key * window, "window_end(us)": (key + 1) * window}
+            shard_info.update(shard)
+            shard_list.append(shard_info)
+        shard_list.sort(key=lambda shard_info: shard_info["start_time(us)"])
+        index = {"shard_by": "step" if step_range else "time_window",
+                 "shard_count": len(shard_list),
+                 "shards": shard_list}
+        FileManager.create_json_file_by_path(os.path.join(output_path, self.TRACE_VIEW_INDEX), index, indent=4)
+
+    def _collect_step_data(self, json_data: iter) -> iter:
+        """
+        keep only the events needed by step_trace_time.csv while the trace is streamed to disk
+        """
+        for data in json_data:
+            if TraceStepTimeParser.is_step_time_event(data):
+                self._step_data.append(data)
+            yield data
 
-    def _add_fwk_trace_data(self, json_data: list):
+    def _collect_overlap_data(self, json_data: iter) -> iter:
+        """
+        keep the device task intervals for the overlap analysis while the trace is streamed to disk
+        """
+        for data in json_data:
+            self._overlap_analyzer.add_event(data)
+            yield data
+
+    def _iter_fwk_trace_data(self) -> iter:
         if not GlobalVar.torch_op_tree_node:
             return
         pid = GlobalVar.torch_op_tree_node[0].event.pid
         tid_dict = {}
         enqueue_data_list, dequeue_data_list = FwkFileParser(self._profiler_path).get_task_queue_data()
-        fwk_x_event_list = [None] * (
-                len(GlobalVar.torch_op_tree_node) + len(enqueue_data_list) * 2 + len(dequeue_data_list) * 2)
-        fwk_other_event_list = []
-        index = 0
         for torch_op_node in GlobalVar.torch_op_tree_node:
             tid_dict[torch_op_node.event.tid] = False
-            fwk_x_event_list[index] = TraceEventManager.create_x_event(torch_op_node.event, "cpu_op")
-            index += 1
+            yield TraceEventManager.create_x_event(torch_op_node.event, "cpu_op")
             if torch_op_node.kernel_list:
                 for kernel in torch_op_node.kernel_list:
-                    fwk_other_event_list.extend(TraceEventManager.create_torch_to_npu_flow(torch_op_node.event, kernel))
+                    yield from TraceEventManager.create_torch_to_npu_flow(torch_op_node.event, kernel)
 
         for enqueue_data in enqueue_data_list:
             tid_dict[enqueue_data.tid] = False
-            fwk_x_event_list[index] = TraceEventManager.create_x_event(enqueue_data, "enqueue")
-            index += 1
-            fwk_x_event_list[index] = TraceEventManager.create_task_queue_flow(Constant.FLOW_START_PH, enqueue_data)
-            index += 1
+            yield TraceEventManager.create_x_event(enqueue_data, "enqueue")
+            yield TraceEventManager.create_task_queue_flow(Constant.FLOW_START_PH, enqueue_data)
         for dequeue_data in dequeue_data_list:
             tid_dict[dequeue_data.tid] = True
-            fwk_x_event_list[index] = TraceEventManager.create_x_event(dequeue_data, "dequeue")
-            index += 1
-            fwk_x_event_list[index] = TraceEventManager.create_task_queue_flow(Constant.FLOW_END_PH, dequeue_data)
-            index += 1
-        fwk_other_event_list.extend(TraceEventManager.create_m_event(pid, tid_dict))
-
-        json_data.extend(fwk_x_event_list + fwk_other_event_list)
+            yield TraceEventManager.create_x_event(dequeue_data, "dequeue")
+            yield TraceEventManager.create_task_queue_flow(Constant.FLOW_END_PH, dequeue_data)
+        yield from TraceEventManager.create_m_event(pid, tid_dict)
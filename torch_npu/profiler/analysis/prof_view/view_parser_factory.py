@@ -2,33 +2,48 @@ import datetime
 import os
 
 from ....utils.path_manager import PathManager
+from ..prof_bean.op_summary_bean import OpSummaryBean
 from ..prof_common_func.constant import Constant, print_info_msg
+from ..prof_common_func.file_manager import FileManager
 from ..prof_common_func.global_var import GlobalVar
 from ..prof_common_func.path_manager import ProfilerPathManager
 from ..prof_config.view_parser_config import ViewParserConfig
 from ..prof_parse.cann_file_parser import CANNFileParser
+from ..prof_view.view_parser_scheduler import ViewParserScheduler
 from ..profiler_config import ProfilerConfig
 
 
 class ViewParserFactory:
     @classmethod
-    def create_view_parser_and_run(cls, profiler_path: str, analysis_type: str, output_path: str, kwargs: dict):
+    def create_view_parser_and_run(cls, profiler_path: str, analysis_type: str, output_path: str, kwargs: dict,
+                                   max_workers: int = None):
         print_info_msg(f'Start parsing profiling data: {profiler_path}')
         start_time = datetime.datetime.now()
-        ProfilerConfig().load_info(profiler_path)
-        if ProfilerPathManager.get_cann_path(profiler_path):
-            cann_file_parser = CANNFileParser(profiler_path)
-            cann_file_parser.check_prof_data_size()
-            CANNFileParser(profiler_path).export_cann_profiling(ProfilerConfig().data_simplification)
-            end_time = datetime.datetime.now()
-            print_info_msg(f'CANN profiling data parsed in a total time of {end_time - start_time}')
-        GlobalVar.init(profiler_path)
-        if analysis_type == Constant.TENSORBOARD_TRACE_HANDLER:
-            output_path = os.path.join(profiler_path, Constant.OUTPUT_DIR)
-            PathManager.remove_path_safety(output_path)
-            PathManager.make_dir_safety(output_path)
-        for parser in ViewParserConfig.CONFIG_DICT.get(analysis_type):
-            parser(profiler_path).generate_view(output_path, **kwargs)
+        try:
+            ProfilerConfig().load_info(profiler_path)
+            FileManager.set_use_gzip(kwargs.get(Constant.USE_GZIP, False))
+            # the export type goes to the view parsers with the other options instead of a class state
+            columnar_export = ProfilerConfig().export_type == Constant.EXPORT_COLUMNAR
+            kwargs = dict(kwargs, **{Constant.COLUMNAR_EXPORT: columnar_export})
+            if ProfilerPathManager.get_cann_path(profiler_path):
+                cann_file_parser = CANNFileParser(profiler_path)
+                cann_file_parser.check_prof_data_size()
+                CANNFileParser(profiler_path).export_cann_profiling(ProfilerConfig().data_simplification)
+                end_time = datetime.datetime.now()
+                print_info_msg(f'CANN profiling data parsed in a total time of {end_time - start_time}')
+            GlobalVar.init(profiler_path)
+            if analysis_type == Constant.TENSORBOARD_TRACE_HANDLER:
+                output_path = os.path.join(profiler_path, Constant.OUTPUT_DIR)
+                PathManager.remove_path_safety(output_path)
+                PathManager.make_dir_safety(output_path)
+            ViewParserScheduler.run(ViewParserConfig.CONFIG_DICT.get(analysis_type), profiler_path, output_path,
+                                    kwargs, max_workers)
+        finally:
+            # a pooled process analyses the next profiling data with the same class state
+            GlobalVar.reset()
+            CANNFileParser.clear_cache()
+            FileManager.set_use_gzip(False)
+            OpSummaryBean.headers = []
         cls.simplify_data(profiler_path)
         end_time = datetime.datetime.now()
         print_info_msg(f'All profiling data parsed in a total time of {end_time - start_time}')
@@ -39,3 +54,4 @@ class ViewParserFactory:
             return
         target_path = os.path.join(profiler_path, Constant.FRAMEWORK_DIR)
         PathManager.remove_path_safety(target_path)
+        PathManager.remove_path_safety(os.path.join(profiler_path, Constant.CACHE_DIR))
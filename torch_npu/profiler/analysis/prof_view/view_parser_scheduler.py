@@ -0,0 +1,119 @@
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from ..prof_common_func.constant import print_error_msg, print_warn_msg
+
+
+def _run_view_parser(parser: any, profiler_path: str, output_path: str, kwargs: dict) -> None:
+    parser(profiler_path).generate_view(output_path, **kwargs)
+
+
+class ViewParserScheduler:
+    """
+    run the view parsers as a dag: a parser starts once every parser in its DEPENDENCIES has finished,
+    independent parsers run in a forked process pool which shares the already built GlobalVar and
+    ProfilerConfig with the parent process
+    """
+    START_METHOD = "fork"
+
+    @classmethod
+    def run(cls, parser_list: list, profiler_path: str, output_path: str, kwargs: dict,
+            max_workers: int = None) -> None:
+        dependency_dict = cls._get_dependency_dict(parser_list)
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = min(max_workers, len(parser_list))
+        if max_workers <= 1 or not cls._is_pool_available():
+            failed_dict = cls._run_serial(dependency_dict, profiler_path, output_path, kwargs)
+        else:
+            failed_dict = cls._run_parallel(dependency_dict, profiler_path, output_path, kwargs, max_workers)
+        if failed_dict:
+            raise RuntimeError("Failed to generate view: " + ", ".join(
+                f"{parser.__name__}({err})" for parser, err in failed_dict.items()))
+
+    @classmethod
+    def _get_dependency_dict(cls, parser_list: list) -> dict:
+        """
+        dependencies which are not in the parser list are treated as satisfied
+        """
+        dependency_dict = {parser: {dependency for dependency in parser.DEPENDENCIES if dependency in parser_list}
+                           for parser in parser_list}
+        finished_set = set()
+        ready_list = cls._get_ready_parsers(dependency_dict, finished_set, set())
+        while ready_list:
+            finished_set.update(ready_list)
+            ready_list = cls._get_ready_parsers(dependency_dict, finished_set, finished_set)
+        if len(finished_set) != len(dependency_dict):
+            cycle_list = [parser.__name__ for parser in dependency_dict if parser not in finished_set]
+            raise RuntimeError(f"Circular dependency between view parsers: {', '.join(cycle_list)}")
+        return dependency_dict
+
+    @classmethod
+    def _get_ready_parsers(cls, dependency_dict: dict, finished_set: set, started_set: set) -> list:
+        return [parser for parser, dependencies in dependency_dict.items()
+                if parser not in started_set and dependencies.issubset(finished_set)]
+
+    @classmethod
+    def _is_pool_available(cls) -> bool:
+        if cls.START_METHOD not in multiprocessing.get_all_start_methods():
+            return False
+        # daemonic processes are not allowed to have children
+        return not multiprocessing.current_process().daemon
+
+    @classmethod
+    def _skip_dependents(cls, dependency_dict: dict, failed_dict: dict, started_set: set) -> None:
+        skipped_list = [parser for parser in dependency_dict
+                        if parser not in started_set and not dependency_dict[parser].isdisjoint(failed_dict)]
+        while skipped_list:
+            for parser in skipped_list:
+                print_warn_msg(f"Skip {parser.__name__} because the view it depends on failed.")
+                failed_dict[parser] = "dependency failed"
+                started_set.add(parser)
+            skipped_list = [parser for parser in dependency_dict
+                            if parser not in started_set and not dependency_dict[parser].isdisjoint(failed_dict)]
+
+    @classmethod
+    def _run_serial(cls, dependency_dict: dict, profiler_path: str, output_path: str, kwargs: dict) -> dict:
+        finished_set, started_set, failed_dict = set(), set(), {}
+        ready_list = cls._get_ready_parsers(dependency_dict, finished_set, started_set)
+        while ready_list:
+            for parser in ready_list:
+                started_set.add(parser)
+                try:
+                    _run_view_parser(parser, profiler_path, output_path, kwargs)
+                except Exception as err:
+                    print_error_msg(f"Failed to generate view by {parser.__name__}: {err}")
+                    failed_dict[parser] = err
+                else:
+                    finished_set.add(parser)
+            cls._skip_dependents(dependency_dict, failed_dict, started_set)
+            ready_list = cls._get_ready_parsers(dependency_dict, finished_set, started_set)
+        return failed_dict
+
+    @classmethod
+    def _run_parallel(cls, dependency_dict: dict, profiler_path: str, output_path: str, kwargs: dict,
+                      max_workers: int) -> dict:
+        finished_set, started_set, failed_dict = set(), set(), {}
+        running_dict = {}
+        mp_context = multiprocessing.get_context(cls.START_METHOD)
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as executor:
+            while True:
+                for parser in cls._get_ready_parsers(dependency_dict, finished_set, started_set):
+                    started_set.add(parser)
+                    future = executor.submit(_run_view_parser, parser, profiler_path, output_path, kwargs)
+                    running_dict[future] = parser
+                if not running_dict:
+                    break
+                done_set, _ = wait(running_dict, return_when=FIRST_COMPLETED)
+                for future in done_set:
+                    parser = running_dict.pop(future)
+                    try:
+                        future.result()
+                    except Exception as err:
+                        print_error_msg(f"Failed to generate view by {parser.__name__}: {err}")
+                        failed_dict[parser] = err
+                    else:
+                        finished_set.add(parser)
+                cls._skip_dependents(dependency_dict, failed_dict, started_set)
+        return failed_dict
@@ -0,0 +1,280 @@
+import os
+
+import numpy as np
+
+from .prof_bean.memory_use_bean import MemoryUseBean
+from .prof_bean.op_summary_bean import OpSummaryBean
+from .prof_common_func.constant import Constant, print_info_msg
+from .prof_common_func.file_manager import FileManager
+from .prof_common_func.file_tag import FileTag
+from .prof_common_func.path_manager import ProfilerPathManager
+from .prof_common_func.torch_op_tree import TorchOpTree
+from .prof_parse.cann_file_parser import CANNDataEnum, CANNFileParser
+from .prof_parse.fwk_cann_relation_parser import FwkCANNRelationParser
+from .prof_parse.fwk_file_parser import FwkFileParser
+from .profiler_config import ProfilerConfig
+from ...utils.path_manager import PathManager
+
+
+class ProfileDiff:
+    """
+    compare the operators, kernels and memory peaks of two profiling results, or of two steps of one result.
+    operators are aligned by name, input shapes and call stack, kernels by name and type
+    """
+    OP_DIFF = "op_diff.csv"
+    KERNEL_DIFF = "kernel_diff.csv"
+    DIFF_SUMMARY = "profile_diff_summary.json"
+    OP_DIFF_HEADERS = ["Name", "Input Shapes", "Call Stack", "Status", "Base Count", "Compare Count",
+                       "Base Host Self Duration(us)", "Compare Host Self Duration(us)", "Host Self Delta(us)",
+                       "Base Host Total Duration(us)", "Compare Host Total Duration(us)", "Host Total Delta(us)",
+                       "Base Device Self Duration(us)", "Compare Device Self Duration(us)", "Device Self Delta(us)",
+                       "Base Device Total Duration(us)", "Compare Device Total Duration(us)",
+                       "Device Total Delta(us)"]
+    KERNEL_DIFF_HEADERS = ["Name", "Type", "Status", "Base Count", "Compare Count", "Base Duration(us)",
+                           "Compare Duration(us)", "Duration Delta(us)"]
+    STATUS_MATCHED = "matched"
+    STATUS_NEW = "new"
+    STATUS_VANISHED = "vanished"
+    TOP_NUM = 20
+    # op metric columns: count, host self, host total, device self, device total
+    OP_METRIC_NUM = 5
+    # kernel metric columns: count, duration
+    KERNEL_METRIC_NUM = 2
+
+    @classmethod
+    def compare(cls, base_path: str, compare_path: str = None, output_path: str = None, base_step: any = None,
+                compare_step: any = None) -> None:
+        base_path = cls._get_profiler_path(base_path)
+        compare_path = cls._get_profiler_path(compare_path) if compare_path else base_path
+        if base_path == compare_path and (base_step is None or compare_step is None):
+            raise RuntimeError("Two steps must be given to compare a profiling result with itself.")
+        if output_path is None:
+            output_path = os.path.join(compare_path, Constant.OUTPUT_DIR)
+        output_path = ProfilerPathManager.get_realpath(output_path)
+        PathManager.check_input_directory_path(output_path)
+        base_data = cls._collect_profile_data(base_path, base_step)
+        compare_data = cls._collect_profile_data(compare_path, compare_step)
+
+        op_diff_list = cls._diff_metrics(base_data.get("op"), compare_data.get("op"), cls.OP_METRIC_NUM)
+        kernel_diff_list = cls._diff_metrics(base_data.get("kernel"), compare_data.get("kernel"),
+                                             cls.KERNEL_METRIC_NUM)
+        # ranked by the device total delta, then by the host total delta
+        op_diff_list.sort(key=lambda diff: (diff[2][4] - diff[1][4], diff[2][2] - diff[1][2]), reverse=True)
+        kernel_diff_list.sort(key=lambda diff: diff[2][1] - diff[1][1], reverse=True)
+        FileManager.create_csv_file(output_path, [cls._get_op_diff_row(diff) for diff in op_diff_list],
+                                    cls.OP_DIFF, cls.OP_DIFF_HEADERS)
+        FileManager.create_csv_file(output_path, [cls._get_kernel_diff_row(diff) for diff in kernel_diff_list],
+                                    cls.KERNEL_DIFF, cls.KERNEL_DIFF_HEADERS)
+        summary = {
+            "base": {"path": base_path, "step": base_step},
+            "compare": {"path": compare_path, "step": compare_step},
+            "total": cls._get_total_diff(op_diff_list, kernel_diff_list),
+            "top_op_regressions": [cls._get_op_regression(diff) for diff in op_diff_list[:cls.TOP_NUM]
+                                   if cls._is_regression(diff, cls.OP_METRIC_NUM)],
+            "top_kernel_regressions": [cls._get_kernel_regression(diff) for diff in kernel_diff_list[:cls.TOP_NUM]
+                                       if cls._is_regression(diff, cls.KERNEL_METRIC_NUM)],
+            "new_kernels": [diff[0][0] for diff in kernel_diff_list if diff[3] == cls.STATUS_NEW],
+            "vanished_kernels": [diff[0][0] for diff in kernel_diff_list if diff[3] == cls.STATUS_VANISHED],
+            "memory_peak": cls._diff_memory_peak(base_data.get("memory"), compare_data.get("memory"))
+        }
+        FileManager.create_json_file_by_path(os.path.join(output_path, cls.DIFF_SUMMARY), summary, indent=4)
+        print_info_msg(f"Profile diff results are saved in: {output_path}")
+
+    @classmethod
+    def _get_profiler_path(cls, input_path: str) -> str:
+        input_path = ProfilerPathManager.get_realpath(input_path)
+        PathManager.check_input_directory_path(input_path)
+        PathManager.check_path_owner_consistent(input_path)
+        profiler_path_list = ProfilerPathManager.get_profiler_path_list(input_path)
+        if len(profiler_path_list) != 1:
+            raise RuntimeError(f"Exactly one profiling result is expected in: {input_path}")
+        return profiler_path_list[0]
+
+    @classmethod
+    def _collect_profile_data(cls, profiler_path: str, step: any) -> dict:
+        ProfilerConfig().load_info(profiler_path)
+        if ProfilerPathManager.get_cann_path(profiler_path):
+            CANNFileParser(profiler_path).export_cann_profiling(ProfilerConfig().data_simplification)
+        torch_op_tree = FwkCANNRelationParser(profiler_path).build_torch_op_tree()
+        step_range = cls._get_step_range(torch_op_tree, step, profiler_path)
+        profile_data = {
+            "op": cls._collect_op_metrics(torch_op_tree, step_range),
+            "kernel": cls._collect_kernel_metrics(profiler_path, step_range),
+            "memory": cls._collect_memory_peak(profiler_path, step_range)
+        }
+        CANNFileParser.clear_cache()
+        return profile_data
+
+    @classmethod
+    def _get_step_range(cls, torch_op_tree: TorchOpTree, step: any, profiler_path: str) -> any:
+        """
+        Returns: host start, host end, device start and device end of the step, None for the whole profile
+        """
+        if step is None:
+            return None
+        for node in torch_op_tree.get_top_level_nodes():
+            if node.is_profiler_step() and node.name.split("#")[-1] == str(step):
+                return node.start_time, node.end_time, node.device_start, node.device_end
+        raise RuntimeError(f"Step {step} is not found in: {profiler_path}")
+
+    @classmethod
+    def _collect_op_metrics(cls, torch_op_tree: TorchOpTree, step_range: any) -> dict:
+        """
+        group the operators on their interned string ids, so only one entry per distinct operator is decoded
+        """
+        if not len(torch_op_tree):
+            return {}
+        torch_op_table = torch_op_tree.torch_op_table
+        name_ids = torch_op_table.tlv_column(Constant.OP_NAME)
+        unique_name_ids = np.unique(name_ids)
+        step_name_ids = [name_id for name_id in unique_name_ids.tolist()
+                         if torch_op_table.get_string(name_id).find("ProfilerStep#") != -1]
+        mask = ~np.isin(name_ids, step_name_ids)
+        if step_range is not None:
+            mask &= (torch_op_tree.start >= step_range[0]) & (torch_op_tree.start < step_range[1])
+        if not np.any(mask):
+            return {}
+        key_ids = np.stack((name_ids, torch_op_table.tlv_column(Constant.INPUT_SHAPES),
+                            torch_op_table.tlv_column(Constant.CALL_STACK)), axis=1)[mask]
+        group_ids, group_index = np.unique(key_ids, axis=0, return_inverse=True)
+        group_index = group_index.reshape(-1)
+        metric_list = (np.ones(len(group_index)), torch_op_tree.host_self_dur[mask],
+                       torch_op_tree.host_total_dur[mask],
+                       torch_op_tree.device_dur[TorchOpTree.DEVICE_SELF][mask],
+                       torch_op_tree.device_dur[TorchOpTree.DEVICE_TOTAL][mask])
+        group_metrics = np.stack([np.bincount(group_index, weights=metric, minlength=len(group_ids))
+                                  for metric in metric_list], axis=1)
+        op_metrics = {}
+        for key_id, metrics in zip(group_ids.tolist(), group_metrics):
+            key = tuple(torch_op_table.get_string(string_id) for string_id in key_id)
+            if key in op_metrics:
+                op_metrics[key] = op_metrics[key] + metrics
+            else:
+                op_metrics[key] = metrics
+        return op_metrics
+
+    @classmethod
+    def _collect_kernel_metrics(cls, profiler_path: str, step_range: any) -> dict:
+        kernel_metrics = {}
+        if not ProfilerPathManager.get_cann_path(profiler_path):
+            return kernel_metrics
+        for file_path in CANNFileParser(profiler_path).get_file_list_by_type(CANNDataEnum.OP_SUMMARY):
+            for data in FileManager.read_csv_file(file_path, OpSummaryBean):
+                if step_range is not None and not step_range[2] <= data.ts <= step_range[3]:
+                    continue
+                metrics = kernel_metrics.setdefault((data.name, data.op_type), np.zeros(cls.KERNEL_METRIC_NUM))
+                metrics[0] += 1
+                metrics[1] += data.dur
+        return kernel_metrics
+
+    @classmethod
+    def _collect_memory_peak(cls, profiler_path: str, step_range: any) -> dict:
+        """
+        Returns: peak total allocated and total reserved memory in MB of every device
+        """
+        memory_table = FwkFileParser(profiler_path).get_file_columns_by_tag(FileTag.MEMORY)
+        if not len(memory_table):
+            return {}
+        time_us = ProfilerConfig().get_local_time(memory_table.column("time_ns") / Constant.NS_TO_US)
+        mask = np.ones(len(memory_table), dtype=bool)
+        if step_range is not None:
+            mask = (time_us >= step_range[0]) & (time_us < step_range[1])
+        device_type = memory_table.column("device_type")[mask]
+        device_index = memory_table.column("device_index")[mask]
+        total_allocated = memory_table.column("total_allocated")[mask] / Constant.B_TO_MB
+        total_reserved = memory_table.column("total_reserved")[mask] / Constant.B_TO_MB
+        memory_peak = {}
+        for device in np.unique(np.stack((device_type, device_index), axis=1), axis=0).tolist():
+            device_mask = (device_type == device[0]) & (device_index == device[1])
+            device_tag = f"NPU:{device[1]}" if device[0] == MemoryUseBean.NPU_ID else "CPU"
+            memory_peak[device_tag] = [float(np.max(total_allocated[device_mask])),
+                                       float(np.max(total_reserved[device_mask]))]
+        return memory_peak
+
+    @classmethod
+    def _diff_metrics(cls, base_metrics: dict, compare_metrics: dict, metric_num: int) -> list:
+        """
+        Returns: list of (key, base metrics, compare metrics, status)
+        """
+        diff_list = []
+        empty_metrics = np.zeros(metric_num)
+        for key, metrics in base_metrics.items():
+            if key in compare_metrics:
+                diff_list.append((key, metrics, compare_metrics[key], cls.STATUS_MATCHED))
+            else:
+                diff_list.append((key, metrics, empty_metrics, cls.STATUS_VANISHED))
+        for key, metrics in compare_metrics.items():
+            if key not in base_metrics:
+                diff_list.append((key, empty_metrics, metrics, cls.STATUS_NEW))
+        return diff_list
+
+    @classmethod
+    def _diff_memory_peak(cls, base_peak: dict, compare_peak: dict) -> list:
+        memory_diff_list = []
+        for device_tag in sorted(set(base_peak) | set(compare_peak)):
+            base_value = base_peak.get(device_tag, [0.0, 0.0])
+            compare_value = compare_peak.get(device_tag, [0.0, 0.0])
+            memory_diff_list.append({
+                "device": device_tag,
+                "base_peak_allocated(MB)": base_value[0], "compare_peak_allocated(MB)": compare_value[0],
+                "peak_allocated_delta(MB)": compare_value[0] - base_value[0],
+                "base_peak_reserved(MB)": base_value[1], "compare_peak_reserved(MB)": compare_value[1],
+                "peak_reserved_delta(MB)": compare_value[1] - base_value[1]
+            })
+        return memory_diff_list
+
+    @classmethod
+    def _get_total_diff(cls, op_diff_list: list, kernel_diff_list: list) -> dict:
+        base_op = sum((diff[1] for diff in op_diff_list), np.zeros(cls.OP_METRIC_NUM))
+        compare_op = sum((diff[2] for diff in op_diff_list), np.zeros(cls.OP_METRIC_NUM))
+        base_kernel = sum((diff[1] for diff in kernel_diff_list), np.zeros(cls.KERNEL_METRIC_NUM))
+        compare_kernel = sum((diff[2] for diff in kernel_diff_list), np.zeros(cls.KERNEL_METRIC_NUM))
+        # the self durations add up to the time spent in the operators without counting nested ones twice
+        return {
+            "host_duration(us)": cls._get_value_diff(base_op[1], compare_op[1]),
+            "device_duration(us)": cls._get_value_diff(base_op[3], compare_op[3]),
+            "kernel_duration(us)": cls._get_value_diff(base_kernel[1], compare_kernel[1]),
+            "kernel_count": cls._get_value_diff(base_kernel[0], compare_kernel[0])
+        }
+
+    @classmethod
+    def _get_value_diff(cls, base_value: float, compare_value: float) -> dict:
+        return {"base": float(base_value), "compare": float(compare_value),
+                "delta": float(compare_value - base_value)}
+
+    @classmethod
+    def _is_regression(cls, diff: tuple, metric_num: int) -> bool:
+        delta = diff[2] - diff[1]
+        if metric_num == cls.OP_METRIC_NUM:
+            return delta[4] > 0 or (delta[4] == 0 and delta[2] > 0)
+        return delta[1] > 0
+
+    @classmethod
+    def _get_op_diff_row(cls, diff: tuple) -> list:
+        key, base_metrics, compare_metrics, status = diff
+        row = list(key) + [status, int(base_metrics[0]), int(compare_metrics[0])]
+        for index in range(1, cls.OP_METRIC_NUM):
+            row.extend([float(base_metrics[index]), float(compare_metrics[index]),
+                        float(compare_metrics[index] - base_metrics[index])])
+        return row
+
+    @classmethod
+    def _get_kernel_diff_row(cls, diff: tuple) -> list:
+        key, base_metrics, compare_metrics, status = diff
+        return list(key) + [status, int(base_metrics[0]), int(compare_metrics[0]), float(base_metrics[1]),
+                            float(compare_metrics[1]), float(compare_metrics[1] - base_metrics[1])]
+
+    @classmethod
+    def _get_op_regression(cls, diff: tuple) -> dict:
+        key, base_metrics, compare_metrics, status = diff
+        return {"name": key[0], "input_shapes": key[1], "status": status,
+                "device_total_delta(us)": float(compare_metrics[4] - base_metrics[4]),
+                "host_total_delta(us)": float(compare_metrics[2] - base_metrics[2]),
+                "count_delta": int(compare_metrics[0] - base_metrics[0])}
+
+    @classmethod
+    def _get_kernel_regression(cls, diff: tuple) -> dict:
+        key, base_metrics, compare_metrics, status = diff
+        return {"name": key[0], "type": key[1], "status": status,
+                "duration_delta(us)": float(compare_metrics[1] - base_metrics[1]),
+                "count_delta": int(compare_metrics[0] - base_metrics[0])}
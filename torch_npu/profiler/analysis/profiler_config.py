@@ -26,17 +26,16 @@ class ProfilerConfig:
     }
 
     def __init__(self):
-        self._profiler_level = Constant.LEVEL0
-        self._ai_core_metrics = Constant.AicMetricsNone
-        self._l2_cache = False
-        self._data_simplification = None
-        self._is_cluster = False
-        self._localtime_diff = 0
+        self._reset_info()
 
     @property
     def data_simplification(self):
         return self._data_simplification
 
+    @property
+    def export_type(self):
+        return self._export_type
+
     @classmethod
     def _get_profiler_info_json(cls, profiler_path: str):
         info_file_path = ProfilerPathManager.get_info_file_path(profiler_path)
@@ -50,6 +49,8 @@ class ProfilerConfig:
             return {}
 
     def load_info(self, profiler_path: str):
+        # a process may analyse several profiling results, none of them inherits the config of the last one
+        self._reset_info()
         self.load_is_cluster(profiler_path)
         info_json = self._get_profiler_info_json(profiler_path)
         self.load_experimental_cfg_info(info_json)
@@ -75,6 +76,7 @@ class ProfilerConfig:
         self._data_simplification = experimental_config.get(Constant.DATA_SIMPLIFICATION, self._data_simplification)
         if self._data_simplification is None:
             self._data_simplification = self._get_default_state()
+        self._export_type = experimental_config.get(Constant.EXPORT_TYPE, self._export_type)
 
     def get_parser_bean(self):
         return self.LEVEL_PARSER_CONFIG.get(self._profiler_level) + self._get_l2_cache_bean()
@@ -96,3 +98,12 @@ class ProfilerConfig:
 
     def _get_default_state(self):
         return self._is_cluster
+
+    def _reset_info(self):
+        self._profiler_level = Constant.LEVEL0
+        self._ai_core_metrics = Constant.AicMetricsNone
+        self._l2_cache = False
+        self._data_simplification = None
+        self._is_cluster = False
+        self._localtime_diff = 0
+        self._export_type = Constant.EXPORT_TEXT
@@ -29,13 +29,19 @@ class AiCMetrics:
     L2Cache = Constant.AicL2Cache
 
 
+class ExportType:
+    Text = Constant.EXPORT_TEXT
+    Columnar = Constant.EXPORT_COLUMNAR
+
+
 class _ExperimentalConfig:
     def __init__(self,
                  profiler_level: int = Constant.LEVEL0,
                  aic_metrics: int = Constant.AicMetricsNone,
                  l2_cache: bool = False,
                  data_simplification: bool = None,
-                 record_op_args: bool = False):
+                 record_op_args: bool = False,
+                 export_type: str = Constant.EXPORT_TEXT):
         self._profiler_level = profiler_level
         self._aic_metrics = aic_metrics
         if self._profiler_level != Constant.LEVEL0 and self._aic_metrics == Constant.AicMetricsNone:
@@ -43,6 +49,7 @@ class _ExperimentalConfig:
         self._l2_cache = l2_cache
         self._data_simplification = data_simplification
         self.record_op_args = record_op_args
+        self._export_type = export_type
         self._check_params()
 
     def __call__(self) -> torch_npu._C._profiler._ExperimentalConfig:
@@ -63,6 +70,9 @@ class _ExperimentalConfig:
         if not isinstance(self.record_op_args, bool):
             print_warn_msg("Invalid parameter record_op_args, which must be of boolean type, reset it to False.")
             self.record_op_args = False
+        if self._export_type not in (ExportType.Text, ExportType.Columnar):
+            print_warn_msg("Invalid parameter export_type, reset it to ExportType.Text.")
+            self._export_type = ExportType.Text
         if self._profiler_level not in (ProfilerLevel.Level0, ProfilerLevel.Level1, ProfilerLevel.Level2):
             print_warn_msg("Invalid parameter profiler_level, reset it to ProfilerLevel.Level0.")
             self._profiler_level = ProfilerLevel.Level0
@@ -1,10 +1,14 @@
 import os.path
 import shutil
 import time
+from enum import Enum
 
 from torch_npu.npu import _lazy_init
 
+from .analysis.cluster_analysis import ClusterAnalysis
 from .analysis.npu_profiler import NpuProfiler
+from .analysis.profile_diff import ProfileDiff
+from .analysis.prof_view.operator_statistic_parser import OperatorStatisticParser
 from .analysis.prof_common_func.constant import Constant, print_warn_msg
 from .analysis.prof_common_func.path_manager import ProfilerPathManager
 from .experimental_config import _ExperimentalConfig
@@ -15,12 +19,25 @@ from .scheduler import CLOSE_STEP, ProfilerAction
 from ..utils.path_manager import PathManager
 
 
-def tensorboard_trace_handler(dir_name: str = None, worker_name: str = None, use_gzip: bool = False):
-    return NpuProfCreator(worker_name, dir_name)
+def tensorboard_trace_handler(dir_name: str = None, worker_name: str = None, use_gzip: bool = False,
+                              async_mode: bool = False, max_queue_size: int = Constant.ANALYSIS_QUEUE_SIZE,
+                              drop_when_full: bool = False, shard_trace: bool = False):
+    return NpuProfCreator(worker_name, dir_name, use_gzip, async_mode, max_queue_size, drop_when_full, shard_trace)
 
 
-def analyse(profiler_path: str):
-    NpuProfiler.analyse(profiler_path)
+def analyse(profiler_path: str, max_workers: int = None, peak_tflops: float = None, peak_bandwidth: float = None,
+            shard_trace: bool = False):
+    NpuProfiler.analyse(profiler_path, max_workers=max_workers, peak_tflops=peak_tflops,
+                        peak_bandwidth=peak_bandwidth, shard_trace=shard_trace)
+
+
+def compare(base_path: str, compare_path: str = None, output_path: str = None, base_step: int = None,
+            compare_step: int = None):
+    ProfileDiff.compare(base_path, compare_path, output_path, base_step, compare_step)
+
+
+def analyse_cluster(input_path: str, output_path: str = None, max_workers: int = None):
+    ClusterAnalysis.analyse(input_path, output_path, max_workers)
 
 
 class profile:
@@ -72,6 +89,11 @@ class profile:
             prev_action = self._schedule(prev_step)
             if prev_action == ProfilerAction.NONE:
                 return
+            # the saved data was handed to the analysis worker, which analyses it later or leaves it to offline
+            # analysis when the queue is full
+            if prev_action == ProfilerAction.RECORD_AND_SAVE and isinstance(self._on_trace_ready, NpuProfCreator) \
+                    and self._on_trace_ready.is_async_mode():
+                return
             PathManager.remove_path_safety(self._msprofiler_interface.path)
 
     def step(self):
@@ -112,15 +134,44 @@ class profile:
             msg = f"Can't remove directory: {self._msprofiler_interface.path}"
             print_warn_msg(msg)
 
+    def key_averages(self, group_by_input_shape: bool = False, group_by_stack_n: int = 0) -> list:
+        """
+        operator statistics of the collected data grouped by op name, and by input shapes or by the innermost
+        group_by_stack_n call stack frames when set. it must be called before export_chrome_trace
+        """
+        if not isinstance(group_by_input_shape, bool):
+            print_warn_msg("Invalid parameter group_by_input_shape, which must be of boolean type, reset it to False.")
+            group_by_input_shape = False
+        if not isinstance(group_by_stack_n, int) or group_by_stack_n < 0:
+            print_warn_msg("Invalid parameter group_by_stack_n, which must be an integer greater than or equal to 0, "
+                           "reset it to 0.")
+            group_by_stack_n = 0
+        if not self._msprofiler_interface.path or not os.path.isdir(self._msprofiler_interface.path):
+            print_warn_msg("Invalid profiling path.")
+            return []
+        return OperatorStatisticParser.get_profiler_statistic(self._msprofiler_interface.path, group_by_input_shape,
+                                                              group_by_stack_n)
+
     def dump_profiler_info(self):
         if not self._msprofiler_interface:
             return
 
+        def _trans_value2cfg(value):
+            if value is None or isinstance(value, (bool, int, float, str)):
+                return value
+            if isinstance(value, Enum):
+                return _trans_value2cfg(value.value)
+            if isinstance(value, (list, tuple)):
+                return [_trans_value2cfg(item) for item in value]
+            if isinstance(value, dict):
+                return {str(key): _trans_value2cfg(item) for key, item in value.items()}
+            return str(value)
+
         def _trans_obj2cfg(obj):
             if not obj:
                 return None
             obj_attr = getattr(obj, "__dict__", {})
-            return obj_attr
+            return {key: _trans_value2cfg(value) for key, value in obj_attr.items()}
 
         common_config = {"activities": list(map(str, list(self._activities))),
                          "schedule": _trans_obj2cfg(self._schedule),
@@ -4,6 +4,7 @@ from datetime import datetime
 
 import torch.autograd.profiler as prof
 
+from .analysis.analysis_worker import AnalysisWorker
 from .analysis.npu_profiler import NpuProfiler
 from .analysis.prof_common_func.path_manager import ProfilerPathManager
 from .scheduler import default_schedule_fn, ProfilerAction
@@ -13,19 +14,42 @@ from ..utils.path_manager import PathManager
 
 class NpuProfCreator:
 
-    def __init__(self, worker_name: str = None, dir_name: str = None) -> None:
+    def __init__(self, worker_name: str = None, dir_name: str = None, use_gzip: bool = False,
+                 async_mode: bool = False, max_queue_size: int = Constant.ANALYSIS_QUEUE_SIZE,
+                 drop_when_full: bool = False, shard_trace: bool = False) -> None:
         self._worker_name = worker_name
         self._dir_name = dir_name
+        self._use_gzip = use_gzip
+        self._async_mode = async_mode
+        self._max_queue_size = max_queue_size
+        self._drop_when_full = drop_when_full
+        self._shard_trace = shard_trace
         self._reset_dir_name()
         self._check_params()
-
-    @classmethod
-    def __call__(cls, instance: any) -> None:
+        self._analysis_worker = AnalysisWorker(self._max_queue_size, self._drop_when_full) if self._async_mode \
+            else None
+
+    def __call__(self, instance: any) -> None:
+        if self._analysis_worker is not None:
+            self._analysis_worker.submit(instance._msprofiler_interface.path,
+                                         {Constant.USE_GZIP: self._use_gzip, Constant.SHARD_TRACE: self._shard_trace})
+            return
         try:
-            NpuProfiler.analyse(instance._msprofiler_interface.path)
+            NpuProfiler.analyse(instance._msprofiler_interface.path, use_gzip=self._use_gzip,
+                                shard_trace=self._shard_trace)
         except Exception:
             print_warn_msg("Profiling data parsing failed.")
 
+    def is_async_mode(self) -> bool:
+        return self._analysis_worker is not None
+
+    def wait(self) -> None:
+        """
+        block until the analysis queued in async mode is finished, it is also done at exit
+        """
+        if self._analysis_worker is not None:
+            self._analysis_worker.wait()
+
     def create_prof_dir(self) -> str:
         if not self._worker_name:
             self._worker_name = "{}_{}".format(socket.gethostname(), str(os.getpid()))
@@ -52,6 +76,21 @@ class NpuProfCreator:
             if len(self._worker_name) > Constant.MAX_WORKER_NAME_LENGTH:
                 print_warn_msg("Invalid parameter worker_name, the length exceeds the threshold, reset it to default.")
                 self._worker_name = None
+        if not isinstance(self._use_gzip, bool):
+            print_warn_msg("Invalid parameter use_gzip, which must be bool type, reset it to False.")
+            self._use_gzip = False
+        if not isinstance(self._shard_trace, bool):
+            print_warn_msg("Invalid parameter shard_trace, which must be bool type, reset it to False.")
+            self._shard_trace = False
+        if not isinstance(self._async_mode, bool):
+            print_warn_msg("Invalid parameter async_mode, which must be bool type, reset it to False.")
+            self._async_mode = False
+        if not isinstance(self._max_queue_size, int) or self._max_queue_size <= 0:
+            print_warn_msg("Invalid parameter max_queue_size, which must be a positive integer, reset it to default.")
+            self._max_queue_size = Constant.ANALYSIS_QUEUE_SIZE
+        if not isinstance(self._drop_when_full, bool):
+            print_warn_msg("Invalid parameter drop_when_full, which must be bool type, reset it to False.")
+            self._drop_when_full = False
         PathManager.check_input_directory_path(self._dir_name)
 
 
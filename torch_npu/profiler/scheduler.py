@@ -1,6 +1,10 @@
+import time
+from collections import deque
 from enum import Enum
 
-from .analysis.prof_common_func.constant import print_warn_msg
+import numpy as np
+
+from .analysis.prof_common_func.constant import print_info_msg, print_warn_msg
 
 CLOSE_STEP = -99
 
@@ -88,6 +92,125 @@ class Schedule:
             self._skip_first = 0
 
 
+class AdaptiveSchedule:
+    """
+    profile only after a slow step: the wall time between steps is tracked with an ewma and a rolling window,
+    a step slower than the baseline by more than threshold arms a warmup and record cycle on the next steps
+    """
+
+    def __init__(self, threshold: float = 0.2, warmup: int = 1, active: int = 1, min_history: int = 10,
+                 cooldown: int = 100, max_captures: int = 3, ewma_alpha: float = 0.1, window: int = 100,
+                 quantile: float = None) -> any:
+        self._threshold = threshold
+        self._warmup = warmup
+        self._active = active
+        self._min_history = min_history
+        self._cooldown = cooldown
+        self._max_captures = max_captures
+        self._ewma_alpha = ewma_alpha
+        self._window = window
+        self._quantile = quantile
+        self._check_params()
+        self._ewma = None
+        self._step_time_window = deque(maxlen=self._window)
+        self._last_step = None
+        self._last_time = None
+        self._planned_actions = {}
+        # the steps of a capture cycle and the one after it carry the profiling overhead
+        self._ignore_until = -1
+        self._next_trigger_step = 0
+        self._capture_num = 0
+
+    def __call__(self, step: int) -> ProfilerAction:
+        if step == CLOSE_STEP:
+            return ProfilerAction.NONE
+        if self._last_step is None or step > self._last_step:
+            self._on_new_step(step)
+        return self._planned_actions.get(step, ProfilerAction.NONE)
+
+    @property
+    def capture_num(self) -> int:
+        return self._capture_num
+
+    @property
+    def step_stats(self) -> dict:
+        step_time_list = list(self._step_time_window)
+        stats = {"count": len(step_time_list), "ewma": self._ewma}
+        for quantile in (50, 90, 99):
+            stats[f"p{quantile}"] = float(np.percentile(step_time_list, quantile)) if step_time_list else None
+        return stats
+
+    def _on_new_step(self, step: int) -> None:
+        now = time.perf_counter()
+        if self._last_step is not None and step == self._last_step + 1 and self._last_step > self._ignore_until:
+            self._check_step_time(step, now - self._last_time)
+        self._last_step = step
+        self._last_time = now
+
+    def _check_step_time(self, step: int, step_time: float) -> None:
+        baseline = self._get_baseline()
+        if baseline is not None and step >= self._next_trigger_step and self._capture_num < self._max_captures \
+                and step_time > baseline * (1 + self._threshold):
+            self._arm_capture(step, step_time, baseline)
+        self._step_time_window.append(step_time)
+        self._ewma = step_time if self._ewma is None else \
+            self._ewma_alpha * step_time + (1 - self._ewma_alpha) * self._ewma
+
+    def _get_baseline(self) -> any:
+        if len(self._step_time_window) < self._min_history:
+            return None
+        if self._quantile is not None:
+            return float(np.quantile(list(self._step_time_window), self._quantile))
+        return self._ewma
+
+    def _arm_capture(self, step: int, step_time: float, baseline: float) -> None:
+        action_list = [ProfilerAction.WARMUP] * self._warmup + [ProfilerAction.RECORD] * (self._active - 1) + \
+                      [ProfilerAction.RECORD_AND_SAVE]
+        self._planned_actions = {step + index: action for index, action in enumerate(action_list)}
+        end_step = step + len(action_list) - 1
+        self._ignore_until = end_step + 1
+        self._next_trigger_step = end_step + 1 + self._cooldown
+        self._capture_num += 1
+        print_info_msg(f"Step time {step_time:.6f}s exceeds the baseline {baseline:.6f}s by more than "
+                       f"{self._threshold:.0%}, profile steps {step} to {end_step}.")
+
+    def _check_params(self):
+        for name, min_value, default in (("_warmup", 0, 1), ("_active", 1, 1), ("_min_history", 1, 10),
+                                         ("_cooldown", 0, 100), ("_max_captures", 0, 3), ("_window", 1, 100)):
+            try:
+                value = int(getattr(self, name))
+                if value < min_value:
+                    raise ValueError
+                setattr(self, name, value)
+            except (TypeError, ValueError):
+                print_warn_msg(f"Invalid parameter {name[1:]}, which must be an integer greater than or equal to "
+                               f"{min_value}, reset it to {default}.")
+                setattr(self, name, default)
+        try:
+            self._threshold = float(self._threshold)
+            if self._threshold < 0:
+                raise ValueError
+        except (TypeError, ValueError):
+            print_warn_msg("Invalid parameter threshold, which must be a number greater than or equal to 0, "
+                           "reset it to 0.2.")
+            self._threshold = 0.2
+        try:
+            self._ewma_alpha = float(self._ewma_alpha)
+            if not 0 < self._ewma_alpha <= 1:
+                raise ValueError
+        except (TypeError, ValueError):
+            print_warn_msg("Invalid parameter ewma_alpha, which must be in (0, 1], reset it to 0.1.")
+            self._ewma_alpha = 0.1
+        if self._quantile is not None:
+            try:
+                self._quantile = float(self._quantile)
+                if not 0 <= self._quantile <= 1:
+                    raise ValueError
+            except (TypeError, ValueError):
+                print_warn_msg("Invalid parameter quantile, which must be in [0, 1], reset it to None.")
+                self._quantile = None
+
+
 def default_schedule_fn(step: int) -> ProfilerAction:
     if step == CLOSE_STEP:
         return ProfilerAction.NONE